@@ -13,7 +13,36 @@ __email__ = __email__
 
 # Imports #
 # Local Packages #
+from .bidsname import BIDSName, parse_bids_name, format_bids_name, strip_entity_key
+from .fileindex import FileIndexEntry, FileIndex
 from .importmaps import ImportFileMap, ImportInnerMap
+from .registryview import RegistryView
+from .progress import (
+    format_bytes,
+    ProgressEvent,
+    ProgressReporter,
+    CallbackProgressReporter,
+    JSONLinesProgressReporter,
+    ConsoleProgressReporter,
+    ProgressTracker,
+    current_progress,
+)
+from .bulkcopy import BandwidthLimiter, BulkReader, BulkCopier
+from .archivesource import ArchiveSource, ArchivePath
+from .sourceindex import SourceIndex, current_source_index
+from .exportsink import ExportSink, VolumeFile, ArchiveSink, current_export_sink
+from .metadataresolver import MetadataResolver
+from .tableschema import apply_dtypes, read_tsv, memory_report
+from .tablecache import TableCache
+from .nodecache import EvictedNode, NodeCache, NodeMap
+from .nodehandle import NodeHandle, NodeResult, map_nodes
+from .filelock import FileLock
+from .atomicwrite import atomic_open, dump_json, dump_tsv, merge_tsv_rows
+from .metaserializer import MetaSerializer
+from .idallocator import IDAllocator
+from .timeindex import to_nanostamp, TimeDataSlice, TimeIntervalIndex
+from .importjournal import ImportJournal, current_journal
+from .importplan import ImportNode, ImportJob, ImportPlan
 from .baseimporter import BaseImporter
 from .baseexporter import BaseExporter
 from .basebidsdirectory import BaseBIDSDirectory
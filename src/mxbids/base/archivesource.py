@@ -0,0 +1,437 @@
+"""archivesource.py
+A read-only view of a tar or zip archive which lets importers use it as a source tree without extracting it.
+"""
+# Package Header #
+from ..header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+from collections.abc import Iterator
+import io
+import os
+from pathlib import Path, PurePosixPath
+import tarfile
+import tempfile
+from threading import RLock
+from typing import Any, BinaryIO
+from warnings import warn
+import zipfile
+
+# Third-Party Packages #
+from baseobjects import BaseObject
+
+# Local Packages #
+from .bulkcopy import BulkCopier
+
+
+# Definitions #
+# Classes #
+class ArchiveSource(BaseObject):
+    """A read-only view of a tar or zip archive which lets importers use it as a source tree without extracting it.
+
+    The member table of the archive is read once and indexed by path, so checking whether a file exists or listing a
+    directory does not read the archive. Each member is streamed straight to its target when it is copied. Members of
+    compressed tar archives are read fastest in the order they were archived, because seeking backwards restarts the
+    decompression. Like the data filter of tarfile, members with absolute paths or parent references are skipped, so
+    an archive cannot write outside the directory it is copied to.
+
+    Attributes:
+        extensions: The file extensions of the supported archives.
+        path: The path to the archive.
+        _archive: The open tar or zip file.
+        _members: The members of the archive keyed by their paths.
+        _directories: The names of the entries in each directory of the archive keyed by its path.
+        _scratch: The temporary directory members are extracted to when a real file is required.
+        _lock: The lock which serializes reads from the archive.
+
+    Args:
+        path: The path to the archive.
+        init: Determines if this object will construct.
+        **kwargs: Additional keyword arguments.
+    """
+
+    # Attributes #
+    extensions: tuple[str, ...] = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz", ".zip")
+
+    path: Path | None = None
+
+    _archive: tarfile.TarFile | zipfile.ZipFile | None = None
+    _members: dict[str, Any]
+    _directories: dict[str, set[str]]
+    _scratch: tempfile.TemporaryDirectory | None = None
+    _lock: RLock
+
+    # Class Methods #
+    @classmethod
+    def is_archive(cls, path: Path | str) -> bool:
+        """Determines if a path is a file with the extension of a supported archive.
+
+        Args:
+            path: The path to check.
+
+        Returns:
+            True if the path is a supported archive.
+        """
+        return isinstance(path, (str, os.PathLike)) and str(path).endswith(cls.extensions) and os.path.isfile(path)
+
+    # Static Methods #
+    @staticmethod
+    def is_safe_name(name: str) -> bool:
+        """Determines if the path of a member stays inside the directory the archive is copied to.
+
+        Args:
+            name: The path of the member in the archive.
+
+        Returns:
+            True if the path is relative and has no parent references or drive.
+        """
+        parts = PurePosixPath(name.replace("\\", "/")).parts
+        return not name.startswith(("/", "\\")) and ".." not in parts and not (parts and ":" in parts[0])
+
+    @staticmethod
+    def resolve_target(root: Path, name: str) -> Path:
+        """Gets the path a member is written to inside a directory, ensuring it does not escape the directory.
+
+        Args:
+            root: The directory the member is written into.
+            name: The path of the member relative to the directory.
+
+        Returns:
+            The path to write the member to.
+
+        Raises:
+            ValueError: If the path of the member resolves outside the directory.
+        """
+        path = root / name
+        if not path.resolve().is_relative_to(root.resolve()):
+            raise ValueError(f"{name} resolves outside of {root}.")
+        return path
+
+    # Magic Methods #
+    # Construction/Destruction
+    def __init__(self, path: Path | str | None = None, *, init: bool = True, **kwargs: Any) -> None:
+        # New Attributes #
+        self._members = {}
+        self._directories = {"": set()}
+        self._lock = RLock()
+
+        # Parent Attributes #
+        super().__init__(init=False)
+
+        # Object Construction #
+        if init:
+            self.construct(path=path, **kwargs)
+
+    def __enter__(self) -> "ArchiveSource":
+        """Opens the archive when entering a context."""
+        self.open()
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        """Closes the archive when exiting a context."""
+        self.close()
+
+    # Instance Methods #
+    # Constructors/Destructors
+    def construct(self, path: Path | str | None = None, **kwargs: Any) -> None:
+        """Constructs this object.
+
+        Args:
+            path: The path to the archive.
+            **kwargs: Additional keyword arguments.
+        """
+        if path is not None:
+            self.path = Path(path)
+
+        super().construct(**kwargs)
+
+    def open(self) -> None:
+        """Opens the archive and indexes its member table."""
+        if str(self.path).endswith(".zip"):
+            self._archive = zipfile.ZipFile(self.path, "r")
+            members = ((m.filename.rstrip("/"), m, m.is_dir()) for m in self._archive.infolist())
+        else:
+            self._archive = tarfile.open(self.path, "r:*")
+            members = ((m.name, m, m.isdir()) for m in self._archive.getmembers() if m.isdir() or m.isfile())
+
+        self._members.clear()
+        self._directories.clear()
+        self._directories[""] = set()
+        for name, member, is_dir in members:
+            if not self.is_safe_name(name):
+                warn(f"Skipping the unsafe member {name} of {self.path}.")
+                continue
+            name = PurePosixPath(name).as_posix()
+            if name == ".":
+                continue
+            if is_dir:
+                self._directories.setdefault(name, set())
+            else:
+                self._members[name] = member
+
+            # Add the entry to each of its parent directories, which archives are not required to list.
+            child = name
+            parent = child.rpartition("/")[0]
+            while True:
+                self._directories.setdefault(parent, set()).add(child.rpartition("/")[2])
+                if not parent:
+                    break
+                child, parent = parent, parent.rpartition("/")[0]
+
+    def close(self) -> None:
+        """Closes the archive and removes any extracted members."""
+        if self._archive is not None:
+            self._archive.close()
+            self._archive = None
+
+        if self._scratch is not None:
+            self._scratch.cleanup()
+            self._scratch = None
+
+    # Members
+    def is_file(self, name: str) -> bool:
+        """Determines if a file is in the archive.
+
+        Args:
+            name: The path of the file in the archive.
+
+        Returns:
+            True if the file is in the archive.
+        """
+        return name in self._members
+
+    def is_dir(self, name: str) -> bool:
+        """Determines if a directory is in the archive.
+
+        Args:
+            name: The path of the directory in the archive.
+
+        Returns:
+            True if the directory is in the archive.
+        """
+        return name in self._directories
+
+    def list_directory(self, name: str) -> list[str]:
+        """Lists the names of the entries in a directory of the archive.
+
+        Args:
+            name: The path of the directory in the archive.
+
+        Returns:
+            The names of the entries in sorted order.
+        """
+        return sorted(self._directories.get(name, ()))
+
+    def get_size(self, name: str) -> int:
+        """Gets the uncompressed size of a file in the archive.
+
+        Args:
+            name: The path of the file in the archive.
+
+        Returns:
+            The size of the file in bytes.
+        """
+        member = self._members[name]
+        return member.file_size if isinstance(member, zipfile.ZipInfo) else member.size
+
+    def open_member(self, name: str) -> BinaryIO:
+        """Opens a file in the archive for binary reading.
+
+        Args:
+            name: The path of the file in the archive.
+
+        Returns:
+            The file object of the member.
+        """
+        if (member := self._members.get(name, None)) is None:
+            raise FileNotFoundError(f"{name} is not in {self.path}")
+
+        if isinstance(self._archive, zipfile.ZipFile):
+            return self._archive.open(member, "r")
+        else:
+            return self._archive.extractfile(member)
+
+    def copy_member(self, name: str, new_path: Path | str) -> None:
+        """Streams a file in the archive to a new path.
+
+        Args:
+            name: The path of the file in the archive.
+            new_path: The path to write the file to.
+        """
+        with self._lock, self.open_member(name) as source, open(new_path, "wb") as target:
+            BulkCopier.default.copy_stream(source, target)
+
+    def copy_tree(self, name: str, new_path: Path) -> None:
+        """Streams the files in a directory of the archive to a new directory.
+
+        Args:
+            name: The path of the directory in the archive.
+            new_path: The path to write the directory to.
+        """
+        new_path.mkdir(parents=True, exist_ok=True)
+        for entry in self.list_directory(name):
+            entry_name = f"{name}/{entry}" if name else entry
+            target = self.resolve_target(new_path, entry)
+            if self.is_dir(entry_name):
+                self.copy_tree(entry_name, target)
+            else:
+                self.copy_member(entry_name, target)
+
+    def extract_member(self, name: str) -> Path:
+        """Extracts a file to a scratch directory for functions which require a real file.
+
+        Args:
+            name: The path of the file in the archive.
+
+        Returns:
+            The path to the extracted file.
+        """
+        with self._lock:
+            if self._scratch is None:
+                self._scratch = tempfile.TemporaryDirectory(prefix="mxbids_archive_")
+            path = self.resolve_target(Path(self._scratch.name), name)
+            if not path.exists():
+                path.parent.mkdir(parents=True, exist_ok=True)
+                self.copy_member(name, path)
+        return path
+
+
+class ArchivePath(os.PathLike):
+    """A path to an entry in an archive which supports the parts of the pathlib interface importers use.
+
+    Using the path as a file system path extracts the file to a scratch directory, so import functions which need a
+    real file still work, while the copy functions stream the member directly.
+
+    Attributes:
+        source: The archive which contains the entry.
+        member: The path of the entry in the archive, empty for the root of the archive.
+
+    Args:
+        source: The archive which contains the entry.
+        member: The path of the entry in the archive, empty for the root of the archive.
+    """
+
+    # Magic Methods #
+    # Construction/Destruction
+    def __init__(self, source: ArchiveSource, member: str = "") -> None:
+        # New Attributes #
+        self.source: ArchiveSource = source
+        self.member: str = member
+
+    # Representation
+    def __str__(self) -> str:
+        """The path of the archive followed by the path of the entry."""
+        return f"{self.source.path}/{self.member}" if self.member else str(self.source.path)
+
+    def __repr__(self) -> str:
+        """A representation of this path."""
+        return f"{self.__class__.__name__}({str(self)!r})"
+
+    def __fspath__(self) -> str:
+        """Extracts the file to a scratch directory and gets the path to the extracted file."""
+        return str(self.source.extract_member(self.member))
+
+    # Path Operators
+    def __truediv__(self, other: os.PathLike | str) -> "ArchivePath":
+        """Joins a relative path to this path."""
+        return self.joinpath(other)
+
+    def __eq__(self, other: Any) -> bool:
+        """Determines if another path is the same entry of the same archive."""
+        return isinstance(other, ArchivePath) and other.source is self.source and other.member == self.member
+
+    def __hash__(self) -> int:
+        """The hash of this path."""
+        return hash((id(self.source), self.member))
+
+    # Instance Methods #
+    @property
+    def name(self) -> str:
+        """The final component of this path."""
+        return self.member.rpartition("/")[2]
+
+    def joinpath(self, *others: os.PathLike | str) -> "ArchivePath":
+        """Joins relative paths to this path.
+
+        Args:
+            *others: The relative paths to join.
+
+        Returns:
+            The joined path.
+        """
+        member = PurePosixPath(self.member, *(PurePosixPath(Path(o).as_posix()) for o in others)).as_posix()
+        return ArchivePath(self.source, "" if member == "." else member)
+
+    def exists(self) -> bool:
+        """Determines if this entry is in the archive."""
+        return self.source.is_file(self.member) or self.source.is_dir(self.member)
+
+    def is_file(self) -> bool:
+        """Determines if this entry is a file in the archive."""
+        return self.source.is_file(self.member)
+
+    def is_dir(self) -> bool:
+        """Determines if this entry is a directory in the archive."""
+        return self.source.is_dir(self.member)
+
+    def iterdir(self) -> Iterator["ArchivePath"]:
+        """Iterates over the entries in this directory.
+
+        Yields:
+            The paths of the entries.
+        """
+        for name in self.source.list_directory(self.member):
+            yield self / name
+
+    def get_size(self) -> int:
+        """Gets the uncompressed size of this file in the archive."""
+        return self.source.get_size(self.member)
+
+    def open(self, mode: str = "r", encoding: str | None = None, **kwargs: Any) -> BinaryIO | io.TextIOWrapper:
+        """Opens this file in the archive for reading.
+
+        Args:
+            mode: The mode to open the file in, which must be for reading.
+            encoding: The text encoding to use when the mode is not binary.
+            **kwargs: Additional keyword arguments for the text wrapper.
+
+        Returns:
+            The file object.
+        """
+        if set(mode) - {"r", "b", "t"}:
+            raise ValueError(f"Archive members can only be opened for reading, not with mode {mode}.")
+
+        file = self.source.open_member(self.member)
+        return file if "b" in mode else io.TextIOWrapper(file, encoding=encoding, **kwargs)
+
+    def read_bytes(self) -> bytes:
+        """Reads the contents of this file."""
+        with self.source._lock, self.open("rb") as file:
+            return file.read()
+
+    def read_text(self, encoding: str | None = None) -> str:
+        """Reads the contents of this file as text."""
+        return self.read_bytes().decode(encoding or "utf-8")
+
+    def copy_to(self, new_path: Path | str) -> None:
+        """Streams this file to a new path.
+
+        Args:
+            new_path: The path to write the file to.
+        """
+        self.source.copy_member(self.member, new_path)
+
+    def copy_tree(self, new_path: Path) -> None:
+        """Streams the files in this directory to a new directory.
+
+        Args:
+            new_path: The path to write the directory to.
+        """
+        self.source.copy_tree(self.member, new_path)
@@ -0,0 +1,141 @@
+"""atomicwrite.py
+Locked, atomic writes of the JSON and TSV files which concurrent workers share.
+"""
+# Package Header #
+from ..header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+from collections.abc import Iterator
+from contextlib import contextmanager, nullcontext
+import json
+import os
+from pathlib import Path
+import stat
+import tempfile
+from threading import Lock
+from typing import Any, IO
+
+# Third-Party Packages #
+import pandas as pd
+
+# Local Packages #
+from .filelock import FileLock
+
+
+# Definitions #
+_umask_lock = Lock()
+
+
+# Functions #
+def get_umask() -> int:
+    """Gets the file mode creation mask of the process, which can only be read by setting it.
+
+    Returns:
+        The umask of the process.
+    """
+    with _umask_lock:
+        umask = os.umask(0o022)
+        os.umask(umask)
+    return umask
+
+
+def get_file_mode(path: Path) -> int:
+    """Gets the permissions a replacement of a file should have, which are those of the file if it exists.
+
+    Args:
+        path: The path to the file to replace.
+
+    Returns:
+        The permissions of the existing file, or the default permissions of a new file under the umask.
+    """
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        return 0o666 & ~get_umask()
+
+
+@contextmanager
+def atomic_open(path: Path | str, mode: str = "w", lock: bool = True) -> Iterator[IO]:
+    """Opens a temporary file to write which replaces a file when it is closed without an error.
+
+    The temporary file is written in the same directory and synced before it is renamed over the file, so readers
+    only ever see the old or the new contents. The file lock is held while writing, so writers in other threads and
+    processes are serialized. The new file keeps the permissions of the file it replaces, or the permissions a new file
+    would have under the umask.
+
+    Args:
+        path: The path to the file to replace.
+        mode: The mode to open the temporary file with, which must be a write mode.
+        lock: Determines if the file lock is held while writing.
+
+    Yields:
+        The temporary file to write to.
+    """
+    path = Path(path)
+    with FileLock.for_file(path) if lock else nullcontext():
+        fd, temp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+        try:
+            with os.fdopen(fd, mode) as file:
+                yield file
+                file.flush()
+                os.fsync(file.fileno())
+            os.chmod(temp_name, get_file_mode(path))
+            os.replace(temp_name, path)
+        except BaseException:
+            try:
+                os.remove(temp_name)
+            except FileNotFoundError:
+                pass
+            raise
+
+
+def dump_json(path: Path | str, data: Any, lock: bool = True, **kwargs: Any) -> None:
+    """Writes an object to a JSON file atomically.
+
+    Args:
+        path: The path to the JSON file.
+        data: The object to write.
+        lock: Determines if the file lock is held while writing.
+        **kwargs: The keyword arguments for json.dump.
+    """
+    with atomic_open(path, "w", lock) as file:
+        json.dump(data, file, **kwargs)
+
+
+def dump_tsv(path: Path | str, frame: pd.DataFrame, lock: bool = True, **kwargs: Any) -> None:
+    """Writes a data frame to a TSV file atomically.
+
+    Args:
+        path: The path to the TSV file.
+        frame: The data frame to write.
+        lock: Determines if the file lock is held while writing.
+        **kwargs: The keyword arguments for DataFrame.to_csv.
+    """
+    with atomic_open(path, "w", lock) as file:
+        frame.to_csv(file, sep="\t", **kwargs)
+
+
+def merge_tsv_rows(old: pd.DataFrame, new: pd.DataFrame, key: str | None = None) -> pd.DataFrame:
+    """Merges the rows of two tables, where the rows of the new table replace old rows with the same key.
+
+    Args:
+        old: The table which is on disk.
+        new: The table to write.
+        key: The column which identifies rows, None to only drop rows which are exact duplicates.
+
+    Returns:
+        The old rows which are not replaced followed by the new rows, with the columns of both tables.
+    """
+    if key is not None and key in old.columns and key in new.columns:
+        old = old[~old[key].isin(new[key])]
+        return pd.concat([old, new], ignore_index=True)
+    else:
+        return pd.concat([old, new], ignore_index=True).drop_duplicates(ignore_index=True)
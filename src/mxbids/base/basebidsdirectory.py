@@ -17,7 +17,7 @@ from abc import abstractmethod
 from collections.abc import MutableMapping
 from copy import deepcopy
 from importlib import import_module
-import json
+import io
 from pathlib import Path
 from typing import ClassVar, Any
 from warnings import warn
@@ -27,6 +27,13 @@ from baseobjects.objects import ClassNamespaceRegister
 from baseobjects.composition import DispatchableComposite
 
 # Local Packages #
+from .registryview import RegistryView
+from .metadataresolver import MetadataResolver
+from .nodecache import NodeMap
+from .filelock import FileLock
+from .atomicwrite import dump_json, dump_tsv
+from .metaserializer import MetaSerializer
+from .idallocator import IDAllocator
 from .baseimporter import BaseImporter
 from .baseexporter import BaseExporter
 
@@ -38,14 +45,18 @@ class BaseBIDSDirectory(DispatchableComposite):
 
     Class Attributes:
         default_meta_information: The default meta information about the BIDS directory and how to load it.
+        default_metadata_resolver: The sidecar metadata resolver shared by all directories which do not set their own.
+        node_memory_estimate: The estimated memory in bytes of a directory without its children and loaded tables.
 
     Attributes:
         _path: The path to the BIDS directory.
         _mode: The file mode of the BIDS directory.
         component_types_register: The register of component types.
         name: The name of the BIDS directory.
-        importers: The importers of the BIDS directory.
-        exporters: The exporters of the BIDS directory.
+        importers: The importers of the BIDS directory, a copy-on-write view of the class importers.
+        exporters: The exporters of the BIDS directory, a copy-on-write view of the class exporters.
+        metadata_resolver: The resolver of inherited sidecar metadata, None to use the default resolver.
+        meta_serializer: The serializer of the meta information file, None to use the default serializer.
         _meta_information: The meta information of the BIDS directory.
     """
 
@@ -62,6 +73,8 @@ class BaseBIDSDirectory(DispatchableComposite):
             },
         }
     }
+    default_metadata_resolver: ClassVar[MetadataResolver] = MetadataResolver()
+    node_memory_estimate: ClassVar[int] = 4096
 
     # Class Methods #
     # Construction/Destruction
@@ -125,8 +138,7 @@ class BaseBIDSDirectory(DispatchableComposite):
         if not meta_info_path.exists():
             info = cls.default_meta_information["Python"]
         else:
-            with meta_info_path.open("r") as file:
-                info = json.load(file)["Python"]
+            info = (cls.meta_serializer or MetaSerializer.default).load(meta_info_path)["Python"]
         return info["ClassNamespace"], info["Class"], info["Module"]
 
     # Attributes #
@@ -142,7 +154,15 @@ class BaseBIDSDirectory(DispatchableComposite):
     importers: MutableMapping[str, tuple[type[BaseImporter], dict[str, Any]]]
     exporters: MutableMapping[str, tuple[type[BaseExporter], dict[str, Any]]]
 
+    metadata_resolver: MetadataResolver | None = None
+    meta_serializer: MetaSerializer | None = None
+
     # Properties #
+    @property
+    def child_nodes(self) -> NodeMap | None:
+        """The map of the child nodes of this directory, None if it has no child nodes."""
+        return None
+
     @property
     def path(self) -> Path | None:
         """The path to the BIDS directory."""
@@ -193,8 +213,8 @@ class BaseBIDSDirectory(DispatchableComposite):
         # New Attributes #
         self._meta_information = {}
 
-        self.importers = dict(self.importers)
-        self.exporters = dict(self.exporters)
+        self.importers = RegistryView(self.importers)
+        self.exporters = RegistryView(self.exporters)
 
         # Parent Attributes #
         super().__init__(init=False)
@@ -282,6 +302,17 @@ class BaseBIDSDirectory(DispatchableComposite):
         """
         self.load_meta_information()
 
+    def unload(self) -> None:
+        """Releases the contents loaded from the files of this directory so they can be garbage collected."""
+
+    def estimate_memory(self) -> int:
+        """Estimates the memory used by this directory and its loaded contents, excluding its child nodes.
+
+        Returns:
+            The estimated memory in bytes.
+        """
+        return self.node_memory_estimate
+
     # Components
     def dispatch_component_types(self, *args: Any, **kwargs: Any) -> dict[str, tuple[type, dict[str, Any]]]:
         """Dispatches component types using the given arguments.
@@ -337,13 +368,63 @@ class BaseBIDSDirectory(DispatchableComposite):
                 component.update(new_component)
                 component["Kwargs"].update(component_kwargs.get(name, {}))
 
+    # Sidecar Metadata
+    def get_metadata_resolver(self) -> MetadataResolver:
+        """Gets the resolver of inherited sidecar metadata for this directory.
+
+        Returns:
+            The metadata resolver of this directory or the default resolver.
+        """
+        return self.default_metadata_resolver if self.metadata_resolver is None else self.metadata_resolver
+
+    # Shared Files
+    def check_writable(self, path: Path) -> None:
+        """Checks that this directory can write a file.
+
+        Args:
+            path: The path to the file to write.
+
+        Raises:
+            io.UnsupportedOperation: If this directory is read only.
+        """
+        if self._mode == "r":
+            raise io.UnsupportedOperation(f"Cannot write {path} because {self.full_name} is opened read only.")
+
+    def write_json(self, path: Path, data: Any) -> None:
+        """Writes a JSON file of this directory atomically while holding its file lock.
+
+        Args:
+            path: The path to the JSON file.
+            data: The object to write.
+        """
+        self.check_writable(path)
+        dump_json(path, data)
+
+    def write_tsv(self, path: Path, frame: Any, **kwargs: Any) -> None:
+        """Writes a TSV file of this directory atomically while holding its file lock.
+
+        Args:
+            path: The path to the TSV file.
+            frame: The data frame to write.
+            **kwargs: The keyword arguments for DataFrame.to_csv.
+        """
+        self.check_writable(path)
+        dump_tsv(path, frame, **kwargs)
+
     # Meta Information
+    def get_meta_serializer(self) -> MetaSerializer:
+        """Gets the serializer of the meta information file of this directory.
+
+        Returns:
+            The meta serializer of this directory or the default serializer.
+        """
+        return MetaSerializer.default if self.meta_serializer is None else self.meta_serializer
+
     def create_meta_information(self) -> None:
         """Creates meta information file and saves the meta information."""
         if not self._meta_information:
             self._meta_information.update(deepcopy(self.default_meta_information))
-        with self.meta_information_path.open(self._mode) as file:
-            json.dump(self._meta_information, file)
+        self.save_meta_information()
 
     def load_meta_information(self) -> dict:
         """Loads the meta information from the file.
@@ -355,15 +436,57 @@ class BaseBIDSDirectory(DispatchableComposite):
             self._meta_information.clear()
 
         if self.meta_information_path.exists():
-            with self.meta_information_path.open("r") as file:
-                self._meta_information.update(json.load(file))
+            self._meta_information.update(self.get_meta_serializer().load(self.meta_information_path))
 
         return self._meta_information
 
     def save_meta_information(self) -> None:
-        """Saves the meta information to the file."""
-        with self.meta_information_path.open(self._mode) as file:
-            json.dump(self.meta_information, file)
+        """Saves the meta information to the file, keeping the ID counters which other workers advanced on disk."""
+        path = self.meta_information_path
+        serializer = self.get_meta_serializer()
+        self.check_writable(path)
+        with FileLock.for_file(path):
+            if path.exists():
+                counters = serializer.load(path).get(IDAllocator.meta_key, {})
+                if counters:
+                    own_counters = self.meta_information.setdefault(IDAllocator.meta_key, {})
+                    for prefix, next_id in counters.items():
+                        own_counters[prefix] = max(next_id, own_counters.get(prefix, 0))
+            serializer.dump(path, self.meta_information)
+
+    # Child IDs
+    def allocate_child_name(
+        self,
+        directory_prefix: str,
+        prefix: str,
+        digits: int,
+        default_id: int = 0,
+        reserve: bool | None = None,
+    ) -> str:
+        """Allocates the name of a new child from the persisted ID counter in the meta information.
+
+        The counter is read and advanced under a file lock, so the children do not need to be loaded and concurrent
+        workers receive different names. Without a meta information file, the name is formatted from the default ID.
+
+        Args:
+            directory_prefix: The prefix of the directory names of the children, such as "sub-".
+            prefix: The prefix of the child names.
+            digits: The number of digits of the IDs.
+            default_id: The ID to use when there is no meta information file to allocate from.
+            reserve: Determines if the name is reserved by advancing the counter. Defaults to reserving it unless the
+                directory is read only.
+
+        Returns:
+            The name of the new child.
+        """
+        if reserve is None:
+            reserve = self._mode != "r"
+
+        allocator = IDAllocator(self.path, self.meta_information_path, directory_prefix, self.get_meta_serializer())
+        if self.meta_information_path is None or not self.meta_information_path.exists():
+            return allocator.format_name(prefix, digits, default_id)
+        else:
+            return allocator.allocate(prefix, digits, reserve, self._meta_information)
 
     # Import/Export
     def create_importer(self, name: str, **kwargs: Any) -> BaseImporter:
@@ -15,7 +15,6 @@ __email__ = __email__
 # Imports #
 # Standard Libraries #
 from abc import abstractmethod
-import shutil
 from pathlib import Path
 from typing import Any
 
@@ -23,6 +22,9 @@ from typing import Any
 from baseobjects import BaseObject
 
 # Local Packages #
+from .bidsname import parse_bids_name
+from .exportsink import current_export_sink
+from .progress import current_progress
 
 
 # Definitions #
@@ -32,8 +34,8 @@ class BaseExporter(BaseObject):
 
     Attributes:
         exporter_name: The name of the exporter.
-        export_file_names: The set of file names to export.
-        export_exclude_names: The set of file names to exclude from export.
+        export_file_names: The set of file suffixes to export, None to export all files.
+        export_exclude_names: The set of file suffixes to exclude from export.
         default_type: The default type for the exporter.
         name_map: A mapping of names.
         type_map: A mapping of types.
@@ -42,8 +44,8 @@ class BaseExporter(BaseObject):
 
     Args:
         bids_object: The mxbids object to export.
-        files_names: The set of file names to export.
-        exclude_names: The set of file names to exclude from export.
+        files_names: The set of file suffixes to export.
+        exclude_names: The set of file suffixes to exclude from export.
         name_map: A mapping of names.
         type_map: A mapping of types.
         init: Determines if the object will construct. Defaults to True.
@@ -54,7 +56,7 @@ class BaseExporter(BaseObject):
     exporter_name: str
 
     export_file_names: set[str, ...] | None = None
-    export_exclude_names: set[str, ...] = {"_meta"}
+    export_exclude_names: set[str, ...] = {"meta"}
 
     default_type: tuple[type["BaseExporter"], dict[str, Any]]
     name_map: dict[str, str] = {}
@@ -114,8 +116,8 @@ class BaseExporter(BaseObject):
 
         Args:
             bids_object: The mxbids object to export.
-            files_names: The set of file names to export.
-            exclude_names: The set of file names to exclude from export.
+            files_names: The set of file suffixes to export.
+            exclude_names: The set of file suffixes to exclude from export.
             name_map: A mapping of names.
             type_map: A mapping of types.
             **kwargs: Additional keyword arguments.
@@ -140,6 +142,14 @@ class BaseExporter(BaseObject):
 
         super().construct(**kwargs)
 
+    def make_directory(self, path: Path) -> None:
+        """Makes a directory to export into using the current export sink.
+
+        Args:
+            path: The path to the directory.
+        """
+        current_export_sink.get().make_directory(path)
+
     def export_files(
         self,
         path: Path,
@@ -147,25 +157,40 @@ class BaseExporter(BaseObject):
         files: set[str, ...] | None = None,
         overwrite: bool = False
     ) -> None:
-        """Exports files to the specified path.
+        """Exports files to the specified path using the current export sink.
 
         Args:
             path: The destination root path for the files to be exported to.
             name: The new name for the exported files. Defaults to None, retaining its name.
-            files: The set of file names to export. Defaults to None, exporting all files.
+            files: The set of file suffixes to export. Defaults to None, exporting all files.
             overwrite: Determines if the files should be overridden if they already exist.
         """
         if files is None:
             files = self.export_file_names
 
-        for old_path in (p for p in self.bids_object.path.iterdir() if p.is_file()):
+        sink = current_export_sink.get()
+        full_name = self.bids_object.full_name
+        exclude = self.export_exclude_names
+        if (progress := current_progress.get()) is not None:
+            progress.enter_node(full_name or self.bids_object.name)
+
+        for old_path in (p for p in self.bids_object.path.iterdir() if p.name[0] != "." and p.is_file()):
             old_name = old_path.name
-            include = True if files is None else any(n in old_name for n in files)
-            exclude = any(n in old_name for n in self.export_exclude_names)
-            if include and not exclude:
-                new_path = path / (old_name if name is None else old_name.replace(self.bids_object.full_name, name))
-                if not new_path.exists() or (overwrite if overwrite is not None else self.overwrite):
-                    shutil.copy(old_path, new_path)
+            suffix = parse_bids_name(old_name).suffix
+            if (files is None or suffix in files) and suffix not in exclude:
+                if name is not None and full_name and old_name.startswith(full_name):
+                    new_path = path / (name + old_name[len(full_name) :])
+                else:
+                    new_path = path / old_name
+                if not sink.exists(new_path) or (overwrite if overwrite is not None else self.overwrite):
+                    try:
+                        sink.write_file(old_path, new_path)
+                    except Exception as e:
+                        if progress is not None:
+                            progress.file_failed(new_path, e)
+                        raise
+                    if progress is not None:
+                        progress.file_done(new_path, old_path.stat().st_size)
 
     @abstractmethod
     def execute_export(self, path: Path, name: str | None = None, **kwargs: Any) -> None:
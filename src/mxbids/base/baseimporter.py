@@ -14,7 +14,9 @@ __email__ = __email__
 # Imports #
 # Standard Libraries #
 from abc import abstractmethod
-from collections.abc import Callable, Iterable
+from collections.abc import Callable, Iterable, Iterator, MutableMapping
+from concurrent.futures import Future
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Any
 from warnings import warn
@@ -23,7 +25,13 @@ from warnings import warn
 from baseobjects import BaseObject
 
 # Local Packages #
+from .archivesource import ArchiveSource, ArchivePath
+from .bidsname import strip_entity_key
 from .importmaps import ImportFileMap, ImportInnerMap
+from .importjournal import ImportJournal, current_journal
+from .importplan import ImportPlan
+from .progress import ProgressTracker, current_progress
+from .sourceindex import SourceIndex, current_source_index
 
 
 # Definitions #
@@ -36,6 +44,7 @@ class BaseImporter(BaseObject):
         default_inner_importer: The default importer for inner objects if an importer is not given.
         file_maps: A list of file maps which contain the path information and a callable which imports the file.
         inner_maps: The list of maps which map inner objects created from this import and importers for those objects.
+        scan_workers: The number of workers which list the source tree ahead of time, 1 to list it as it is used.
         bids_object: The mxbids object to import to.
 
     Args:
@@ -54,6 +63,7 @@ class BaseImporter(BaseObject):
     file_maps: list[ImportFileMap, ...] = []
     inner_maps: list[ImportInnerMap, ...] = []
     overwrite: bool = False
+    scan_workers: int | None = 1
 
     bids_object: Any = None
 
@@ -121,13 +131,89 @@ class BaseImporter(BaseObject):
 
         super().construct(**kwargs)
 
+    @contextmanager
+    def open_source(self, path: Path | ArchivePath) -> Iterator[Path | ArchivePath]:
+        """Opens the source of an import, indexing it once if it is a tar or zip archive.
+
+        Archives are not extracted; their members are streamed to their targets as they are imported. Paths which are
+        not archives, including paths already within an open archive, are given as they are.
+
+        Args:
+            path: The root path of the files to import, which can be an archive.
+
+        Yields:
+            The root path of the files to import.
+        """
+        if ArchiveSource.is_archive(path):
+            with ArchiveSource(path) as source, self.index_source(ArchivePath(source)) as root:
+                yield root
+        else:
+            with self.index_source(path) as root:
+                yield root
+
+    @contextmanager
+    def index_source(self, path: Path | ArchivePath) -> Iterator[Path | ArchivePath]:
+        """Indexes the source tree of an import so the inner imports resolve their files against one listing.
+
+        Args:
+            path: The root path of the files to import.
+
+        Yields:
+            The root path of the files to import.
+        """
+        index = current_source_index.get()
+        if index is not None and index.get_relative(path) is not None:
+            yield path
+            return
+
+        index = SourceIndex(root=path, workers=self.scan_workers)
+        if self.scan_workers != 1:
+            index.scan()
+        token = current_source_index.set(index)
+        try:
+            yield path
+        finally:
+            current_source_index.reset(token)
+
+    def open_journal(self, path: Path | str | None = None, **kwargs: Any) -> ImportJournal:
+        """Creates a journal for an import to this importer's mxbids object, which resumes any earlier journal.
+
+        The import is journaled by entering the journal as a context manager around it. If the import fails, running it
+        again within the same journal skips the files and nodes which were completed.
+
+        Args:
+            path: The path to the journal file. Defaults to a hidden file in the directory of the mxbids object.
+            **kwargs: The keyword arguments for the journal.
+
+        Returns:
+            The journal of the import.
+        """
+        if path is None:
+            path = self.bids_object.path / ImportJournal.default_name
+        return ImportJournal(path=path, **kwargs)
+
+    @staticmethod
+    def get_source_index(path: Path | ArchivePath) -> SourceIndex:
+        """Gets the index of the source tree which contains a path, creating one for the path if it is not indexed.
+
+        Args:
+            path: The path within the source tree.
+
+        Returns:
+            The index of the source tree.
+        """
+        index = current_source_index.get()
+        if index is None or index.get_relative(path) is None:
+            index = SourceIndex(root=path)
+        return index
+
     def import_files(
         self,
         path: Path,
         file_maps: list[ImportFileMap, ...] | None = None,
         overwrite: bool | None = None,
     ) -> None:
-        """Imports files from the specified path.
+        """Imports files from the specified path, resolving the candidate paths against the source index.
 
         Args:
             path: The root path of the files to import.
@@ -137,23 +223,293 @@ class BaseImporter(BaseObject):
         if file_maps is None:
             file_maps = self.file_maps
 
+        index = self.get_source_index(path)
+        journal = current_journal.get()
+        if (progress := current_progress.get()) is not None:
+            progress.enter_node(self.bids_object.full_name or self.bids_object.name)
+
         for suffix, extension, relative_paths, import_call, i_overwrite, i_kwargs in file_maps:
             new_path = self.bids_object.path / f"{self.bids_object.full_name}_{suffix}{extension}"
             over = overwrite if overwrite is not None else (i_overwrite if i_overwrite is not None else self.overwrite)
-            if not new_path.exists() or over:
-                for relative_path in relative_paths:
-                    if relative_path is not None:
-                        inner_path = path / relative_path
-                        if not inner_path.exists():
-                            continue
-                    else:
-                        inner_path = None
+            if self.needs_import(new_path, over, journal):
+                error = None
+                for inner_path in self.iterate_candidates(index, path, relative_paths):
+                    if journal is not None and error is None:
+                        journal.file_begin(new_path)
                     try:
-                        import_call(inner_path, new_path, **i_kwargs)
+                        result = import_call(inner_path, new_path, **i_kwargs)
                     except Exception as e:
                         warn(f"Failed to BIDS import {inner_path} to {new_path} with error: {e}", RuntimeWarning)
+                        error = e
                     else:
+                        self.report_file(progress, new_path, result, journal)
                         break
+                else:
+                    # A file map without any existing candidate is optional, so it is skipped without a failure.
+                    if error is not None:
+                        if journal is not None:
+                            journal.file_failed(new_path)
+                        if progress is not None:
+                            progress.file_failed(new_path, error)
+
+    @staticmethod
+    def needs_import(new_path: Path, overwrite: bool, journal: ImportJournal | None = None) -> bool:
+        """Determines if a file needs to be imported, resuming from the records of a journal if one is given.
+
+        Args:
+            new_path: The path of the file to import.
+            overwrite: Determines if the file should be overridden if it already exists.
+            journal: The journal of the import, None if it is not journaled.
+
+        Returns:
+            True if the file needs to be imported.
+        """
+        if journal is None:
+            return overwrite or not new_path.exists()
+        else:
+            return journal.needs_file(new_path, overwrite)
+
+    @staticmethod
+    def report_file(
+        progress: ProgressTracker | None,
+        new_path: Path,
+        result: Any = None,
+        journal: ImportJournal | None = None,
+    ) -> None:
+        """Reports an imported file to a progress tracker and a journal, waiting for it if it was submitted to a worker.
+
+        Args:
+            progress: The progress tracker, None to not report.
+            new_path: The path of the imported file.
+            result: The result of the import function, which is a future if the file was submitted to a worker.
+            journal: The journal to record the file in, None to not record it.
+        """
+        if progress is None and journal is None:
+            return
+        elif isinstance(result, Future):
+            result.add_done_callback(lambda f: BaseImporter.report_file(progress, new_path, f.exception(), journal))
+        elif isinstance(result, BaseException):
+            if journal is not None:
+                journal.file_failed(new_path)
+            if progress is not None:
+                progress.file_failed(new_path, result)
+        else:
+            if journal is not None:
+                journal.file_done(new_path)
+            if progress is not None:
+                progress.file_done(new_path, new_path.stat().st_size if new_path.exists() else 0)
+
+    def import_inner(
+        self,
+        node: Any,
+        importer: type["BaseImporter"],
+        i_kwargs: dict[str, Any],
+        path: Path | ArchivePath,
+        overwrite: bool | None = None,
+    ) -> None:
+        """Imports an inner object, skipping it if the journal of the import records it as done.
+
+        Args:
+            node: The inner mxbids object to import to.
+            importer: The importer of the inner object.
+            i_kwargs: The keyword arguments for the importer.
+            path: The root path of the files to import to the inner object.
+            overwrite: Determines if the files should be overridden if they already exist.
+        """
+        journal = current_journal.get()
+        if journal is not None:
+            if journal.is_node_done(node.path):
+                return
+            journal.node_begin(node.path)
+
+        importer(bids_object=node, **i_kwargs).execute_import(path, overwrite=overwrite)
+
+        if journal is not None:
+            journal.node_done(node.path)
+
+    @staticmethod
+    def iterate_candidates(
+        index: SourceIndex,
+        path: Path | ArchivePath,
+        relative_paths: Iterable[Path | str | None],
+    ) -> Iterator[Path | ArchivePath | None]:
+        """Iterates over the existing source files of the candidate paths of a file map in order.
+
+        Args:
+            index: The index of the source tree.
+            path: The root path of the files to import.
+            relative_paths: The candidate paths relative to the root, which may contain glob patterns.
+
+        Yields:
+            The paths of the existing files, or None for candidates which are None.
+        """
+        for relative_path in relative_paths:
+            if relative_path is None:
+                yield None
+            else:
+                yield from index.resolve_paths(path, relative_path)
+
+    # Planning
+    @contextmanager
+    def open_plan(
+        self,
+        path: Path | ArchivePath,
+        plan: ImportPlan | None = None,
+    ) -> Iterator[tuple[Path | ArchivePath, ImportPlan]]:
+        """Opens the source of a planned import, creating the plan if one is not given.
+
+        The plan holds an archive source open until it is executed, while the source index is only used to plan.
+
+        Args:
+            path: The root path of the files to import, which can be an archive.
+            plan: The plan to add to, None to create a new plan.
+
+        Yields:
+            The root path of the files to import and the plan.
+        """
+        if plan is None:
+            plan = ImportPlan()
+
+        if ArchiveSource.is_archive(path):
+            path = ArchivePath(plan.enter(ArchiveSource(path)))
+
+        with self.index_source(path) as root:
+            yield root, plan
+
+    def plan_files(
+        self,
+        path: Path | ArchivePath,
+        plan: ImportPlan,
+        file_maps: list[ImportFileMap, ...] | None = None,
+        overwrite: bool | None = None,
+    ) -> None:
+        """Adds the files this importer would import to a plan without importing them.
+
+        Args:
+            path: The root path of the files to import.
+            plan: The plan to add the files to.
+            file_maps: A list of file maps which contain the path information and a callable which imports the file.
+            overwrite: Determines if the files should be overridden if they already exist.
+        """
+        if file_maps is None:
+            file_maps = self.file_maps
+
+        index = self.get_source_index(path)
+        journal = current_journal.get()
+        for suffix, extension, relative_paths, import_call, i_overwrite, i_kwargs in file_maps:
+            new_path = self.bids_object.path / f"{self.bids_object.full_name}_{suffix}{extension}"
+            over = overwrite if overwrite is not None else (i_overwrite if i_overwrite is not None else self.overwrite)
+            if self.needs_import(new_path, over, journal):
+                sources = tuple(self.iterate_candidates(index, path, relative_paths))
+                if sources:
+                    plan.add_job(new_path, sources, import_call, i_kwargs)
+
+    def plan_inner(
+        self,
+        path: Path | ArchivePath,
+        plan: ImportPlan,
+        nodes: MutableMapping[str, Any],
+        inner_maps: list[ImportInnerMap, ...] | None = None,
+        overwrite: bool | None = None,
+        entity_key: str | None = None,
+    ) -> None:
+        """Adds the inner objects this importer would create and their imports to a plan without creating them.
+
+        New inner objects are constructed without creating their directories and are added to their parent when the
+        plan is executed. Inner objects which the current journal records as done are not planned again.
+
+        Args:
+            path: The root path of the files to import.
+            plan: The plan to add the inner objects to.
+            nodes: The mapping of the inner objects of the mxbids object.
+            inner_maps: The list of maps which map inner objects created from this import and importers for those objects.
+            overwrite: Determines if the files should be overridden if they already exist.
+            entity_key: The entity key to strip from the names of the inner objects, None to keep the names.
+        """
+        if inner_maps is None:
+            inner_maps = self.inner_maps
+
+        journal = current_journal.get()
+        for n_name, n_type, i_name, stem, importer, i_overwrite, n_kwargs, i_kwargs in inner_maps:
+            if entity_key is not None:
+                n_name = strip_entity_key(n_name, entity_key)
+
+            node = nodes.get(n_name, None)
+            if node is None:
+                n_kwargs = {"create": True, "build": True} | n_kwargs
+                create = n_kwargs.pop("create")
+                build = n_kwargs.pop("build")
+                node = n_type(
+                    name=n_name,
+                    parent_path=self.bids_object.path,
+                    mode=self.bids_object._mode,
+                    create=False,
+                    load=False,
+                    **n_kwargs,
+                )
+                plan.add_node(node, nodes, n_name, build=create and build)
+
+            if importer is None:
+                importer, i_kwargs = node.importers.get(i_name, (None, {}))
+
+            if importer is None:
+                importer, i_kwargs = self.default_inner_importer
+
+            if journal is not None and journal.is_node_done(node.path):
+                continue
+
+            over = overwrite if overwrite is not None else i_overwrite
+            importer(bids_object=node, **i_kwargs).plan_import(path.joinpath(stem), overwrite=over, plan=plan)
+
+    def plan_import(
+        self,
+        path: Path | ArchivePath,
+        file_maps: bool | list[ImportFileMap, ...] | None = True,
+        inner_maps: bool | list[ImportInnerMap, ...] | None = True,
+        overwrite: bool | None = None,
+        plan: ImportPlan | None = None,
+        **kwargs: Any,
+    ) -> ImportPlan:
+        """Plans the import without writing anything, so it can be inspected before it is executed.
+
+        Args:
+            path: The root path the files to import, which can be a tar or zip archive.
+            file_maps: A list of file maps which contain the path information and a callable which imports the file.
+            inner_maps: The list of maps which map inner objects created from this import and importers for those objects.
+            overwrite: Determines if the files should be overridden if they already exist.
+            plan: The plan to add to, None to create a new plan.
+            **kwargs: Additional keyword arguments.
+
+        Returns:
+            The plan of the import.
+        """
+        with self.open_plan(path, plan) as (path, plan):
+            plan.add_node(self.bids_object)
+            if file_maps or file_maps is None:
+                self.plan_files(
+                    path=path,
+                    plan=plan,
+                    file_maps=None if isinstance(file_maps, bool) else file_maps,
+                    overwrite=overwrite,
+                )
+            if (inner_maps or inner_maps is None) and (inner := self.get_inner_nodes()) is not None:
+                self.plan_inner(
+                    path=path,
+                    plan=plan,
+                    nodes=inner[0],
+                    inner_maps=None if isinstance(inner_maps, bool) else inner_maps,
+                    overwrite=overwrite,
+                    entity_key=inner[1],
+                )
+        return plan
+
+    def get_inner_nodes(self) -> tuple[MutableMapping[str, Any], str | None] | None:
+        """Gets the mapping of the inner objects this importer creates and the entity key of their names.
+
+        Returns:
+            The mapping and the entity key, or None if this importer does not create inner objects.
+        """
+        return None
 
     @abstractmethod
     def execute_import(self, path: Path, overwrite: bool | None = None, **kwargs: Any) -> None:
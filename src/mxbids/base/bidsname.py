@@ -0,0 +1,110 @@
+"""bidsname.py
+Functions for parsing and formatting BIDS names, which memoize their results.
+"""
+# Package Header #
+from ..header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+from collections.abc import Mapping
+from functools import lru_cache
+from sys import intern
+from types import MappingProxyType
+from typing import NamedTuple
+
+# Third-Party Packages #
+
+# Local Packages #
+
+
+# Definitions #
+# Classes #
+class BIDSName(NamedTuple):
+    """The parts of a BIDS file name.
+
+    Attributes:
+        entities: The entities in order of appearance, which cannot be modified because the name is shared.
+        suffix: The suffix of the name.
+        extension: The extension of the name including its leading dot, empty if it has none.
+    """
+
+    entities: Mapping[str, str]
+    suffix: str
+    extension: str
+
+
+# Functions #
+@lru_cache(maxsize=65536)
+def parse_bids_name(name: str) -> BIDSName:
+    """Parses the entities, suffix, and extension from a BIDS file name.
+
+    The results are memoized and their strings are interned, so parsing the same name again, as when listing a
+    directory many times, is a lookup.
+
+    Args:
+        name: The file name to parse.
+
+    Returns:
+        The entities, suffix, and extension of the name.
+    """
+    stem, dot, extension = name.partition(".")
+    *pairs, suffix = stem.split("_")
+    entities = {}
+    for pair in pairs:
+        key, _, value = pair.partition("-")
+        entities[intern(key)] = intern(value)
+    return BIDSName(MappingProxyType(entities), intern(suffix), intern(dot + extension))
+
+
+@lru_cache(maxsize=65536)
+def _format_bids_name(entities: tuple[tuple[str, str], ...], suffix: str | None, extension: str) -> str:
+    """Formats a BIDS file name from hashable entities.
+
+    Args:
+        entities: The entities as key and value pairs in order.
+        suffix: The suffix of the name, None for no suffix.
+        extension: The extension of the name including its leading dot.
+
+    Returns:
+        The formatted name.
+    """
+    parts = [f"{k}-{v}" if v else k for k, v in entities]
+    if suffix is not None:
+        parts.append(suffix)
+    return intern("_".join(parts) + extension)
+
+
+def format_bids_name(entities: Mapping[str, str], suffix: str | None = None, extension: str = "") -> str:
+    """Formats a BIDS file name from its entities, suffix, and extension.
+
+    Args:
+        entities: The entities in order.
+        suffix: The suffix of the name, None for no suffix.
+        extension: The extension of the name including its leading dot.
+
+    Returns:
+        The formatted name.
+    """
+    return _format_bids_name(tuple(entities.items()), suffix, extension)
+
+
+@lru_cache(maxsize=65536)
+def strip_entity_key(name: str, key: str) -> str:
+    """Gets the label of an entity, such as the subject name from "sub-01".
+
+    Args:
+        name: The entity with its key, or a label without its key.
+        key: The key of the entity.
+
+    Returns:
+        The label of the entity, or the name unchanged if it does not start with the key.
+    """
+    prefix = f"{key}-"
+    return intern(name[len(prefix) :]) if name.startswith(prefix) else name
@@ -0,0 +1,374 @@
+"""bulkcopy.py
+Bandwidth limited, page cache friendly copying for bulk imports and exports.
+"""
+# Package Header #
+from ..header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+import io
+import os
+from pathlib import Path
+import shutil
+from threading import Lock
+import time
+from typing import Any, BinaryIO, ClassVar
+
+# Third-Party Packages #
+from baseobjects import BaseObject
+
+# Local Packages #
+
+
+# Definitions #
+# Classes #
+class BandwidthLimiter(BaseObject):
+    """A token bucket which limits the combined rate of all the threads which consume from it.
+
+    Each consumer takes its bytes from the bucket immediately and then sleeps off any debt outside the lock, so the
+    threads share the rate without waiting on each other.
+
+    Attributes:
+        rate: The maximum rate in bytes per second, None for no limit.
+        burst: The number of bytes which can be consumed at once after being idle, None for one second of the rate.
+        _available: The number of bytes in the bucket, negative when consumers are in debt.
+        _last: The time the bucket was last refilled.
+        _lock: The lock which protects the bucket.
+
+    Args:
+        rate: The maximum rate in bytes per second, None for no limit.
+        burst: The number of bytes which can be consumed at once after being idle, None for one second of the rate.
+        init: Determines if this object will construct.
+        **kwargs: Additional keyword arguments.
+    """
+
+    # Attributes #
+    rate: float | None = None
+    burst: float | None = None
+
+    _available: float = 0.0
+    _last: float = 0.0
+    _lock: Lock
+
+    # Magic Methods #
+    # Construction/Destruction
+    def __init__(
+        self,
+        rate: float | None = None,
+        burst: float | None = None,
+        *,
+        init: bool = True,
+        **kwargs: Any,
+    ) -> None:
+        # New Attributes #
+        self._lock = Lock()
+        self._last = time.monotonic()
+
+        # Parent Attributes #
+        super().__init__(init=False)
+
+        # Object Construction #
+        if init:
+            self.construct(rate=rate, burst=burst, **kwargs)
+
+    # Pickling
+    def __getstate__(self) -> dict[str, Any]:
+        """Creates a dictionary of attributes which can be used to rebuild this object.
+
+        Returns:
+            A dictionary of this object's attributes.
+        """
+        state = super().__getstate__()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """Builds this object based on a dictionary of corresponding attributes.
+
+        Args:
+            state: The attributes to build this object from.
+        """
+        super().__setstate__(state)
+        self._lock = Lock()
+
+    # Instance Methods #
+    # Constructors/Destructors
+    def construct(self, rate: float | None = None, burst: float | None = None, **kwargs: Any) -> None:
+        """Constructs this object.
+
+        Args:
+            rate: The maximum rate in bytes per second, None for no limit.
+            burst: The number of bytes which can be consumed at once after being idle, None for one second of the rate.
+            **kwargs: Additional keyword arguments.
+        """
+        if rate is not None:
+            self.rate = rate
+
+        if burst is not None:
+            self.burst = burst
+
+        super().construct(**kwargs)
+
+    def consume(self, size: int) -> float:
+        """Takes bytes from the bucket, sleeping until the rate allows them.
+
+        Args:
+            size: The number of bytes to take.
+
+        Returns:
+            The number of seconds slept.
+        """
+        if self.rate is None:
+            return 0.0
+
+        with self._lock:
+            now = time.monotonic()
+            capacity = self.rate if self.burst is None else self.burst
+            self._available = min(capacity, self._available + (now - self._last) * self.rate) - size
+            self._last = now
+            wait = -self._available / self.rate if self._available < 0 else 0.0
+
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class BulkReader(io.RawIOBase):
+    """A binary reader of a file which consumes from a bandwidth limiter and drops the pages it has read from the cache.
+
+    Attributes:
+        copier: The copier which configures the limiter and the cache hints.
+        file: The file being read.
+        _fileno: The file descriptor of the file.
+        _offset: The number of bytes read.
+        _dropped: The number of bytes which have been dropped from the cache.
+
+    Args:
+        copier: The copier which configures the limiter and the cache hints.
+        path: The path to the file to read.
+    """
+
+    # Magic Methods #
+    # Construction/Destruction
+    def __init__(self, copier: "BulkCopier", path: Path | str) -> None:
+        # New Attributes #
+        self.copier: BulkCopier = copier
+        self.file: io.FileIO = io.FileIO(path, "r")
+        self._fileno: int = self.file.fileno()
+        self._offset: int = 0
+        self._dropped: int = 0
+
+        # Parent Attributes #
+        super().__init__()
+
+        # Object Construction #
+        copier.advise(self._fileno, 0, 0, "POSIX_FADV_SEQUENTIAL")
+
+    # Instance Methods #
+    def readable(self) -> bool:
+        """Determines if the reader can be read from."""
+        return True
+
+    def readinto(self, buffer: bytearray | memoryview) -> int:
+        """Reads into a buffer, consuming the bytes read from the limiter.
+
+        Args:
+            buffer: The buffer to read into.
+
+        Returns:
+            The number of bytes read.
+        """
+        size = self.file.readinto(buffer)
+        if size:
+            self._offset += size
+            self.copier.limiter.consume(size)
+            if self._offset - self._dropped >= self.copier.sync_size:
+                self.copier.advise(self._fileno, self._dropped, self._offset - self._dropped, "POSIX_FADV_DONTNEED")
+                self._dropped = self._offset
+        return size
+
+    def close(self) -> None:
+        """Drops the rest of the file from the cache and closes it."""
+        if not self.closed:
+            self.copier.advise(self._fileno, 0, 0, "POSIX_FADV_DONTNEED")
+            self.file.close()
+        super().close()
+
+
+class BulkCopier(BaseObject):
+    """A copier for bulk imports and exports which can limit bandwidth and avoid evicting the page cache.
+
+    The limiter is shared by every thread which copies through the copier, so the limit applies to the whole import or
+    export rather than to each worker. With cache hints enabled, files are read with a sequential hint and the pages of
+    both files are dropped with posix_fadvise as the copy progresses, so a bulk job does not push the working set of
+    other readers out of the page cache. When neither is enabled, files are copied with shutil as usual.
+
+    Attributes:
+        default: The copier which the copy functions, importers, and exporters use.
+        limiter: The bandwidth limiter shared by all copies.
+        fadvise: Determines if posix_fadvise hints are used to keep copied files out of the page cache.
+        chunk_size: The size in bytes of each read.
+        sync_size: The number of bytes written between flushing and dropping the written pages.
+
+    Args:
+        rate: The maximum rate in bytes per second, None for no limit.
+        fadvise: Determines if posix_fadvise hints are used to keep copied files out of the page cache.
+        init: Determines if this object will construct.
+        **kwargs: Additional keyword arguments.
+    """
+
+    # Class Attributes #
+    default: ClassVar["BulkCopier"]
+
+    # Attributes #
+    limiter: BandwidthLimiter
+    fadvise: bool = False
+    chunk_size: int = 4 * 1024 * 1024
+    sync_size: int = 64 * 1024 * 1024
+
+    # Properties #
+    @property
+    def is_active(self) -> bool:
+        """Determines if copies are limited or use cache hints instead of plain shutil copies."""
+        return self.fadvise or self.limiter.rate is not None
+
+    # Magic Methods #
+    # Construction/Destruction
+    def __init__(
+        self,
+        rate: float | None = None,
+        fadvise: bool | None = None,
+        *,
+        init: bool = True,
+        **kwargs: Any,
+    ) -> None:
+        # New Attributes #
+        self.limiter = BandwidthLimiter()
+
+        # Parent Attributes #
+        super().__init__(init=False)
+
+        # Object Construction #
+        if init:
+            self.construct(rate=rate, fadvise=fadvise, **kwargs)
+
+    # Instance Methods #
+    # Constructors/Destructors
+    def construct(self, rate: float | None = None, fadvise: bool | None = None, **kwargs: Any) -> None:
+        """Constructs this object.
+
+        Args:
+            rate: The maximum rate in bytes per second, None for no limit.
+            fadvise: Determines if posix_fadvise hints are used to keep copied files out of the page cache.
+            **kwargs: Additional keyword arguments.
+        """
+        if rate is not None:
+            self.limiter.rate = rate
+
+        if fadvise is not None:
+            self.fadvise = fadvise
+
+        super().construct(**kwargs)
+
+    def configure(self, rate: float | None = None, fadvise: bool = False) -> None:
+        """Sets the bandwidth limit and cache hints, where None removes the limit.
+
+        Args:
+            rate: The maximum rate in bytes per second, None for no limit.
+            fadvise: Determines if posix_fadvise hints are used to keep copied files out of the page cache.
+        """
+        self.limiter.rate = rate
+        self.fadvise = fadvise
+
+    # Copying
+    def advise(self, fileno: int, offset: int, length: int, advice: str) -> None:
+        """Gives a hint about the access pattern of a file if hints are enabled and supported.
+
+        Args:
+            fileno: The file descriptor of the file.
+            offset: The start of the range the hint applies to.
+            length: The length of the range the hint applies to, 0 for the rest of the file.
+            advice: The name of the posix_fadvise advice constant.
+        """
+        if self.fadvise and hasattr(os, "posix_fadvise"):
+            try:
+                os.posix_fadvise(fileno, offset, length, getattr(os, advice))
+            except OSError:
+                pass
+
+    def open_reader(self, path: Path | str) -> BinaryIO:
+        """Opens a file for bulk reading.
+
+        Args:
+            path: The path to the file.
+
+        Returns:
+            A buffered reader which is limited and drops its pages if the copier is active, otherwise a plain file.
+        """
+        if self.is_active:
+            return io.BufferedReader(BulkReader(self, path), self.chunk_size)
+        else:
+            return open(path, "rb")
+
+    def copy_stream(self, source: BinaryIO, target: BinaryIO) -> int:
+        """Copies a stream to a file, consuming from the limiter and dropping the written pages as it goes.
+
+        Args:
+            source: The stream to read from.
+            target: The file to write to.
+
+        Returns:
+            The number of bytes copied.
+        """
+        try:
+            fileno = target.fileno()
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            fileno = None
+
+        synced = 0
+        copied = 0
+        limited = not isinstance(source, io.BufferedReader) or not isinstance(source.raw, BulkReader)
+        sync = getattr(os, "fdatasync", os.fsync)
+        while chunk := source.read(self.chunk_size):
+            if limited:
+                self.limiter.consume(len(chunk))
+            target.write(chunk)
+            copied += len(chunk)
+            if self.fadvise and fileno is not None and copied - synced >= self.sync_size:
+                target.flush()
+                sync(fileno)
+                self.advise(fileno, synced, copied - synced, "POSIX_FADV_DONTNEED")
+                synced = copied
+
+        if self.fadvise and fileno is not None:
+            target.flush()
+            sync(fileno)
+            self.advise(fileno, 0, 0, "POSIX_FADV_DONTNEED")
+        return copied
+
+    def copy(self, old_path: Path | str, new_path: Path | str, metadata: bool = True) -> None:
+        """Copies a file, limiting its bandwidth and dropping its pages from the cache if the copier is active.
+
+        Args:
+            old_path: The path to the original file.
+            new_path: The path to the new file.
+            metadata: Determines if all metadata is copied like shutil.copy2, or only the mode like shutil.copy.
+        """
+        if not self.is_active:
+            (shutil.copy2 if metadata else shutil.copy)(old_path, new_path)
+            return
+
+        with self.open_reader(old_path) as source, open(new_path, "wb") as target:
+            self.copy_stream(source, target)
+        (shutil.copystat if metadata else shutil.copymode)(old_path, new_path)
+
+
+# Assign Default
+BulkCopier.default = BulkCopier()
@@ -0,0 +1,416 @@
+"""exportsink.py
+Sinks which exporters write their directories and files to.
+"""
+# Package Header #
+from ..header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+from contextvars import ContextVar
+import os
+from pathlib import Path
+import shutil
+import subprocess
+import tarfile
+from threading import Thread
+import time
+from typing import Any, BinaryIO
+import zipfile
+
+# Third-Party Packages #
+from baseobjects import BaseObject
+
+# Local Packages #
+from .bulkcopy import BulkCopier
+
+
+# Definitions #
+# Classes #
+class ExportSink(BaseObject):
+    """A sink which writes exported directories and files to the file system."""
+
+    # Instance Methods #
+    def make_directory(self, path: Path) -> None:
+        """Makes a directory for exported files.
+
+        Args:
+            path: The path to the directory.
+        """
+        path.mkdir(exist_ok=True)
+
+    def exists(self, path: Path) -> bool:
+        """Determines if a file has already been exported.
+
+        Args:
+            path: The path to the exported file.
+
+        Returns:
+            True if the file exists.
+        """
+        return path.exists()
+
+    def write_file(self, old_path: Path, new_path: Path) -> None:
+        """Exports a file with the default bulk copier.
+
+        Args:
+            old_path: The path to the file to export.
+            new_path: The path to export the file to.
+        """
+        BulkCopier.default.copy(old_path, new_path, metadata=False)
+
+    def close(self) -> None:
+        """Finishes writing to this sink."""
+
+
+class VolumeFile:
+    """A writable binary stream which splits its output into numbered files of a fixed size.
+
+    The volumes are named by appending a three digit index to the path, so they can be joined with cat.
+
+    Attributes:
+        path: The path the volume names are based on.
+        volume_size: The maximum size in bytes of each volume.
+        _file: The current volume.
+        _index: The index of the current volume.
+        _written: The number of bytes written to the current volume.
+        _total: The number of bytes written to all volumes.
+
+    Args:
+        path: The path the volume names are based on.
+        volume_size: The maximum size in bytes of each volume.
+    """
+
+    # Magic Methods #
+    # Construction/Destruction
+    def __init__(self, path: Path | str, volume_size: int) -> None:
+        # New Attributes #
+        self.path: Path = Path(path)
+        self.volume_size: int = volume_size
+        self._file: BinaryIO | None = None
+        self._index: int = -1
+        self._written: int = 0
+        self._total: int = 0
+
+    # Instance Methods #
+    @property
+    def volume_paths(self) -> list[Path]:
+        """The paths to the volumes which have been written."""
+        return [self.path.with_name(f"{self.path.name}.{i:03d}") for i in range(self._index + 1)]
+
+    def next_volume(self) -> None:
+        """Closes the current volume and opens the next one."""
+        if self._file is not None:
+            self._file.close()
+        self._index += 1
+        self._written = 0
+        self._file = self.volume_paths[-1].open("wb")
+
+    def write(self, data: bytes | bytearray | memoryview) -> int:
+        """Writes data, continuing in new volumes when the current one is full.
+
+        Args:
+            data: The data to write.
+
+        Returns:
+            The number of bytes written.
+        """
+        view = memoryview(data).cast("B")
+        offset = 0
+        while offset < len(view):
+            if self._file is None or self._written >= self.volume_size:
+                self.next_volume()
+            size = min(len(view) - offset, self.volume_size - self._written)
+            self._file.write(view[offset : offset + size])
+            self._written += size
+            offset += size
+        self._total += offset
+        return offset
+
+    def tell(self) -> int:
+        """Gets the number of bytes written to all volumes.
+
+        Returns:
+            The position in the output.
+        """
+        return self._total
+
+    def flush(self) -> None:
+        """Flushes the current volume."""
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self) -> None:
+        """Closes the current volume, creating an empty first volume if nothing was written."""
+        if self._file is None:
+            self.next_volume()
+        self._file.close()
+
+
+class ArchiveSink(ExportSink):
+    """A sink which streams exported directories and files into a tar or zip archive.
+
+    Files are read from their original location directly into the archive, so the exported tree is never staged on
+    disk. Compressed tar archives are piped through pigz or zstd with multiple threads when they are installed, and
+    the output can be split into fixed-size volumes.
+
+    Attributes:
+        formats: The supported archive formats.
+        parallel_compressors: The command of a parallel compressor for each compressed tar format.
+        root: The path which exported paths are relative to inside the archive.
+        path: The path to the archive.
+        format: The format of the archive.
+        volume_size: The maximum size in bytes of each volume, None to write a single file.
+        workers: The number of threads the compressor uses, None for all processors.
+        compresslevel: The compression level, None for the default of the format.
+        _stream: The output stream of the archive.
+        _archive: The tar or zip file being written.
+        _process: The parallel compressor process, None if compression is done in Python.
+        _pump: The thread which copies the compressed output of the compressor to the stream.
+        _names: The names already written to the archive.
+
+    Args:
+        path: The path to the archive.
+        root: The path which exported paths are relative to inside the archive.
+        format: The format of the archive.
+        volume_size: The maximum size in bytes of each volume, None to write a single file.
+        workers: The number of threads the compressor uses, None for all processors.
+        compresslevel: The compression level, None for the default of the format.
+        init: Determines if this object will construct.
+        **kwargs: Additional keyword arguments.
+    """
+
+    # Attributes #
+    formats: tuple[str, ...] = ("tar", "tar.gz", "tar.zst", "zip")
+    parallel_compressors: dict[str, str] = {"tar.gz": "pigz", "tar.zst": "zstd"}
+
+    root: Path | None = None
+    path: Path | None = None
+    format: str = "tar"
+    volume_size: int | None = None
+    workers: int | None = None
+    compresslevel: int | None = None
+
+    _stream: Any = None
+    _archive: tarfile.TarFile | zipfile.ZipFile | None = None
+    _process: subprocess.Popen | None = None
+    _pump: Thread | None = None
+    _names: set[str]
+
+    # Magic Methods #
+    # Construction/Destruction
+    def __init__(
+        self,
+        path: Path | str | None = None,
+        root: Path | str | None = None,
+        format: str | None = None,
+        volume_size: int | None = None,
+        workers: int | None = None,
+        compresslevel: int | None = None,
+        *,
+        init: bool = True,
+        **kwargs: Any,
+    ) -> None:
+        # New Attributes #
+        self._names = set()
+
+        # Parent Attributes #
+        super().__init__(init=False)
+
+        # Object Construction #
+        if init:
+            self.construct(
+                path=path,
+                root=root,
+                format=format,
+                volume_size=volume_size,
+                workers=workers,
+                compresslevel=compresslevel,
+                **kwargs,
+            )
+
+    # Instance Methods #
+    # Constructors/Destructors
+    def construct(
+        self,
+        path: Path | str | None = None,
+        root: Path | str | None = None,
+        format: str | None = None,
+        volume_size: int | None = None,
+        workers: int | None = None,
+        compresslevel: int | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Constructs this object.
+
+        Args:
+            path: The path to the archive.
+            root: The path which exported paths are relative to inside the archive.
+            format: The format of the archive.
+            volume_size: The maximum size in bytes of each volume, None to write a single file.
+            workers: The number of threads the compressor uses, None for all processors.
+            compresslevel: The compression level, None for the default of the format.
+            **kwargs: Additional keyword arguments.
+        """
+        if path is not None:
+            self.path = Path(path)
+
+        if root is not None:
+            self.root = Path(root)
+
+        if format is not None:
+            if format not in self.formats:
+                raise ValueError(f"{format} is not one of the supported archive formats {self.formats}.")
+            self.format = format
+
+        if volume_size is not None:
+            self.volume_size = volume_size
+
+        if workers is not None:
+            self.workers = workers
+
+        if compresslevel is not None:
+            self.compresslevel = compresslevel
+
+        super().construct(**kwargs)
+
+    def open(self) -> None:
+        """Opens the archive for writing."""
+        self._names.clear()
+        self._stream = self.path.open("wb") if self.volume_size is None else VolumeFile(self.path, self.volume_size)
+
+        if self.format == "zip":
+            level = {} if self.compresslevel is None else {"compresslevel": self.compresslevel}
+            self._archive = zipfile.ZipFile(self._stream, "w", zipfile.ZIP_DEFLATED, allowZip64=True, **level)
+        elif (command := self.get_compressor_command()) is not None:
+            self._process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+            self._pump = Thread(target=self.pump, daemon=True)
+            self._pump.start()
+            self._archive = tarfile.open(fileobj=self._process.stdin, mode="w|")
+        elif self.format == "tar.zst":
+            self._stream.close()
+            raise RuntimeError("zstd must be installed to write tar.zst archives.")
+        else:
+            mode = "w|gz" if self.format == "tar.gz" else "w|"
+            level = {} if self.compresslevel is None or self.format == "tar" else {"compresslevel": self.compresslevel}
+            self._archive = tarfile.open(fileobj=self._stream, mode=mode, **level)
+
+    def close(self) -> None:
+        """Finishes writing the archive and closes its output."""
+        if self._archive is not None:
+            self._archive.close()
+            self._archive = None
+
+        if self._process is not None:
+            self._process.stdin.close()
+            self._pump.join()
+            self._process.wait()
+            returncode = self._process.returncode
+            self._process = None
+            self._pump = None
+            if returncode != 0:
+                self._stream.close()
+                raise RuntimeError(f"The compressor exited with code {returncode}.")
+
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+
+    # Compression
+    def get_compressor_command(self) -> list[str] | None:
+        """Gets the command of a parallel compressor for the format if one is installed.
+
+        Returns:
+            The command to run, or None if there is no parallel compressor for the format.
+        """
+        if (name := self.parallel_compressors.get(self.format, None)) is None or shutil.which(name) is None:
+            return None
+
+        threads = self.workers if self.workers is not None else (os.cpu_count() or 1)
+        level = [] if self.compresslevel is None else [f"-{self.compresslevel}"]
+        if name == "zstd":
+            return [name, f"-T{threads}", "-q", "-c", *level]
+        else:
+            return [name, "-p", str(threads), "-c", *level]
+
+    def pump(self) -> None:
+        """Copies the output of the compressor to the output stream."""
+        while chunk := self._process.stdout.read(1024 * 1024):
+            self._stream.write(chunk)
+
+    # Export
+    def get_name(self, path: Path) -> str:
+        """Gets the name of an exported path inside the archive.
+
+        Args:
+            path: The exported path.
+
+        Returns:
+            The name inside the archive.
+        """
+        return path.relative_to(self.root).as_posix()
+
+    def make_directory(self, path: Path) -> None:
+        """Adds a directory to the archive.
+
+        Args:
+            path: The path to the directory.
+        """
+        name = self.get_name(path)
+        if name in self._names or name == ".":
+            return
+
+        self._names.add(name)
+        if self.format == "zip":
+            self._archive.writestr(f"{name}/", b"")
+        else:
+            info = tarfile.TarInfo(name)
+            info.type = tarfile.DIRTYPE
+            info.mode = 0o755
+            info.mtime = int(time.time())
+            self._archive.addfile(info)
+
+    def exists(self, path: Path) -> bool:
+        """Determines if a file has already been added to the archive.
+
+        Args:
+            path: The path to the exported file.
+
+        Returns:
+            True if the file is in the archive.
+        """
+        return self.get_name(path) in self._names
+
+    def write_file(self, old_path: Path, new_path: Path) -> None:
+        """Streams a file into the archive through the default bulk copier.
+
+        Members of a streamed archive cannot be replaced, so a file which is already in the archive is skipped.
+
+        Args:
+            old_path: The path to the file to export.
+            new_path: The path to export the file to.
+        """
+        name = self.get_name(new_path)
+        if name in self._names:
+            return
+
+        self._names.add(name)
+        copier = BulkCopier.default
+        with copier.open_reader(old_path) as source:
+            if self.format == "zip":
+                info = zipfile.ZipInfo.from_file(old_path, name)
+                info.compress_type = self._archive.compression
+                with self._archive.open(info, "w") as target:
+                    copier.copy_stream(source, target)
+            else:
+                self._archive.addfile(self._archive.gettarinfo(old_path, name), source)
+
+
+# Context Variables #
+current_export_sink: ContextVar[ExportSink] = ContextVar("current_export_sink", default=ExportSink())
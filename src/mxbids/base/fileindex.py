@@ -0,0 +1,375 @@
+"""fileindex.py
+A persisted index of the files in a BIDS dataset which is updated incrementally.
+"""
+# Package Header #
+from ..header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+from collections.abc import Callable, Iterable
+import json
+import os
+from pathlib import Path
+import sqlite3
+from threading import RLock
+from typing import NamedTuple, Any
+
+# Third-Party Packages #
+from baseobjects import BaseObject
+
+# Local Packages #
+from .bidsname import parse_bids_name, strip_entity_key
+
+
+# Definitions #
+# Classes #
+class FileIndexEntry(NamedTuple):
+    """A file in a BIDS dataset and the names and entities parsed from its location.
+
+    Attributes:
+        path: The path to the file.
+        subject: The name of the subject which contains the file, None if it is in the dataset root.
+        session: The name of the session which contains the file, None if it is not in a session.
+        modality: The name of the modality which contains the file, None if it is not in a modality.
+        suffix: The suffix of the file name.
+        extension: The extension of the file name.
+        entities: The entities of the file name.
+    """
+
+    path: Path
+    subject: str | None
+    session: str | None
+    modality: str | None
+    suffix: str
+    extension: str
+    entities: dict[str, str]
+
+
+class FileIndex(BaseObject):
+    """A persisted index of the files in a BIDS dataset which is updated incrementally.
+
+    The index is an SQLite database with a row for every file and every directory in the subject trees and the root of
+    the dataset. Each file name is parsed once when its directory is scanned. An update only stats the directories and
+    rescans the ones whose modification time changed, since adding, removing, or renaming a file changes the time of
+    its directory. Queries filter by set membership on indexed columns, so they do not touch the file system.
+
+    Attributes:
+        root: The root path of the dataset to index.
+        path: The path to the index database, None to keep the index in memory.
+        _connection: The connection to the index database.
+        _lock: The lock which protects the connection.
+
+    Args:
+        root: The root path of the dataset to index.
+        path: The path to the index database, None to keep the index in memory.
+        init: Determines if this object will construct.
+        **kwargs: Additional keyword arguments.
+    """
+
+    # Attributes #
+    root: Path | None = None
+    path: Path | None = None
+
+    _connection: sqlite3.Connection | None = None
+    _lock: RLock
+
+    # Properties #
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """The connection to the index database, which is opened on first use."""
+        if self._connection is None:
+            self._connection = self.open()
+        return self._connection
+
+    # Magic Methods #
+    # Construction/Destruction
+    def __init__(
+        self,
+        root: Path | str | None = None,
+        path: Path | str | None = None,
+        *,
+        init: bool = True,
+        **kwargs: Any,
+    ) -> None:
+        # New Attributes #
+        self._lock = RLock()
+
+        # Parent Attributes #
+        super().__init__(init=False)
+
+        # Object Construction #
+        if init:
+            self.construct(root=root, path=path, **kwargs)
+
+    def __len__(self) -> int:
+        """Gets the number of files in the index.
+
+        Returns:
+            The number of files.
+        """
+        with self._lock:
+            return self.connection.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+    # Pickling
+    def __getstate__(self) -> dict[str, Any]:
+        """Creates a dictionary of attributes which can be used to rebuild this object.
+
+        Returns:
+            A dictionary of this object's attributes.
+        """
+        state = super().__getstate__()
+        state.pop("_connection", None)
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """Builds this object based on a dictionary of corresponding attributes.
+
+        Args:
+            state: The attributes to build this object from.
+        """
+        super().__setstate__(state)
+        self._lock = RLock()
+
+    # Instance Methods #
+    # Constructors/Destructors
+    def construct(self, root: Path | str | None = None, path: Path | str | None = None, **kwargs: Any) -> None:
+        """Constructs this object.
+
+        Args:
+            root: The root path of the dataset to index.
+            path: The path to the index database, None to keep the index in memory.
+            **kwargs: Additional keyword arguments.
+        """
+        if root is not None:
+            self.root = Path(root)
+
+        if path is not None:
+            self.path = Path(path)
+
+        super().construct(**kwargs)
+
+    def open(self) -> sqlite3.Connection:
+        """Opens the index database, creating its tables if they do not exist.
+
+        The index is kept in memory if the database cannot be opened, such as when the dataset is not writable.
+
+        Returns:
+            The connection to the index database.
+        """
+        try:
+            connection = sqlite3.connect(":memory:" if self.path is None else self.path, check_same_thread=False)
+            self.create_tables(connection)
+        except sqlite3.OperationalError:
+            connection = sqlite3.connect(":memory:", check_same_thread=False)
+            self.create_tables(connection)
+        return connection
+
+    @staticmethod
+    def create_tables(connection: sqlite3.Connection) -> None:
+        """Creates the tables and indices of the index database if they do not exist.
+
+        Args:
+            connection: The connection to the index database.
+        """
+        connection.executescript(
+            """
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            CREATE TABLE IF NOT EXISTS directories (
+                path TEXT PRIMARY KEY,
+                mtime INTEGER NOT NULL,
+                children TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                directory TEXT NOT NULL,
+                subject TEXT,
+                session TEXT,
+                modality TEXT,
+                suffix TEXT NOT NULL,
+                extension TEXT NOT NULL,
+                entities TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS files_directory ON files (directory);
+            CREATE INDEX IF NOT EXISTS files_subject ON files (subject);
+            CREATE INDEX IF NOT EXISTS files_suffix ON files (suffix, extension);
+            """
+        )
+
+    def close(self) -> None:
+        """Closes the connection to the index database."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    # Index
+    def scan_directory(self, relative: str) -> tuple[list[str], list[tuple[Any, ...]]]:
+        """Scans a directory for its subdirectories and the rows of its files.
+
+        Args:
+            relative: The path to the directory relative to the root, empty for the root.
+
+        Returns:
+            The relative paths of the subdirectories to index and the rows of the files.
+        """
+        parts = relative.split("/") if relative else []
+        subject = strip_entity_key(parts[0], "sub") if parts else None
+        session = strip_entity_key(parts[1], "ses") if len(parts) > 1 and parts[1][:4] == "ses-" else None
+        depth = 2 if session is not None else 1
+        modality = parts[depth] if len(parts) > depth else None
+
+        children = []
+        rows = []
+        with os.scandir(self.root / relative) as entries:
+            for entry in entries:
+                name = entry.name
+                if name[0] == ".":
+                    continue
+                elif entry.is_dir():
+                    if parts or name[:4] == "sub-":
+                        children.append(f"{relative}/{name}" if relative else name)
+                elif entry.is_file():
+                    entities, suffix, extension = parse_bids_name(name)
+                    rows.append(
+                        (
+                            f"{relative}/{name}" if relative else name,
+                            relative,
+                            subject,
+                            session,
+                            modality,
+                            suffix,
+                            extension,
+                            json.dumps(dict(entities)),
+                        )
+                    )
+
+        return children, rows
+
+    def update(self) -> int:
+        """Updates the index by rescanning the directories which changed since the last update.
+
+        Returns:
+            The number of directories which were rescanned.
+        """
+        with self._lock:
+            connection = self.connection
+            known = {p: (m, c) for p, m, c in connection.execute("SELECT path, mtime, children FROM directories")}
+            seen = set()
+            rescanned = 0
+            stack = [""]
+            with connection:
+                while stack:
+                    relative = stack.pop()
+                    try:
+                        mtime = os.stat(self.root / relative).st_mtime_ns
+                    except FileNotFoundError:
+                        continue
+                    seen.add(relative)
+
+                    old_mtime, children = known.get(relative, (None, None))
+                    if old_mtime == mtime:
+                        stack.extend(json.loads(children))
+                        continue
+
+                    children, rows = self.scan_directory(relative)
+                    connection.execute("DELETE FROM files WHERE directory = ?", (relative,))
+                    connection.executemany("INSERT INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                    connection.execute(
+                        "INSERT OR REPLACE INTO directories VALUES (?, ?, ?)",
+                        (relative, mtime, json.dumps(children)),
+                    )
+                    stack.extend(children)
+                    rescanned += 1
+
+                removed = [(p,) for p in known.keys() - seen]
+                connection.executemany("DELETE FROM files WHERE directory = ?", removed)
+                connection.executemany("DELETE FROM directories WHERE path = ?", removed)
+
+        return rescanned
+
+    def clear(self) -> None:
+        """Removes all files and directories from the index."""
+        with self._lock, self.connection as connection:
+            connection.execute("DELETE FROM files")
+            connection.execute("DELETE FROM directories")
+
+    def query(
+        self,
+        subject: str | Iterable[str] | Callable[[str | None], bool] | None = None,
+        session: str | Iterable[str] | Callable[[str | None], bool] | None = None,
+        modality: str | Iterable[str] | Callable[[str | None], bool] | None = None,
+        suffix: str | Iterable[str] | Callable[[str], bool] | None = None,
+        extension: str | Iterable[str] | Callable[[str], bool] | None = None,
+        **entities: str | Iterable[str] | Callable[[str | None], bool],
+    ) -> list[FileIndexEntry]:
+        """Finds the files in the index which match the given names and entities.
+
+        Each filter is either a name, an iterable of names to match any of, or a predicate which is given the value of
+        each file. Filters which are None match every file.
+
+        Args:
+            subject: The subjects to match.
+            session: The sessions to match.
+            modality: The modalities to match.
+            suffix: The suffixes to match.
+            extension: The extensions to match.
+            **entities: The values of entities in the file names to match.
+
+        Returns:
+            The matching files in order of their paths.
+        """
+        clauses = []
+        parameters = []
+        predicates = []
+        filters = {
+            "subject": subject,
+            "session": session,
+            "modality": modality,
+            "suffix": suffix,
+            "extension": extension,
+        }
+        for column, values in filters.items():
+            if values is None:
+                continue
+            elif callable(values):
+                predicates.append((column, values))
+            else:
+                values = (values,) if isinstance(values, str) else tuple(values)
+                clauses.append(f"{column} IN ({', '.join('?' * len(values))})")
+                parameters.extend(values)
+
+        for key, values in entities.items():
+            if callable(values):
+                predicates.append((key, values))
+            else:
+                values = (values,) if isinstance(values, str) else tuple(values)
+                clauses.append(f"json_extract(entities, ?) IN ({', '.join('?' * len(values))})")
+                parameters.append(f'$."{key}"')
+                parameters.extend(values)
+
+        statement = "SELECT path, subject, session, modality, suffix, extension, entities FROM files"
+        if clauses:
+            statement += f" WHERE {' AND '.join(clauses)}"
+        statement += " ORDER BY path"
+
+        with self._lock:
+            rows = self.connection.execute(statement, parameters).fetchall()
+
+        results = []
+        for path, subject, session, modality, suffix, extension, entities in rows:
+            entry = FileIndexEntry(
+                self.root / path, subject, session, modality, suffix, extension, json.loads(entities)
+            )
+            if all(p(getattr(entry, k) if k in filters else entry.entities.get(k, None)) for k, p in predicates):
+                results.append(entry)
+
+        return results
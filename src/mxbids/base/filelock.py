@@ -0,0 +1,214 @@
+"""filelock.py
+A reentrant lock which protects a file from concurrent threads and processes.
+"""
+# Package Header #
+from ..header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+import os
+from pathlib import Path
+from threading import Lock, RLock
+import time
+from typing import Any, ClassVar
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+# Third-Party Packages #
+from baseobjects import BaseObject
+
+# Local Packages #
+
+
+# Definitions #
+# Classes #
+class FileLock(BaseObject):
+    """A reentrant lock which protects a file from concurrent threads and processes.
+
+    Threads in a process share a lock for each path, and processes hold an advisory flock on the lock file while any
+    thread holds the lock. Where flock is not available, only threads in the same process are excluded.
+
+    Attributes:
+        thread_locks: The lock shared by the threads of this process for each lock file.
+        holds: The number of times the holding thread has acquired each lock file.
+        descriptors: The file descriptor of each lock file which holds the flock of this process.
+        path: The path to the lock file.
+        timeout: The number of seconds to wait for the lock, None to wait forever.
+        poll_interval: The number of seconds between attempts to take the lock of another process.
+        _key: The absolute path of the lock file which keys the shared state.
+        _thread_lock: The lock shared by the threads of this process.
+
+    Args:
+        path: The path to the lock file.
+        timeout: The number of seconds to wait for the lock, None to wait forever.
+        init: Determines if this object will construct.
+        **kwargs: Additional keyword arguments.
+    """
+
+    # Class Attributes #
+    thread_locks: ClassVar[dict[str, RLock]] = {}
+    holds: ClassVar[dict[str, int]] = {}
+    descriptors: ClassVar[dict[str, int]] = {}
+    _registry_lock: ClassVar[Lock] = Lock()
+
+    # Attributes #
+    path: Path | None = None
+    timeout: float | None = None
+    poll_interval: float = 0.05
+
+    _key: str | None = None
+    _thread_lock: "RLock | None" = None
+
+    # Class Methods #
+    @classmethod
+    def get_thread_lock(cls, path: Path) -> RLock:
+        """Gets the lock shared by the threads of this process for a lock file.
+
+        Args:
+            path: The path to the lock file.
+
+        Returns:
+            The thread lock of the file.
+        """
+        key = os.path.abspath(path)
+        with cls._registry_lock:
+            if (lock := cls.thread_locks.get(key, None)) is None:
+                cls.thread_locks[key] = lock = RLock()
+        return lock
+
+    @classmethod
+    def for_file(cls, path: Path | str, timeout: float | None = None) -> "FileLock":
+        """Creates a lock for a file which uses a hidden lock file next to it.
+
+        Args:
+            path: The path to the file to protect.
+            timeout: The number of seconds to wait for the lock, None to wait forever.
+
+        Returns:
+            The lock of the file.
+        """
+        path = Path(path)
+        return cls(path.with_name(f".{path.name}.lock"), timeout=timeout)
+
+    # Magic Methods #
+    # Construction/Destruction
+    def __init__(
+        self,
+        path: Path | str | None = None,
+        timeout: float | None = None,
+        *,
+        init: bool = True,
+        **kwargs: Any,
+    ) -> None:
+        # Parent Attributes #
+        super().__init__(init=False)
+
+        # Object Construction #
+        if init:
+            self.construct(path=path, timeout=timeout, **kwargs)
+
+    def __enter__(self) -> "FileLock":
+        """Acquires the lock when entering a context."""
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        """Releases the lock when exiting a context."""
+        self.release()
+
+    # Pickling
+    def __getstate__(self) -> dict[str, Any]:
+        """Creates a dictionary of attributes which can be used to rebuild this object.
+
+        Returns:
+            A dictionary of this object's attributes.
+        """
+        state = super().__getstate__()
+        state.pop("_thread_lock", None)
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """Builds this object based on a dictionary of corresponding attributes.
+
+        Args:
+            state: The attributes to build this object from.
+        """
+        super().__setstate__(state)
+        if self._key is not None:
+            self._thread_lock = self.get_thread_lock(self._key)
+
+    # Instance Methods #
+    # Constructors/Destructors
+    def construct(self, path: Path | str | None = None, timeout: float | None = None, **kwargs: Any) -> None:
+        """Constructs this object.
+
+        Args:
+            path: The path to the lock file.
+            timeout: The number of seconds to wait for the lock, None to wait forever.
+            **kwargs: Additional keyword arguments.
+        """
+        if path is not None:
+            self.path = Path(path)
+            self._key = os.path.abspath(self.path)
+            self._thread_lock = self.get_thread_lock(self._key)
+
+        if timeout is not None:
+            self.timeout = timeout
+
+        super().construct(**kwargs)
+
+    def acquire(self) -> None:
+        """Acquires the lock, waiting for other threads and processes to release it.
+
+        The flock is only taken by the outermost acquisition of a thread, so nested acquisitions of the same file, even
+        through different lock objects, do not block on the flock of their own process.
+
+        Raises:
+            TimeoutError: If the lock could not be acquired before the timeout.
+        """
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        if not self._thread_lock.acquire(timeout=-1 if self.timeout is None else self.timeout):
+            raise TimeoutError(f"Timed out waiting for the lock {self.path}.")
+
+        holds = self.holds[self._key] = self.holds.get(self._key, 0) + 1
+        if holds > 1 or fcntl is None:
+            return
+
+        fd = None
+        try:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            while True:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    if deadline is not None and time.monotonic() >= deadline:
+                        raise TimeoutError(f"Timed out waiting for the lock {self.path}.")
+                    time.sleep(self.poll_interval)
+        except BaseException:
+            if fd is not None:
+                os.close(fd)
+            del self.holds[self._key]
+            self._thread_lock.release()
+            raise
+        self.descriptors[self._key] = fd
+
+    def release(self) -> None:
+        """Releases the lock once, letting other processes take it when the last hold is released."""
+        self.holds[self._key] -= 1
+        if self.holds[self._key] == 0:
+            del self.holds[self._key]
+            if (fd := self.descriptors.pop(self._key, None)) is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+                os.close(fd)
+        self._thread_lock.release()
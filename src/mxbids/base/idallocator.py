@@ -0,0 +1,199 @@
+"""idallocator.py
+A persisted allocator of sequential child IDs which does not require loading the children of a node.
+"""
+# Package Header #
+from ..header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+import os
+from pathlib import Path
+from typing import Any
+
+# Third-Party Packages #
+from baseobjects import BaseObject
+
+# Local Packages #
+from .filelock import FileLock
+from .metaserializer import MetaSerializer
+
+
+# Definitions #
+# Classes #
+class IDAllocator(BaseObject):
+    """A persisted allocator of sequential child IDs which does not require loading the children of a node.
+
+    The next ID of each prefix is stored in the meta information file of the parent node and is read and advanced
+    under a file lock, so concurrent threads and processes never receive the same ID. The first allocation of a prefix
+    seeds the counter from the child directories which already exist, and an allocated ID whose directory exists, such
+    as after a stale meta information file was saved over the counter, is skipped.
+
+    Attributes:
+        meta_key: The key of the counters in the meta information.
+        path: The path to the directory of the parent node.
+        meta_information_path: The path to the meta information file of the parent node.
+        directory_prefix: The prefix of the directory names of the children, such as "sub-".
+        serializer: The serializer of the meta information file, None to use the default serializer.
+
+    Args:
+        path: The path to the directory of the parent node.
+        meta_information_path: The path to the meta information file of the parent node.
+        directory_prefix: The prefix of the directory names of the children, such as "sub-".
+        serializer: The serializer of the meta information file, None to use the default serializer.
+        init: Determines if this object will construct.
+        **kwargs: Additional keyword arguments.
+    """
+
+    # Attributes #
+    meta_key: str = "IDAllocator"
+
+    path: Path | None = None
+    meta_information_path: Path | None = None
+    directory_prefix: str = ""
+    serializer: MetaSerializer | None = None
+
+    # Properties #
+    @property
+    def lock(self) -> FileLock:
+        """The lock of the meta information file."""
+        return FileLock.for_file(self.meta_information_path)
+
+    # Magic Methods #
+    # Construction/Destruction
+    def __init__(
+        self,
+        path: Path | str | None = None,
+        meta_information_path: Path | str | None = None,
+        directory_prefix: str | None = None,
+        serializer: MetaSerializer | None = None,
+        *,
+        init: bool = True,
+        **kwargs: Any,
+    ) -> None:
+        # Parent Attributes #
+        super().__init__(init=False)
+
+        # Object Construction #
+        if init:
+            self.construct(
+                path=path,
+                meta_information_path=meta_information_path,
+                directory_prefix=directory_prefix,
+                serializer=serializer,
+                **kwargs,
+            )
+
+    # Instance Methods #
+    # Constructors/Destructors
+    def construct(
+        self,
+        path: Path | str | None = None,
+        meta_information_path: Path | str | None = None,
+        directory_prefix: str | None = None,
+        serializer: MetaSerializer | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Constructs this object.
+
+        Args:
+            path: The path to the directory of the parent node.
+            meta_information_path: The path to the meta information file of the parent node.
+            directory_prefix: The prefix of the directory names of the children, such as "sub-".
+            serializer: The serializer of the meta information file, None to use the default serializer.
+            **kwargs: Additional keyword arguments.
+        """
+        if path is not None:
+            self.path = Path(path)
+
+        if meta_information_path is not None:
+            self.meta_information_path = Path(meta_information_path)
+
+        if directory_prefix is not None:
+            self.directory_prefix = directory_prefix
+
+        if serializer is not None:
+            self.serializer = serializer
+
+        super().construct(**kwargs)
+
+    # Allocation
+    def scan_next_id(self, prefix: str) -> int:
+        """Finds the ID after the largest ID of the child directories which exist.
+
+        Args:
+            prefix: The prefix of the child names.
+
+        Returns:
+            The next ID, 0 if no children have an ID with the prefix.
+        """
+        start = len(self.directory_prefix) + len(prefix)
+        next_id = 0
+        try:
+            with os.scandir(self.path) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if name.startswith(self.directory_prefix + prefix) and name[start:].isdigit() and entry.is_dir():
+                        next_id = max(next_id, int(name[start:]) + 1)
+        except FileNotFoundError:
+            pass
+        return next_id
+
+    def format_name(self, prefix: str, digits: int, id_: int) -> str:
+        """Formats the name of a child from its ID.
+
+        Args:
+            prefix: The prefix of the child names.
+            digits: The number of digits of the IDs.
+            id_: The ID of the child.
+
+        Returns:
+            The name of the child.
+        """
+        return f"{prefix}{id_:0{digits}d}"
+
+    def allocate(
+        self,
+        prefix: str,
+        digits: int,
+        reserve: bool = True,
+        meta_information: dict[str, Any] | None = None,
+    ) -> str:
+        """Allocates the next free child name with a prefix.
+
+        Args:
+            prefix: The prefix of the child names.
+            digits: The number of digits of the IDs.
+            reserve: Determines if the counter is advanced and saved, otherwise the name is only looked up.
+            meta_information: The in-memory meta information of the parent node to keep in sync with the file.
+
+        Returns:
+            The name of the new child.
+        """
+        serializer = MetaSerializer.default if self.serializer is None else self.serializer
+        with self.lock:
+            meta_info = serializer.load(self.meta_information_path)
+
+            counters = meta_info.setdefault(self.meta_key, {})
+            if (next_id := counters.get(prefix, None)) is None:
+                next_id = self.scan_next_id(prefix)
+
+            name = self.format_name(prefix, digits, next_id)
+            while (self.path / f"{self.directory_prefix}{name}").exists():
+                next_id += 1
+                name = self.format_name(prefix, digits, next_id)
+
+            if reserve:
+                counters[prefix] = next_id + 1
+                serializer.dump(self.meta_information_path, meta_info)
+
+                if meta_information is not None:
+                    meta_information.setdefault(self.meta_key, {})[prefix] = next_id + 1
+
+        return name
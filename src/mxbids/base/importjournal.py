@@ -0,0 +1,442 @@
+"""importjournal.py
+A crash consistent journal of a bulk import which lets a restarted import resume where it stopped.
+"""
+# Package Header #
+from ..header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+from contextvars import ContextVar, Token
+import json
+import os
+from pathlib import Path
+from threading import Lock
+from typing import Any, TextIO
+
+# Third-Party Packages #
+from baseobjects import BaseObject
+
+# Local Packages #
+
+
+# Definitions #
+# Classes #
+class ImportJournal(BaseObject):
+    """A crash consistent journal of a bulk import which lets a restarted import resume where it stopped.
+
+    The journal is an append-only file of JSON lines. A file or node is recorded as begun before it is written and as
+    done once it is complete, and each record is synced before the import moves on. When an import is restarted with
+    the same journal, the files and nodes which are done are skipped without being rescanned or copied again, and the
+    files which were begun but never finished are imported again even though they exist. A record cut short by a crash
+    is ignored. The journal is removed when the import finishes without an error, but only if every file and node which
+    was begun is done, so it is kept when any file failed.
+
+    Importers and import plans record to the journal of the current context, so an import is journaled by entering
+    the journal as a context manager around it.
+
+    Attributes:
+        default_name: The default name of the journal file in the directory being imported to.
+        path: The path to the journal file.
+        sync: Determines if the records and the files they mark as done are synced to disk before continuing.
+        remove_on_complete: Determines if the journal file is removed when the import finishes without an error.
+        done_files: The sizes of the files which are done keyed by their path relative to the journal.
+        pending_files: The paths of the files which were begun but are not done, relative to the journal.
+        done_nodes: The paths of the nodes which are done, relative to the journal.
+        pending_nodes: The paths of the nodes which were begun but are not done, relative to the journal.
+        failed_files: The paths of the files this run failed to import, relative to the journal.
+        _active_files: The paths of the files this run has begun and not yet finished or failed.
+        _deferred_nodes: The nodes whose imports returned while their files were still being written by workers.
+        _file: The journal file open for appending.
+        _tokens: The tokens of the context variable for each time the journal was entered.
+        _lock: The lock which protects the records.
+
+    Args:
+        path: The path to the journal file.
+        sync: Determines if the records and the files they mark as done are synced to disk before continuing.
+        remove_on_complete: Determines if the journal file is removed when the import finishes without an error.
+        init: Determines if this object will construct.
+        **kwargs: Additional keyword arguments.
+    """
+
+    # Attributes #
+    default_name: str = ".mxbids_import_journal.jsonl"
+
+    path: Path | None = None
+    sync: bool = True
+    remove_on_complete: bool = True
+
+    done_files: dict[str, int]
+    pending_files: set[str]
+    done_nodes: set[str]
+    pending_nodes: set[str]
+    failed_files: set[str]
+
+    _active_files: set[str]
+    _deferred_nodes: set[str]
+    _file: TextIO | None = None
+    _tokens: list[Token]
+    _lock: Lock
+
+    # Properties #
+    @property
+    def root(self) -> Path:
+        """The directory which the recorded paths are relative to."""
+        return self.path.parent
+
+    # Magic Methods #
+    # Construction/Destruction
+    def __init__(
+        self,
+        path: Path | str | None = None,
+        sync: bool | None = None,
+        remove_on_complete: bool | None = None,
+        *,
+        init: bool = True,
+        **kwargs: Any,
+    ) -> None:
+        # New Attributes #
+        self.done_files = {}
+        self.pending_files = set()
+        self.done_nodes = set()
+        self.pending_nodes = set()
+        self.failed_files = set()
+        self._active_files = set()
+        self._deferred_nodes = set()
+        self._tokens = []
+        self._lock = Lock()
+
+        # Parent Attributes #
+        super().__init__(init=False)
+
+        # Object Construction #
+        if init:
+            self.construct(path=path, sync=sync, remove_on_complete=remove_on_complete, **kwargs)
+
+    def __enter__(self) -> "ImportJournal":
+        """Opens the journal and makes it the journal of the current context."""
+        if not self._tokens:
+            self.open()
+        self._tokens.append(current_journal.set(self))
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        """Restores the previous journal of the context, completing the journal if the import did not fail."""
+        current_journal.reset(self._tokens.pop())
+        if not self._tokens:
+            if exc_type is None:
+                self.complete()
+            else:
+                self.close()
+
+    # Instance Methods #
+    # Constructors/Destructors
+    def construct(
+        self,
+        path: Path | str | None = None,
+        sync: bool | None = None,
+        remove_on_complete: bool | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Constructs this object.
+
+        Args:
+            path: The path to the journal file.
+            sync: Determines if the records and the files they mark as done are synced to disk before continuing.
+            remove_on_complete: Determines if the journal file is removed when the import finishes without an error.
+            **kwargs: Additional keyword arguments.
+        """
+        if path is not None:
+            self.path = Path(path)
+
+        if sync is not None:
+            self.sync = sync
+
+        if remove_on_complete is not None:
+            self.remove_on_complete = remove_on_complete
+
+        super().construct(**kwargs)
+
+    def open(self) -> None:
+        """Replays the records of an existing journal file and opens it for appending."""
+        self.done_files.clear()
+        self.pending_files.clear()
+        self.done_nodes.clear()
+        self.pending_nodes.clear()
+        self.failed_files.clear()
+        self._active_files.clear()
+        self._deferred_nodes.clear()
+        line = "\n"
+        if self.path.exists():
+            with self.path.open("r") as file:
+                for line in file:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    self.replay(record)
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self.path.open("a")
+        if not line.endswith("\n"):
+            self._file.write("\n")
+
+    def close(self) -> None:
+        """Closes the journal file, keeping it so the import can be resumed."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def complete(self) -> None:
+        """Closes the journal file, removing it if it is set to be removed on completion and everything is done."""
+        self.close()
+        if self.remove_on_complete and self.is_complete():
+            self.path.unlink(missing_ok=True)
+
+    # Records
+    def get_relative(self, path: Path | str) -> str:
+        """Gets the path which is recorded for a file or node.
+
+        Args:
+            path: The path to the file or node.
+
+        Returns:
+            The path relative to the directory of the journal.
+        """
+        return Path(os.path.relpath(path, self.root)).as_posix()
+
+    def replay(self, record: dict[str, Any]) -> None:
+        """Applies a record of the journal file to the state of the journal.
+
+        Args:
+            record: The record to apply.
+        """
+        kind, event, path = record.get("Kind"), record.get("Event"), record.get("Path")
+        if kind == "file":
+            if event == "begin":
+                self.done_files.pop(path, None)
+                self.pending_files.add(path)
+            elif event == "done":
+                self.pending_files.discard(path)
+                self.failed_files.discard(path)
+                self.done_files[path] = record.get("Size", 0)
+        elif kind == "node":
+            if event == "begin":
+                self.done_nodes.discard(path)
+                self.pending_nodes.add(path)
+            elif event == "done":
+                self.pending_nodes.discard(path)
+                self.done_nodes.add(path)
+
+    def write(self, record: dict[str, Any]) -> None:
+        """Appends a record to the journal file and applies it, syncing it if the journal is set to sync.
+
+        Args:
+            record: The record to write.
+        """
+        line = json.dumps(record) + "\n"
+        with self._lock:
+            self.write_locked(record, line)
+
+    def write_locked(self, record: dict[str, Any], line: str) -> None:
+        """Appends a record to the journal file and applies it, which must be called while holding the lock.
+
+        Args:
+            record: The record to write.
+            line: The serialized record.
+        """
+        self.replay(record)
+        if self._file is not None:
+            self._file.write(line)
+            self._file.flush()
+            if self.sync:
+                os.fsync(self._file.fileno())
+
+    def is_node_active(self, node: str) -> bool:
+        """Determines if any file of a node is being written, which must be called while holding the lock.
+
+        Args:
+            node: The path of the node relative to the journal.
+
+        Returns:
+            True if a file within the node has begun and not finished or failed.
+        """
+        prefix = f"{node}/"
+        return any(f.startswith(prefix) for f in self._active_files)
+
+    def release_nodes(self) -> None:
+        """Records the deferred nodes whose files have all finished, which must be called while holding the lock."""
+        for node in [n for n in self._deferred_nodes if not self.is_node_active(n)]:
+            self._deferred_nodes.discard(node)
+            record = {"Kind": "node", "Event": "done", "Path": node}
+            self.write_locked(record, json.dumps(record) + "\n")
+
+    def file_begin(self, path: Path) -> None:
+        """Records that a file is about to be written.
+
+        Args:
+            path: The path to the file.
+        """
+        relative = self.get_relative(path)
+        record = {"Kind": "file", "Event": "begin", "Path": relative}
+        line = json.dumps(record) + "\n"
+        with self._lock:
+            self._active_files.add(relative)
+            self.write_locked(record, line)
+
+    def file_done(self, path: Path) -> None:
+        """Records that a file is complete, syncing its contents first if the journal is set to sync.
+
+        Args:
+            path: The path to the file.
+        """
+        relative = self.get_relative(path)
+        try:
+            size = os.stat(path).st_size
+            if self.sync:
+                fd = os.open(path, os.O_RDONLY)
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+        except OSError:
+            self.file_failed(path)
+            return
+
+        record = {"Kind": "file", "Event": "done", "Path": relative, "Size": size}
+        line = json.dumps(record) + "\n"
+        with self._lock:
+            self._active_files.discard(relative)
+            self.write_locked(record, line)
+            self.release_nodes()
+
+    def file_failed(self, path: Path) -> None:
+        """Marks a file as failed so the journal is kept and the nodes which contain it are not recorded as done.
+
+        Args:
+            path: The path to the file.
+        """
+        relative = self.get_relative(path)
+        with self._lock:
+            self._active_files.discard(relative)
+            self.failed_files.add(relative)
+            self._deferred_nodes = {n for n in self._deferred_nodes if not relative.startswith(f"{n}/")}
+            self.release_nodes()
+
+    def node_begin(self, path: Path) -> None:
+        """Records that the import of a node has begun.
+
+        Args:
+            path: The path to the node.
+        """
+        self.write({"Kind": "node", "Event": "begin", "Path": self.get_relative(path)})
+
+    def node_done(self, path: Path) -> None:
+        """Records that the import of a node and all of its inner nodes is complete.
+
+        If workers are still writing files of the node, the record is deferred until they finish, and it is dropped if
+        any of them fail.
+
+        Args:
+            path: The path to the node.
+        """
+        relative = self.get_relative(path)
+        record = {"Kind": "node", "Event": "done", "Path": relative}
+        line = json.dumps(record) + "\n"
+        with self._lock:
+            if self.is_node_active(relative):
+                self._deferred_nodes.add(relative)
+            else:
+                self.write_locked(record, line)
+
+    # Queries
+    def is_complete(self) -> bool:
+        """Determines if every file and node which was begun is done and no file failed.
+
+        Returns:
+            True if nothing is pending, deferred, or failed.
+        """
+        with self._lock:
+            return not (
+                self.pending_files
+                or self.pending_nodes
+                or self.failed_files
+                or self._active_files
+                or self._deferred_nodes
+            )
+
+    def is_file_done(self, path: Path) -> bool:
+        """Determines if a file is recorded as done and still has the size it was recorded with.
+
+        Args:
+            path: The path to the file.
+
+        Returns:
+            True if the file is done.
+        """
+        if (size := self.done_files.get(self.get_relative(path), None)) is None:
+            return False
+        try:
+            return os.stat(path).st_size == size
+        except OSError:
+            return False
+
+    def is_file_pending(self, path: Path) -> bool:
+        """Determines if a file was begun but never recorded as done, so it may be incomplete.
+
+        Args:
+            path: The path to the file.
+
+        Returns:
+            True if the file is pending.
+        """
+        return self.get_relative(path) in self.pending_files
+
+    def is_node_pending(self, path: Path) -> bool:
+        """Determines if the import of a node was begun but never recorded as done, so it may be incomplete.
+
+        Args:
+            path: The path to the node.
+
+        Returns:
+            True if the node is pending.
+        """
+        return self.get_relative(path) in self.pending_nodes
+
+    def is_node_done(self, path: Path) -> bool:
+        """Determines if the import of a node is recorded as done.
+
+        Args:
+            path: The path to the node.
+
+        Returns:
+            True if the node is done.
+        """
+        return self.get_relative(path) in self.done_nodes
+
+    def needs_file(self, path: Path, overwrite: bool) -> bool:
+        """Determines if a file needs to be imported given its records and whether existing files are overwritten.
+
+        Args:
+            path: The path to the file.
+            overwrite: Determines if the file should be overridden if it already exists.
+
+        Returns:
+            True if the file needs to be imported.
+        """
+        if self.is_file_done(path):
+            return False
+        elif self.is_file_pending(path):
+            return True
+        else:
+            return overwrite or not path.exists()
+
+
+# Context Variables #
+current_journal: ContextVar[ImportJournal | None] = ContextVar("current_journal", default=None)
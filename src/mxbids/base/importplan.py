@@ -0,0 +1,351 @@
+"""importplan.py
+A plan of the nodes and files an import will create, which can be inspected before it is executed.
+"""
+# Package Header #
+from ..header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+from collections.abc import Callable, MutableMapping
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AbstractContextManager, ExitStack
+import json
+import os
+from pathlib import Path
+from typing import NamedTuple, Any
+from warnings import warn
+
+# Third-Party Packages #
+from baseobjects import BaseObject
+
+# Local Packages #
+from .archivesource import ArchivePath
+from .importjournal import ImportJournal, current_journal
+from .progress import ProgressTracker, current_progress
+
+
+# Definitions #
+# Classes #
+class ImportNode(NamedTuple):
+    """A node which an import creates before its files are imported.
+
+    Attributes:
+        node: The mxbids object of the node.
+        container: The mapping of its parent to add the node to, None if the node is already in its parent.
+        name: The name of the node in its parent's mapping.
+        build: Determines if the node's default files are built when it is created.
+    """
+
+    node: Any
+    container: MutableMapping[str, Any] | None
+    name: str | None
+    build: bool
+
+
+class ImportJob(NamedTuple):
+    """A file which an import creates and the source files it can be created from.
+
+    Attributes:
+        target: The path of the file to create.
+        sources: The existing source files to try in order, or a single None for functions without a source.
+        function: The callable which imports a source file to the target.
+        kwargs: The keyword arguments for the function.
+        size: The size in bytes of the first source file.
+    """
+
+    target: Path
+    sources: tuple[Path | ArchivePath | None, ...]
+    function: Callable[..., Any]
+    kwargs: dict[str, Any]
+    size: int
+
+
+class ImportPlan(BaseObject):
+    """A plan of the nodes and files an import will create, which can be inspected before it is executed.
+
+    Planning resolves every file map and inner map of an import without writing anything, so the plan doubles as a
+    dry run which reports the files to copy and their total size. Executing the plan creates the nodes in order and
+    then imports the files largest first across a pool of workers. Starting the largest files first keeps a few large
+    recordings from running alone at the end of the import while the other workers are idle.
+
+    Attributes:
+        workers: The number of workers which import files, None for the default of the executor.
+        nodes: The nodes to create in order.
+        jobs: The files to import.
+        finalizers: The callables to run after all files are imported.
+        _node_ids: The ids of the nodes in the plan.
+        _stack: The resources, such as open archives, which the plan holds until it is executed or closed.
+
+    Args:
+        workers: The number of workers which import files, None for the default of the executor.
+        init: Determines if this object will construct.
+        **kwargs: Additional keyword arguments.
+    """
+
+    # Attributes #
+    workers: int | None = None
+
+    nodes: list[ImportNode]
+    jobs: list[ImportJob]
+    finalizers: list[Callable[[], Any]]
+    _node_ids: set[int]
+    _stack: ExitStack
+
+    # Properties #
+    @property
+    def total_size(self) -> int:
+        """The total size in bytes of the files to import."""
+        return sum(j.size for j in self.jobs)
+
+    # Magic Methods #
+    # Construction/Destruction
+    def __init__(self, workers: int | None = None, *, init: bool = True, **kwargs: Any) -> None:
+        # New Attributes #
+        self.nodes = []
+        self.jobs = []
+        self.finalizers = []
+        self._node_ids = set()
+        self._stack = ExitStack()
+
+        # Parent Attributes #
+        super().__init__(init=False)
+
+        # Object Construction #
+        if init:
+            self.construct(workers=workers, **kwargs)
+
+    def __len__(self) -> int:
+        """Gets the number of files to import.
+
+        Returns:
+            The number of files.
+        """
+        return len(self.jobs)
+
+    # Instance Methods #
+    # Constructors/Destructors
+    def construct(self, workers: int | None = None, **kwargs: Any) -> None:
+        """Constructs this object.
+
+        Args:
+            workers: The number of workers which import files, None for the default of the executor.
+            **kwargs: Additional keyword arguments.
+        """
+        if workers is not None:
+            self.workers = workers
+
+        super().construct(**kwargs)
+
+    def enter(self, context: AbstractContextManager) -> Any:
+        """Enters a context which the plan holds until it is executed or closed.
+
+        Args:
+            context: The context to enter.
+
+        Returns:
+            The result of entering the context.
+        """
+        return self._stack.enter_context(context)
+
+    def close(self) -> None:
+        """Releases the resources the plan holds."""
+        self._stack.close()
+
+    # Planning
+    def add_node(
+        self,
+        node: Any,
+        container: MutableMapping[str, Any] | None = None,
+        name: str | None = None,
+        build: bool = False,
+    ) -> None:
+        """Adds a node to create, ignoring nodes which are already in the plan.
+
+        Args:
+            node: The mxbids object of the node.
+            container: The mapping of its parent to add the node to, None if the node is already in its parent.
+            name: The name of the node in its parent's mapping.
+            build: Determines if the node's default files are built when it is created.
+        """
+        if id(node) not in self._node_ids:
+            self._node_ids.add(id(node))
+            self.nodes.append(ImportNode(node, container, name, build))
+
+    def add_job(
+        self,
+        target: Path,
+        sources: tuple[Path | ArchivePath | None, ...],
+        function: Callable[..., Any],
+        kwargs: dict[str, Any] | None = None,
+    ) -> None:
+        """Adds a file to import, measuring the size of its first source.
+
+        Args:
+            target: The path of the file to create.
+            sources: The existing source files to try in order, or a single None for functions without a source.
+            function: The callable which imports a source file to the target.
+            kwargs: The keyword arguments for the function.
+        """
+        kwargs = {} if kwargs is None else kwargs
+        self.jobs.append(ImportJob(target, sources, function, kwargs, self.get_size(sources[0])))
+
+    def add_finalizer(self, finalizer: Callable[[], Any]) -> None:
+        """Adds a callable to run after all files are imported.
+
+        Args:
+            finalizer: The callable to run.
+        """
+        self.finalizers.append(finalizer)
+
+    @staticmethod
+    def get_size(path: Path | ArchivePath | None) -> int:
+        """Gets the size of a source file.
+
+        Args:
+            path: The path to the source file, which can be within an archive.
+
+        Returns:
+            The size of the file in bytes, 0 if it has no size.
+        """
+        if path is None:
+            return 0
+        elif isinstance(path, ArchivePath):
+            return path.get_size() if path.is_file() else 0
+        else:
+            try:
+                return os.stat(path).st_size
+            except OSError:
+                return 0
+
+    # Inspection
+    def to_dict(self) -> dict[str, Any]:
+        """Creates a serializable description of the plan.
+
+        Returns:
+            The nodes, the files, and the total size of the plan.
+        """
+        return {
+            "Nodes": [str(n.node.path) for n in self.nodes],
+            "Jobs": [
+                {
+                    "Target": str(j.target),
+                    "Sources": [None if s is None else str(s) for s in j.sources],
+                    "Function": getattr(j.function, "__qualname__", repr(j.function)),
+                    "Size": j.size,
+                }
+                for j in self.jobs
+            ],
+            "TotalSize": self.total_size,
+        }
+
+    def to_json(self, path: Path | str | None = None) -> str:
+        """Serializes the description of the plan to JSON, optionally saving it to a file.
+
+        Args:
+            path: The path to save the JSON to, None to not save it.
+
+        Returns:
+            The JSON description of the plan.
+        """
+        text = json.dumps(self.to_dict(), indent=1)
+        if path is not None:
+            Path(path).write_text(text)
+        return text
+
+    # Execution
+    @staticmethod
+    def run_job(
+        job: ImportJob,
+        progress: ProgressTracker | None = None,
+        journal: ImportJournal | None = None,
+    ) -> bool:
+        """Imports a file, trying its sources in order until one succeeds.
+
+        Args:
+            job: The file to import.
+            progress: The progress tracker to report the file to, None to not report it.
+            journal: The journal to record the file in, None to not record it.
+
+        Returns:
+            True if the file was imported.
+        """
+        if journal is not None:
+            if journal.is_file_done(job.target):
+                return True
+            journal.file_begin(job.target)
+
+        error = None
+        for source in job.sources:
+            try:
+                job.function(source, job.target, **job.kwargs)
+            except Exception as e:
+                warn(f"Failed to BIDS import {source} to {job.target} with error: {e}", RuntimeWarning)
+                error = e
+            else:
+                if journal is not None:
+                    journal.file_done(job.target)
+                if progress is not None:
+                    progress.file_done(job.target, job.size)
+                return True
+
+        if journal is not None:
+            journal.file_failed(job.target)
+        if progress is not None:
+            progress.file_failed(job.target, error)
+        return False
+
+    def create_nodes(self, progress: ProgressTracker | None = None) -> None:
+        """Creates the nodes of the plan in order.
+
+        Args:
+            progress: The progress tracker to report the nodes to, None to not report them.
+        """
+        for node, container, name, build in self.nodes:
+            if progress is not None:
+                progress.enter_node(node.full_name or node.name)
+            if container is not None:
+                container[name] = node
+            node.create(build=build)
+
+    def execute(self, workers: int | None = None) -> int:
+        """Executes the plan, importing the largest files first, and releases its resources.
+
+        The files and bytes of the plan are added to the totals of the current progress tracker, so it can estimate
+        when the import will finish. The files are recorded in the current journal, and files which the journal
+        records as done are skipped.
+
+        Args:
+            workers: The number of workers which import files. Defaults to the workers of this plan.
+
+        Returns:
+            The number of files which were imported.
+        """
+        if workers is None:
+            workers = self.workers
+
+        journal = current_journal.get()
+        if (progress := current_progress.get()) is not None:
+            progress.add_total(len(self.jobs), self.total_size)
+
+        try:
+            self.create_nodes(progress)
+            jobs = sorted(self.jobs, key=lambda j: j.size, reverse=True)
+            if workers == 1 or len(jobs) < 2:
+                imported = sum(self.run_job(j, progress, journal) for j in jobs)
+            else:
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    imported = sum(executor.map(lambda j: self.run_job(j, progress, journal), jobs))
+
+            for finalizer in self.finalizers:
+                finalizer()
+        finally:
+            self.close()
+
+        return imported
@@ -0,0 +1,245 @@
+"""metadataresolver.py
+A resolver which merges the sidecars a BIDS file inherits, caching the results.
+"""
+# Package Header #
+from ..header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+from collections import OrderedDict
+from copy import deepcopy
+import json
+import os
+from pathlib import Path
+from threading import RLock
+from typing import Any
+
+# Third-Party Packages #
+from baseobjects import BaseObject
+
+# Local Packages #
+from .bidsname import BIDSName, parse_bids_name
+
+
+# Definitions #
+# Classes #
+class MetadataResolver(BaseObject):
+    """A resolver which merges the sidecars a BIDS file inherits, caching the results.
+
+    Following the BIDS inheritance principle, the sidecars of a file are the JSON files in its directory and each
+    parent directory up to the dataset root which have the same suffix and a subset of its entities. They are merged
+    from the root down, so values at lower levels override values at higher levels.
+
+    Directory listings, sidecar contents, and merged results are cached. The listings are checked against the
+    modification time of their directories and the sidecars against their own modification times. Each merged result
+    is keyed by the sidecars and modification times it was merged from, level by level, so files which inherit the
+    same sidecars share their merged results and a changed sidecar only causes the levels below it to be merged again.
+
+    Attributes:
+        root: The default dataset root to resolve from.
+        maxsize: The maximum number of sidecars and of merged results to cache.
+        _listings: The sidecars in each directory and the modification time of the directory.
+        _sidecars: The contents of each sidecar and its modification time.
+        _merged: The merged results keyed by the sidecars they were merged from.
+        _lock: The lock which protects the caches.
+
+    Args:
+        root: The default dataset root to resolve from.
+        maxsize: The maximum number of sidecars and of merged results to cache.
+        init: Determines if this object will construct.
+        **kwargs: Additional keyword arguments.
+    """
+
+    # Attributes #
+    root: Path | None = None
+    maxsize: int = 4096
+
+    _listings: dict[Path, tuple[int, list[tuple[Path, BIDSName]]]]
+    _sidecars: OrderedDict[Path, tuple[int, dict[str, Any]]]
+    _merged: OrderedDict[tuple[tuple[Path, int], ...], dict[str, Any]]
+    _lock: RLock
+
+    # Magic Methods #
+    # Construction/Destruction
+    def __init__(
+        self,
+        root: Path | str | None = None,
+        maxsize: int | None = None,
+        *,
+        init: bool = True,
+        **kwargs: Any,
+    ) -> None:
+        # New Attributes #
+        self._listings = {}
+        self._sidecars = OrderedDict()
+        self._merged = OrderedDict()
+        self._lock = RLock()
+
+        # Parent Attributes #
+        super().__init__(init=False)
+
+        # Object Construction #
+        if init:
+            self.construct(root=root, maxsize=maxsize, **kwargs)
+
+    # Pickling
+    def __getstate__(self) -> dict[str, Any]:
+        """Creates a dictionary of attributes which can be used to rebuild this object.
+
+        Returns:
+            A dictionary of this object's attributes.
+        """
+        state = super().__getstate__()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """Builds this object based on a dictionary of corresponding attributes.
+
+        Args:
+            state: The attributes to build this object from.
+        """
+        super().__setstate__(state)
+        self._lock = RLock()
+
+    # Instance Methods #
+    # Constructors/Destructors
+    def construct(self, root: Path | str | None = None, maxsize: int | None = None, **kwargs: Any) -> None:
+        """Constructs this object.
+
+        Args:
+            root: The default dataset root to resolve from.
+            maxsize: The maximum number of sidecars and of merged results to cache.
+            **kwargs: Additional keyword arguments.
+        """
+        if root is not None:
+            self.root = Path(root)
+
+        if maxsize is not None:
+            self.maxsize = maxsize
+
+        super().construct(**kwargs)
+
+    # Cache
+    def clear(self) -> None:
+        """Removes all cached listings, sidecars, and merged results."""
+        with self._lock:
+            self._listings.clear()
+            self._sidecars.clear()
+            self._merged.clear()
+
+    def list_sidecars(self, directory: Path) -> list[tuple[Path, BIDSName]]:
+        """Lists the JSON files in a directory, using the cached listing if the directory has not changed.
+
+        Args:
+            directory: The directory to list.
+
+        Returns:
+            The paths and parsed names of the JSON files.
+        """
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+        except FileNotFoundError:
+            return []
+
+        if (listing := self._listings.get(directory, None)) is not None and listing[0] == mtime:
+            return listing[1]
+
+        with os.scandir(directory) as entries:
+            sidecars = [
+                (Path(e.path), parse_bids_name(e.name))
+                for e in entries
+                if e.name[0] != "." and e.name[-5:] == ".json" and e.is_file()
+            ]
+        self._listings[directory] = (mtime, sidecars)
+        return sidecars
+
+    def load_sidecar(self, path: Path, mtime: int) -> dict[str, Any]:
+        """Loads the contents of a sidecar, using the cached contents if the sidecar has not changed.
+
+        Args:
+            path: The path to the sidecar.
+            mtime: The current modification time of the sidecar.
+
+        Returns:
+            The contents of the sidecar.
+        """
+        if (sidecar := self._sidecars.get(path, None)) is not None and sidecar[0] == mtime:
+            self._sidecars.move_to_end(path)
+            return sidecar[1]
+
+        with path.open("r") as file:
+            data = json.load(file)
+        self._sidecars[path] = (mtime, data)
+        while len(self._sidecars) > self.maxsize:
+            self._sidecars.popitem(last=False)
+        return data
+
+    # Resolve
+    def find_sidecars(self, directory: Path, name: BIDSName) -> list[Path]:
+        """Finds the sidecars in a directory which a file with the given name inherits.
+
+        Args:
+            directory: The directory to search.
+            name: The parsed name of the file.
+
+        Returns:
+            The paths of the sidecars, from the fewest to the most entities.
+        """
+        entities = name.entities
+        matches = [
+            (len(s_name.entities), s_path)
+            for s_path, s_name in self.list_sidecars(directory)
+            if s_name.suffix == name.suffix and all(entities.get(k, None) == v for k, v in s_name.entities.items())
+        ]
+        matches.sort()
+        return [p for _, p in matches]
+
+    def resolve(self, path: Path | str, root: Path | str | None = None) -> dict[str, Any]:
+        """Resolves the metadata of a file by merging the sidecars it inherits.
+
+        Args:
+            path: The path to the file, which does not need to exist.
+            root: The root of the dataset which contains the file. Defaults to the root of this resolver.
+
+        Returns:
+            The merged metadata, which can be modified without affecting the cache.
+        """
+        path = Path(path)
+        root = self.root if root is None else Path(root)
+        if root is None:
+            raise ValueError("A dataset root must be given to resolve metadata.")
+
+        name = parse_bids_name(path.name)
+        directories = [root]
+        for part in path.parent.relative_to(root).parts:
+            directories.append(directories[-1] / part)
+
+        key = ()
+        merged = {}
+        with self._lock:
+            for directory in directories:
+                level = [(p, os.stat(p).st_mtime_ns) for p in self.find_sidecars(directory, name)]
+                if not level:
+                    continue
+
+                key += tuple(level)
+                if (cached := self._merged.get(key, None)) is not None:
+                    self._merged.move_to_end(key)
+                    merged = cached
+                else:
+                    merged = merged.copy()
+                    for s_path, mtime in level:
+                        merged.update(self.load_sidecar(s_path, mtime))
+                    self._merged[key] = merged
+                    while len(self._merged) > self.maxsize:
+                        self._merged.popitem(last=False)
+
+        return deepcopy(merged)
@@ -0,0 +1,217 @@
+"""metaserializer.py
+A pluggable serializer of the mxbids meta information files which uses a fast JSON backend when it is installed.
+"""
+# Package Header #
+from ..header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+import json
+import math
+from pathlib import Path
+from typing import Any, ClassVar
+import zlib
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+# Third-Party Packages #
+from baseobjects import BaseObject
+
+# Local Packages #
+from .atomicwrite import atomic_open
+
+
+# Definitions #
+# Functions #
+def has_non_finite(data: Any) -> bool:
+    """Determines if data contains a NaN or infinite float, which orjson would write as null.
+
+    Args:
+        data: The data to check.
+
+    Returns:
+        True if any float in the data is not finite.
+    """
+    if isinstance(data, float):
+        return not math.isfinite(data)
+    elif isinstance(data, dict):
+        return any(has_non_finite(v) for v in data.values())
+    elif isinstance(data, (list, tuple)):
+        return any(has_non_finite(v) for v in data)
+    else:
+        return False
+
+
+# Classes #
+class MetaSerializer(BaseObject):
+    """A pluggable serializer of the mxbids meta information files which uses a fast JSON backend when it is installed.
+
+    Meta information files are internal to mxbids and are read at least once per node whenever a dataset is opened, so
+    they are parsed with orjson when it is installed and with the standard json module otherwise. Data orjson rejects
+    or would change, such as NaN and Infinity which it writes as null, falls back to the json module. Files can also be
+    written in a compact binary format, which is a magic header followed by zlib compressed JSON. Reading detects the
+    format from the header, so files written in either format, by either backend, are read transparently. The BIDS
+    sidecar files are not affected by the serializer.
+
+    Attributes:
+        default: The serializer which directories use when they do not set their own.
+        magic: The header which marks a file in the binary format.
+        binary: Determines if files are written in the binary format.
+        compresslevel: The zlib compression level of the binary format.
+        use_orjson: Determines if orjson is used when it is installed.
+
+    Args:
+        binary: Determines if files are written in the binary format.
+        compresslevel: The zlib compression level of the binary format.
+        use_orjson: Determines if orjson is used when it is installed.
+        init: Determines if this object will construct.
+        **kwargs: Additional keyword arguments.
+    """
+
+    # Class Attributes #
+    default: ClassVar["MetaSerializer"]
+    magic: ClassVar[bytes] = b"\x00MXBIDS\x01"
+
+    # Attributes #
+    binary: bool = False
+    compresslevel: int = 1
+    use_orjson: bool = True
+
+    # Properties #
+    @property
+    def backend(self) -> str:
+        """The name of the JSON backend this serializer uses."""
+        return "orjson" if self.use_orjson and orjson is not None else "json"
+
+    # Magic Methods #
+    # Construction/Destruction
+    def __init__(
+        self,
+        binary: bool | None = None,
+        compresslevel: int | None = None,
+        use_orjson: bool | None = None,
+        *,
+        init: bool = True,
+        **kwargs: Any,
+    ) -> None:
+        # Parent Attributes #
+        super().__init__(init=False)
+
+        # Object Construction #
+        if init:
+            self.construct(binary=binary, compresslevel=compresslevel, use_orjson=use_orjson, **kwargs)
+
+    # Instance Methods #
+    # Constructors/Destructors
+    def construct(
+        self,
+        binary: bool | None = None,
+        compresslevel: int | None = None,
+        use_orjson: bool | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Constructs this object.
+
+        Args:
+            binary: Determines if files are written in the binary format.
+            compresslevel: The zlib compression level of the binary format.
+            use_orjson: Determines if orjson is used when it is installed.
+            **kwargs: Additional keyword arguments.
+        """
+        if binary is not None:
+            self.binary = binary
+
+        if compresslevel is not None:
+            self.compresslevel = compresslevel
+
+        if use_orjson is not None:
+            self.use_orjson = use_orjson
+
+        super().construct(**kwargs)
+
+    # Serialization
+    def dumps(self, data: dict[str, Any]) -> bytes:
+        """Serializes meta information in the format of this serializer.
+
+        Args:
+            data: The meta information to serialize.
+
+        Returns:
+            The serialized meta information.
+        """
+        if self.use_orjson and orjson is not None and not has_non_finite(data):
+            try:
+                raw = orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+            except orjson.JSONEncodeError:
+                raw = json.dumps(data).encode()
+        else:
+            raw = json.dumps(data).encode()
+
+        if self.binary:
+            return self.magic + zlib.compress(raw, self.compresslevel)
+        else:
+            return raw
+
+    def loads(self, raw: bytes) -> dict[str, Any]:
+        """Deserializes meta information in either format.
+
+        Args:
+            raw: The serialized meta information.
+
+        Returns:
+            The meta information.
+
+        Raises:
+            ValueError: If the meta information cannot be parsed.
+        """
+        if raw[: len(self.magic)] == self.magic:
+            try:
+                raw = zlib.decompress(raw[len(self.magic) :])
+            except zlib.error as e:
+                raise ValueError(f"Binary meta information cannot be decompressed: {e}") from e
+
+        if self.use_orjson and orjson is not None:
+            try:
+                return orjson.loads(raw)
+            except orjson.JSONDecodeError:
+                pass
+
+        return json.loads(raw)
+
+    def load(self, path: Path | str) -> dict[str, Any]:
+        """Reads a meta information file in either format.
+
+        Args:
+            path: The path to the meta information file.
+
+        Returns:
+            The meta information.
+        """
+        with open(path, "rb") as file:
+            return self.loads(file.read())
+
+    def dump(self, path: Path | str, data: dict[str, Any], lock: bool = True) -> None:
+        """Writes a meta information file atomically in the format of this serializer.
+
+        Args:
+            path: The path to the meta information file.
+            data: The meta information to write.
+            lock: Determines if the file lock is held while writing.
+        """
+        raw = self.dumps(data)
+        with atomic_open(path, "wb", lock) as file:
+            file.write(raw)
+
+
+# Assign Default
+MetaSerializer.default = MetaSerializer()
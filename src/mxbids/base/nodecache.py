@@ -0,0 +1,478 @@
+"""nodecache.py
+A memory bounded cache of the loaded nodes of a dataset, which evicts the least recently used nodes.
+"""
+# Package Header #
+from ..header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+from collections import OrderedDict
+from collections.abc import Iterator, MutableMapping
+from contextlib import nullcontext
+from pathlib import Path
+import sys
+from threading import RLock
+from typing import Any, NamedTuple
+
+# Third-Party Packages #
+from baseobjects import BaseObject
+
+# Local Packages #
+
+
+# Definitions #
+# Classes #
+class EvictedNode(NamedTuple):
+    """The information needed to reload a node which was evicted from a node map.
+
+    Attributes:
+        type: The class of the node.
+        path: The path to the node's directory.
+        mode: The file mode of the node.
+    """
+
+    type: type
+    path: Path
+    mode: str
+
+
+class NodeCache(BaseObject):
+    """A memory bounded cache of the loaded nodes of a dataset, which evicts the least recently used nodes.
+
+    The cache tracks the nodes held by the node maps it is attached to, which are the subjects of a dataset and the
+    sessions and modalities below them. Accessing a node through a map marks it and the nodes above it as used, and
+    once the cache holds more nodes or more estimated bytes than its limits, the least recently used nodes are
+    evicted. Only nodes opened in read mode are evicted, because a writable node may have changes which were not
+    saved, so writable nodes count towards the limits but stay loaded. An evicted node is dropped from its map, which
+    reloads it from its directory when it is next accessed. If nothing else holds the node, it is unloaded, which drops
+    its tables and closes its open files. A node which is still held elsewhere stays complete and usable, but it is
+    detached from the cache and is not the node its map reloads.
+
+    The size of a node is estimated when it is accessed, so tables loaded after an access are counted on the next one.
+
+    Attributes:
+        max_nodes: The maximum number of nodes to keep loaded, None for no limit.
+        max_bytes: The maximum estimated memory in bytes of the loaded nodes, None for no limit.
+        evictions: The number of nodes which were evicted.
+        _entries: The map, key, and estimated size of each loaded node in order of use.
+        _bytes: The estimated memory in bytes of the loaded nodes.
+        _lock: The lock which protects the cache and the maps attached to it.
+
+    Args:
+        max_nodes: The maximum number of nodes to keep loaded, None for no limit.
+        max_bytes: The maximum estimated memory in bytes of the loaded nodes, None for no limit.
+        init: Determines if this object will construct.
+        **kwargs: Additional keyword arguments.
+    """
+
+    # Attributes #
+    max_nodes: int | None = None
+    max_bytes: int | None = None
+    evictions: int = 0
+
+    _entries: OrderedDict[tuple[int, str], tuple["NodeMap", str, int]]
+    _bytes: int = 0
+    _lock: "RLock"
+
+    # Properties #
+    @property
+    def lock(self) -> "RLock":
+        """The lock which protects the cache and the maps attached to it."""
+        return self._lock
+
+    @property
+    def size(self) -> int:
+        """The estimated memory in bytes of the loaded nodes."""
+        return self._bytes
+
+    # Magic Methods #
+    # Construction/Destruction
+    def __init__(
+        self,
+        max_nodes: int | None = None,
+        max_bytes: int | None = None,
+        *,
+        init: bool = True,
+        **kwargs: Any,
+    ) -> None:
+        # New Attributes #
+        self._entries = OrderedDict()
+        self._lock = RLock()
+
+        # Parent Attributes #
+        super().__init__(init=False)
+
+        # Object Construction #
+        if init:
+            self.construct(max_nodes=max_nodes, max_bytes=max_bytes, **kwargs)
+
+    def __len__(self) -> int:
+        """Gets the number of loaded nodes.
+
+        Returns:
+            The number of loaded nodes.
+        """
+        return len(self._entries)
+
+    # Pickling
+    def __getstate__(self) -> dict[str, Any]:
+        """Creates a dictionary of attributes which can be used to rebuild this object.
+
+        The loaded nodes are not kept, so a rebuilt cache starts empty.
+
+        Returns:
+            A dictionary of this object's attributes.
+        """
+        state = super().__getstate__()
+        del state["_lock"]
+        state["_entries"] = OrderedDict()
+        state["_bytes"] = 0
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """Builds this object based on a dictionary of corresponding attributes.
+
+        Args:
+            state: The attributes to build this object from.
+        """
+        super().__setstate__(state)
+        self._lock = RLock()
+
+    # Instance Methods #
+    # Constructors/Destructors
+    def construct(self, max_nodes: int | None = None, max_bytes: int | None = None, **kwargs: Any) -> None:
+        """Constructs this object.
+
+        Args:
+            max_nodes: The maximum number of nodes to keep loaded, None for no limit.
+            max_bytes: The maximum estimated memory in bytes of the loaded nodes, None for no limit.
+            **kwargs: Additional keyword arguments.
+        """
+        if max_nodes is not None:
+            self.max_nodes = max_nodes
+
+        if max_bytes is not None:
+            self.max_bytes = max_bytes
+
+        super().construct(**kwargs)
+
+    # Entries
+    def register(self, node_map: "NodeMap", key: str, node: Any) -> None:
+        """Tracks a loaded node or marks it as the most recently used, without evicting any nodes.
+
+        Args:
+            node_map: The map which holds the node.
+            key: The key of the node in the map.
+            node: The node.
+        """
+        size = node.estimate_memory() if self.max_bytes is not None else 0
+        with self._lock:
+            if (entry := self._entries.pop((id(node_map), key), None)) is not None:
+                self._bytes -= entry[2]
+            self._entries[(id(node_map), key)] = (node_map, key, size)
+            self._bytes += size
+
+    def discard(self, node_map: "NodeMap", key: str) -> None:
+        """Stops tracking a node.
+
+        Args:
+            node_map: The map which holds the node.
+            key: The key of the node in the map.
+        """
+        with self._lock:
+            if (entry := self._entries.pop((id(node_map), key), None)) is not None:
+                self._bytes -= entry[2]
+
+    def is_full(self) -> bool:
+        """Determines if the loaded nodes exceed the limits of this cache.
+
+        Returns:
+            True if there are too many nodes or they use too much memory.
+        """
+        return (self.max_nodes is not None and len(self._entries) > self.max_nodes) or (
+            self.max_bytes is not None and self._bytes > self.max_bytes
+        )
+
+    def touch(self, node_map: "NodeMap", key: str, node: Any) -> None:
+        """Marks a node and the nodes above it as the most recently used, then evicts nodes which exceed the limits.
+
+        Args:
+            node_map: The map which holds the node.
+            key: The key of the node in the map.
+            node: The node.
+        """
+        with self._lock:
+            used = set()
+            while True:
+                self.register(node_map, key, node)
+                used.add((id(node_map), key))
+                if (parent := node_map.parent) is None or (node := parent[0].get_loaded(parent[1])) is None:
+                    break
+                node_map, key = parent
+            self.evict(used)
+
+    def evict(self, keep: set[tuple[int, str]] = frozenset()) -> None:
+        """Evicts the least recently used nodes until the loaded nodes are within the limits of this cache.
+
+        Args:
+            keep: The map ids and keys of the nodes which must not be evicted.
+        """
+        with self._lock:
+            for entry_key in list(self._entries):
+                if not self.is_full():
+                    break
+                # Evicting a node stops tracking the nodes below it, so later entries may already be gone.
+                if entry_key in keep or (entry := self._entries.get(entry_key, None)) is None:
+                    continue
+                node_map, key, size = entry
+                if not node_map.is_evictable(key):
+                    continue
+                del self._entries[entry_key]
+                self._bytes -= size
+                self.evictions += 1
+                node_map.evict(key)
+
+    def clear(self) -> None:
+        """Stops tracking all nodes without evicting them."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def get_statistics(self) -> dict[str, int]:
+        """Gets the number of loaded nodes, their estimated memory, and the number of evictions.
+
+        Returns:
+            The nodes, bytes, and evictions of the cache.
+        """
+        with self._lock:
+            return {"Nodes": len(self._entries), "Bytes": self._bytes, "Evictions": self.evictions}
+
+
+class NodeMap(MutableMapping):
+    """A mapping of the child nodes of a node, which can evict loaded nodes and reload them on their next access.
+
+    Without a node cache the map behaves as a dictionary. With a node cache, the map reports each access to the cache,
+    which may evict the least recently used nodes of any map attached to it. Evicted nodes keep their key and are
+    reloaded from their directory when they are next accessed, so iterating over the map or checking its length does
+    not load any nodes.
+
+    Attributes:
+        _nodes: The loaded nodes and the information to reload the evicted nodes.
+        _cache: The node cache this map reports to, None if the map does not evict nodes.
+        _parent: The map and key of the node which holds this map, None if it is the top map.
+
+    Args:
+        nodes: The nodes to start with.
+    """
+
+    __slots__: tuple[str, ...] = ("_nodes", "_cache", "_parent")
+
+    # Properties #
+    @property
+    def cache(self) -> NodeCache | None:
+        """The node cache this map reports to."""
+        return self._cache
+
+    @property
+    def parent(self) -> tuple["NodeMap", str] | None:
+        """The map and key of the node which holds this map."""
+        return self._parent
+
+    # Magic Methods #
+    # Construction/Destruction
+    def __init__(self, nodes: dict[str, Any] | None = None) -> None:
+        # New Attributes #
+        self._nodes: dict[str, Any] = {}
+        self._cache: NodeCache | None = None
+        self._parent: tuple[NodeMap, str] | None = None
+
+        if nodes:
+            self.update(nodes)
+
+    # Container Methods
+    def __getitem__(self, key: str) -> Any:
+        """Gets a node, reloading it if it was evicted.
+
+        Args:
+            key: The key of the node.
+
+        Returns:
+            The node.
+        """
+        cache = self._cache
+        with nullcontext() if cache is None else cache.lock:
+            if isinstance(node := self._nodes[key], EvictedNode):
+                self._nodes[key] = node = node.type(path=node.path, mode=node.mode, load=True)
+                self.attach(key, node)
+            if cache is not None:
+                cache.touch(self, key, node)
+            return node
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        """Sets a node, attaching its child nodes to the node cache of this map.
+
+        Args:
+            key: The key of the node.
+            value: The node.
+        """
+        cache = self._cache
+        with nullcontext() if cache is None else cache.lock:
+            self._nodes[key] = value
+            self.attach(key, value)
+            if cache is not None:
+                cache.touch(self, key, value)
+
+    def __delitem__(self, key: str) -> None:
+        """Removes a node without unloading it.
+
+        Args:
+            key: The key of the node.
+        """
+        del self._nodes[key]
+        if self._cache is not None:
+            self._cache.discard(self, key)
+
+    def __contains__(self, key: object) -> bool:
+        """Determines if a key is in this map, whether its node is loaded or evicted.
+
+        Args:
+            key: The key to check for.
+
+        Returns:
+            True if the key is in this map.
+        """
+        return key in self._nodes
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterates over the keys of this map.
+
+        Returns:
+            An iterator of the keys.
+        """
+        return iter(list(self._nodes))
+
+    def __len__(self) -> int:
+        """Gets the number of nodes in this map, whether they are loaded or evicted.
+
+        Returns:
+            The number of nodes.
+        """
+        return len(self._nodes)
+
+    # Representation
+    def __repr__(self) -> str:
+        """Gets the representation of this map without loading any evicted nodes.
+
+        Returns:
+            The representation of this map.
+        """
+        return f"{self.__class__.__name__}({self._nodes!r})"
+
+    # Instance Methods #
+    def get_loaded(self, key: str) -> Any:
+        """Gets a node if it is loaded without reporting the access to the node cache.
+
+        Args:
+            key: The key of the node.
+
+        Returns:
+            The node, or None if it is evicted or not in this map.
+        """
+        node = self._nodes.get(key, None)
+        return None if isinstance(node, EvictedNode) else node
+
+    def loaded_items(self) -> list[tuple[str, Any]]:
+        """Gets the keys and nodes which are loaded without reloading any evicted nodes.
+
+        Returns:
+            The keys and nodes which are loaded.
+        """
+        return [(k, n) for k, n in self._nodes.items() if not isinstance(n, EvictedNode)]
+
+    def loaded_values(self) -> list[Any]:
+        """Gets the nodes which are loaded without reloading any evicted nodes.
+
+        Returns:
+            The nodes which are loaded.
+        """
+        return [n for n in self._nodes.values() if not isinstance(n, EvictedNode)]
+
+    def clear(self) -> None:
+        """Removes all nodes without unloading or reloading them."""
+        if self._cache is not None:
+            with self._cache.lock:
+                for key in self._nodes:
+                    self._cache.discard(self, key)
+        self._nodes.clear()
+
+    # Node Cache
+    def attach(self, key: str, node: Any) -> None:
+        """Links the child nodes of a node to this map and its node cache.
+
+        Args:
+            key: The key of the node.
+            node: The node.
+        """
+        if isinstance(children := getattr(node, "child_nodes", None), NodeMap):
+            children._parent = (self, key)
+            children.set_cache(self._cache)
+
+    def set_cache(self, cache: NodeCache | None) -> None:
+        """Sets the node cache of this map and the maps below it, tracking their loaded nodes.
+
+        Args:
+            cache: The node cache to report to, None to stop evicting nodes.
+        """
+        if self._cache is not None and self._cache is not cache:
+            for key in self._nodes:
+                self._cache.discard(self, key)
+
+        self._cache = cache
+        for key, node in self.loaded_items():
+            self.attach(key, node)
+            if cache is not None:
+                cache.register(self, key, node)
+
+        if cache is not None and self._parent is None:
+            cache.evict()
+
+    def is_evictable(self, key: str) -> bool:
+        """Determines if a node can be evicted, which requires it to be loaded and opened in read mode.
+
+        Args:
+            key: The key of the node.
+
+        Returns:
+            True if the node can be reloaded from its directory without losing any changes.
+        """
+        return (node := self.get_loaded(key)) is not None and getattr(node, "_mode", None) == "r"
+
+    def evict(self, key: str) -> None:
+        """Drops the reference to a node, keeping the information to reload it on its next access.
+
+        The maps below the node are detached from the node cache and their nodes are evicted in turn. The node is only
+        unloaded if this map held the only reference to it, so a node which is still held elsewhere stays complete.
+
+        Args:
+            key: The key of the node.
+        """
+        if (node := self.get_loaded(key)) is None:
+            return
+
+        self._nodes[key] = EvictedNode(type(node), node.path, node._mode)
+        if isinstance(children := getattr(node, "child_nodes", None), NodeMap):
+            children._parent = None
+            children.set_cache(None)
+            for child_key in list(children):
+                children.evict(child_key)
+
+        # The only references left are the local name and the argument of getrefcount.
+        if sys.getrefcount(node) <= 2:
+            node.unload()
@@ -0,0 +1,236 @@
+"""nodehandle.py
+Picklable handles to the nodes of a dataset and a parallel engine which maps a function over the nodes.
+"""
+# Package Header #
+from ..header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from itertools import islice
+import os
+from pathlib import Path
+from typing import Any, NamedTuple
+
+# Third-Party Packages #
+
+# Local Packages #
+
+
+# Definitions #
+# Classes #
+class NodeHandle(NamedTuple):
+    """A picklable handle to a node of a dataset, which reopens the node without dispatching its class again.
+
+    Attributes:
+        head: The head class of the node's class register, such as Session.
+        path: The path to the node's directory.
+        namespace: The namespace of the node's class.
+        name: The registered name of the node's class.
+        module: The module which registers the node's class.
+        mode: The file mode to open the node in.
+    """
+
+    head: type
+    path: Path
+    namespace: str
+    name: str
+    module: str | None
+    mode: str = "r"
+
+    # Class Methods #
+    @classmethod
+    def from_path(cls, head: type, path: Path | str, mode: str = "r") -> "NodeHandle":
+        """Creates a handle to a node from its path, reading its class information from its meta information.
+
+        Args:
+            head: The head class of the node's class register, such as Session.
+            path: The path to the node's directory.
+            mode: The file mode to open the node in.
+
+        Returns:
+            The handle to the node.
+        """
+        path = Path(path)
+        namespace, name, module = head.get_class_information(path=path)
+        return cls(head, path, namespace, name, module or None, mode)
+
+    @classmethod
+    def from_node(cls, node: Any) -> "NodeHandle":
+        """Creates a handle to a loaded node.
+
+        Args:
+            node: The node to create a handle to.
+
+        Returns:
+            The handle to the node.
+        """
+        type_ = type(node)
+        return cls(
+            type_.class_register_head,
+            node.path,
+            type_.class_register_namespace,
+            type_.class_register_name,
+            type_.default_meta_information["Python"]["Module"] or None,
+            node._mode,
+        )
+
+    # Instance Methods #
+    def get_class(self) -> type:
+        """Gets the class of the node, importing its module if needed.
+
+        Returns:
+            The class of the node, or the head class if the class is not registered.
+        """
+        return self.head.get_registered_class(self.namespace, self.name, self.module) or self.head
+
+    def open(self, load: bool = True) -> Any:
+        """Opens the node.
+
+        Args:
+            load: Determines if the contents of the node will be loaded.
+
+        Returns:
+            The node.
+        """
+        return self.get_class()(path=self.path, mode=self.mode, load=load)
+
+
+class NodeResult(NamedTuple):
+    """The result of applying a function to a node.
+
+    Attributes:
+        handle: The handle to the node.
+        value: The value the function returned, None if it failed.
+        error: The exception of the last attempt if the function failed, None if it succeeded.
+        attempts: The number of times the function was applied.
+    """
+
+    handle: NodeHandle
+    value: Any = None
+    error: BaseException | None = None
+    attempts: int = 1
+
+    # Properties #
+    @property
+    def ok(self) -> bool:
+        """Determines if the function succeeded."""
+        return self.error is None
+
+
+# Functions #
+def apply_to_node(fn: Callable[[Any], Any], handle: NodeHandle, retries: int = 0, load: bool = True) -> NodeResult:
+    """Opens a node and applies a function to it, retrying it if it fails and unloading the node afterwards.
+
+    Args:
+        fn: The function to apply to the node.
+        handle: The handle to the node.
+        retries: The number of times to retry the function after it fails.
+        load: Determines if the contents of the node will be loaded before the function is applied.
+
+    Returns:
+        The result of the function.
+    """
+    error = None
+    for attempt in range(1, retries + 2):
+        node = None
+        try:
+            node = handle.open(load=load)
+            return NodeResult(handle, fn(node), None, attempt)
+        except Exception as e:
+            error = e
+        finally:
+            if node is not None:
+                node.unload()
+    return NodeResult(handle, None, error, retries + 1)
+
+
+def apply_to_nodes(
+    fn: Callable[[Any], Any],
+    handles: list[NodeHandle],
+    retries: int = 0,
+    load: bool = True,
+) -> list[NodeResult]:
+    """Applies a function to a chunk of nodes in a worker.
+
+    Args:
+        fn: The function to apply to each node.
+        handles: The handles to the nodes.
+        retries: The number of times to retry the function after it fails on a node.
+        load: Determines if the contents of each node will be loaded before the function is applied.
+
+    Returns:
+        The results of the function for each node.
+    """
+    return [apply_to_node(fn, h, retries, load) for h in handles]
+
+
+def map_nodes(
+    fn: Callable[[Any], Any],
+    handles: Iterable[NodeHandle],
+    workers: int | None = None,
+    backend: str = "process",
+    chunksize: int = 1,
+    retries: int = 0,
+    load: bool = True,
+) -> Iterator[NodeResult]:
+    """Applies a function to nodes in parallel workers, yielding the results as they complete.
+
+    The handles are sent to the workers in chunks, and each worker opens its nodes from their handles, applies the
+    function, and unloads them. Only a few chunks per worker are submitted ahead, so handles can be generated lazily.
+    Failures do not stop the map, they are retried and then returned as results with their exception. With the process
+    backend, the function and its return values must be picklable.
+
+    Args:
+        fn: The function to apply to each node.
+        handles: The handles to the nodes.
+        workers: The number of workers, None for the default of the executor.
+        backend: The kind of workers, which is "process" or "thread".
+        chunksize: The number of nodes sent to a worker at a time.
+        retries: The number of times to retry the function after it fails on a node.
+        load: Determines if the contents of each node will be loaded before the function is applied.
+
+    Returns:
+        The results of the function for each node in order of completion.
+
+    Raises:
+        ValueError: If the backend is not "process" or "thread".
+    """
+    if backend == "process":
+        executor: Executor = ProcessPoolExecutor(max_workers=workers)
+    elif backend == "thread":
+        executor = ThreadPoolExecutor(max_workers=workers)
+    else:
+        raise ValueError(f"{backend} is not a map backend, which are process or thread.")
+
+    handles = iter(handles)
+    limit = 2 * (workers or os.cpu_count() or 1)
+    pending: dict[Future, list[NodeHandle]] = {}
+    with executor:
+        try:
+            while True:
+                while len(pending) < limit and (chunk := list(islice(handles, max(chunksize, 1)))):
+                    pending[executor.submit(apply_to_nodes, fn, chunk, retries, load)] = chunk
+                if not pending:
+                    break
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    chunk = pending.pop(future)
+                    try:
+                        results = future.result()
+                    except Exception as e:
+                        # The worker or the transfer of the chunk failed, so the chunk has no results of its own
+                        results = [NodeResult(h, None, e, 1) for h in chunk]
+                    yield from results
+        finally:
+            for future in pending:
+                future.cancel()
@@ -0,0 +1,469 @@
+"""progress.py
+Progress, throughput, and ETA reporting for imports and exports with pluggable reporters.
+"""
+# Package Header #
+from ..header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+from collections import deque
+from collections.abc import Callable, Iterable
+from contextvars import ContextVar, Token
+from datetime import timedelta
+import json
+import os
+from pathlib import Path
+import sys
+from threading import RLock
+import time
+from typing import NamedTuple, Any, TextIO
+
+# Third-Party Packages #
+from baseobjects import BaseObject
+
+# Local Packages #
+
+
+# Definitions #
+# Functions #
+def format_bytes(size: float) -> str:
+    """Formats a number of bytes with a binary unit.
+
+    Args:
+        size: The number of bytes.
+
+    Returns:
+        The formatted size.
+    """
+    for unit in ("B", "KiB", "MiB", "GiB", "TiB"):
+        if abs(size) < 1024 or unit == "TiB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+# Classes #
+class ProgressEvent(NamedTuple):
+    """A snapshot of the progress of a job when something happened.
+
+    Attributes:
+        kind: What happened: "start", "node", "file", "error", or "finish".
+        node: The name of the node being worked on.
+        path: The path of the file the event is about, None if it is not about a file.
+        message: A description of an error, None for other events.
+        files_done: The number of files which have been completed.
+        files_failed: The number of files which have failed.
+        files_total: The total number of files, None if it is unknown.
+        bytes_done: The number of bytes which have been completed.
+        bytes_total: The total number of bytes, None if it is unknown.
+        elapsed: The number of seconds since the job started.
+        rate: The recent throughput in bytes per second.
+        eta: The estimated number of seconds until the job finishes, None if it is unknown.
+    """
+
+    kind: str
+    node: str | None
+    path: str | None
+    message: str | None
+    files_done: int
+    files_failed: int
+    files_total: int | None
+    bytes_done: int
+    bytes_total: int | None
+    elapsed: float
+    rate: float
+    eta: float | None
+
+
+class ProgressReporter(BaseObject):
+    """A base class for the reporters which receive the progress events of a job."""
+
+    # Instance Methods #
+    def report(self, event: ProgressEvent) -> None:
+        """Receives a progress event.
+
+        Args:
+            event: The progress event.
+        """
+
+    def close(self) -> None:
+        """Finishes reporting."""
+
+
+class CallbackProgressReporter(ProgressReporter):
+    """A reporter which gives each progress event to a callback.
+
+    Attributes:
+        callback: The callable which receives each event.
+
+    Args:
+        callback: The callable which receives each event.
+    """
+
+    # Magic Methods #
+    # Construction/Destruction
+    def __init__(self, callback: Callable[[ProgressEvent], Any]) -> None:
+        # New Attributes #
+        self.callback: Callable[[ProgressEvent], Any] = callback
+
+        # Parent Attributes #
+        super().__init__()
+
+    # Instance Methods #
+    def report(self, event: ProgressEvent) -> None:
+        """Gives a progress event to the callback.
+
+        Args:
+            event: The progress event.
+        """
+        self.callback(event)
+
+
+class JSONLinesProgressReporter(ProgressReporter):
+    """A reporter which writes each progress event as a line of JSON.
+
+    Attributes:
+        stream: The text stream the lines are written to.
+        _owned: Determines if the stream was opened by this reporter and is closed with it.
+
+    Args:
+        output: The path of the file to append the lines to, or a text stream to write them to.
+    """
+
+    # Magic Methods #
+    # Construction/Destruction
+    def __init__(self, output: Path | str | TextIO) -> None:
+        # New Attributes #
+        self._owned: bool = isinstance(output, (str, os.PathLike))
+        self.stream: TextIO = open(output, "a") if self._owned else output
+
+        # Parent Attributes #
+        super().__init__()
+
+    # Instance Methods #
+    def report(self, event: ProgressEvent) -> None:
+        """Writes a progress event as a line of JSON.
+
+        Args:
+            event: The progress event.
+        """
+        self.stream.write(json.dumps({"time": time.time()} | event._asdict()) + "\n")
+        if event.kind != "file":
+            self.stream.flush()
+
+    def close(self) -> None:
+        """Flushes the stream, closing it if this reporter opened it."""
+        if self._owned:
+            self.stream.close()
+        else:
+            self.stream.flush()
+
+
+class ConsoleProgressReporter(ProgressReporter):
+    """A reporter which draws a progress bar with the throughput and ETA on a console.
+
+    Attributes:
+        stream: The text stream the bar is drawn on.
+        width: The number of characters in the bar.
+        interval: The minimum number of seconds between redrawing the bar.
+        _last: The time the bar was last drawn.
+
+    Args:
+        stream: The text stream the bar is drawn on, defaults to standard error.
+        width: The number of characters in the bar.
+        interval: The minimum number of seconds between redrawing the bar.
+    """
+
+    # Magic Methods #
+    # Construction/Destruction
+    def __init__(self, stream: TextIO | None = None, width: int = 30, interval: float = 0.5) -> None:
+        # New Attributes #
+        self.stream: TextIO = sys.stderr if stream is None else stream
+        self.width: int = width
+        self.interval: float = interval
+        self._last: float = 0.0
+
+        # Parent Attributes #
+        super().__init__()
+
+    # Instance Methods #
+    def format_event(self, event: ProgressEvent) -> str:
+        """Formats a progress event as a line with a progress bar.
+
+        Args:
+            event: The progress event.
+
+        Returns:
+            The formatted line.
+        """
+        if event.bytes_total:
+            fraction = event.bytes_done / event.bytes_total
+        elif event.files_total:
+            fraction = (event.files_done + event.files_failed) / event.files_total
+        else:
+            fraction = None
+
+        if fraction is None:
+            bar = ""
+        else:
+            filled = int(self.width * min(fraction, 1.0))
+            bar = f"[{'#' * filled}{'.' * (self.width - filled)}] {fraction:4.0%} "
+
+        files = f"{event.files_done}" if event.files_total is None else f"{event.files_done}/{event.files_total}"
+        failed = f" ({event.files_failed} failed)" if event.files_failed else ""
+        eta = "" if event.eta is None else f" ETA {timedelta(seconds=round(event.eta))}"
+        node = "" if event.node is None else f" {event.node}"
+        return f"{bar}{files} files{failed} {format_bytes(event.bytes_done)} {format_bytes(event.rate)}/s{eta}{node}"
+
+    def report(self, event: ProgressEvent) -> None:
+        """Redraws the progress bar if enough time has passed, and always on errors and when the job finishes.
+
+        Args:
+            event: The progress event.
+        """
+        now = time.monotonic()
+        if event.kind == "error":
+            self.stream.write(f"\nError with {event.path}: {event.message}\n")
+        elif event.kind != "finish" and now - self._last < self.interval:
+            return
+
+        self._last = now
+        self.stream.write(f"\r{self.format_event(event)}\033[K")
+        if event.kind == "finish":
+            self.stream.write("\n")
+        self.stream.flush()
+
+
+class ProgressTracker(BaseObject):
+    """A thread safe tracker of the progress of an import or export which reports events to pluggable reporters.
+
+    Importers and exporters at every level report their nodes and files to the tracker of the current context, so a
+    job is tracked by entering the tracker as a context manager around it. The throughput is measured over a recent
+    window of time so a stalled file system shows up as a falling rate, and the ETA is available when the totals are
+    known, such as when an import plan is executed. Events are given to the reporters under the lock of the tracker,
+    so reporters receive them in order and are never called from two workers at once.
+
+    Attributes:
+        reporters: The reporters which receive the progress events.
+        window: The number of seconds the throughput is measured over.
+        node: The name of the node being worked on.
+        files_done: The number of files which have been completed.
+        files_failed: The number of files which have failed.
+        files_total: The total number of files, None if it is unknown.
+        bytes_done: The number of bytes which have been completed.
+        bytes_total: The total number of bytes, None if it is unknown.
+        _start: The time the job started.
+        _samples: The recent times and bytes done which the throughput is measured from.
+        _tokens: The tokens of the context variable for each time the tracker was entered.
+        _lock: The lock which protects the counters and serializes the reporters.
+
+    Args:
+        reporters: The reporters which receive the progress events.
+        window: The number of seconds the throughput is measured over.
+        init: Determines if this object will construct.
+        **kwargs: Additional keyword arguments.
+    """
+
+    # Attributes #
+    reporters: list[ProgressReporter]
+    window: float = 10.0
+
+    node: str | None = None
+    files_done: int = 0
+    files_failed: int = 0
+    files_total: int | None = None
+    bytes_done: int = 0
+    bytes_total: int | None = None
+
+    _start: float | None = None
+    _samples: deque[tuple[float, int]]
+    _tokens: list[Token]
+    _lock: RLock
+
+    # Magic Methods #
+    # Construction/Destruction
+    def __init__(
+        self,
+        reporters: Iterable[ProgressReporter] | None = None,
+        window: float | None = None,
+        *,
+        init: bool = True,
+        **kwargs: Any,
+    ) -> None:
+        # New Attributes #
+        self.reporters = []
+        self._samples = deque()
+        self._tokens = []
+        self._lock = RLock()
+
+        # Parent Attributes #
+        super().__init__(init=False)
+
+        # Object Construction #
+        if init:
+            self.construct(reporters=reporters, window=window, **kwargs)
+
+    def __enter__(self) -> "ProgressTracker":
+        """Makes this the tracker of the current context and starts tracking."""
+        self._tokens.append(current_progress.set(self))
+        if self._start is None:
+            self.start()
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        """Finishes tracking and restores the previous tracker of the context."""
+        current_progress.reset(self._tokens.pop())
+        if not self._tokens:
+            self.finish()
+
+    # Instance Methods #
+    # Constructors/Destructors
+    def construct(
+        self,
+        reporters: Iterable[ProgressReporter] | None = None,
+        window: float | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Constructs this object.
+
+        Args:
+            reporters: The reporters which receive the progress events.
+            window: The number of seconds the throughput is measured over.
+            **kwargs: Additional keyword arguments.
+        """
+        if reporters is not None:
+            self.reporters.extend(reporters)
+
+        if window is not None:
+            self.window = window
+
+        super().construct(**kwargs)
+
+    # Events
+    def create_event(self, kind: str, path: Path | str | None = None, message: str | None = None) -> ProgressEvent:
+        """Creates a snapshot of the progress, which must be called while holding the lock.
+
+        Args:
+            kind: What happened.
+            path: The path of the file the event is about.
+            message: A description of an error.
+
+        Returns:
+            The progress event.
+        """
+        now = time.monotonic()
+        elapsed = 0.0 if self._start is None else now - self._start
+        samples = self._samples
+        samples.append((now, self.bytes_done))
+        while len(samples) > 2 and now - samples[1][0] >= self.window:
+            samples.popleft()
+        span = now - samples[0][0]
+        rate = (self.bytes_done - samples[0][1]) / span if span > 0 else 0.0
+
+        if self.bytes_total is not None and rate > 0:
+            eta = max(self.bytes_total - self.bytes_done, 0) / rate
+        elif self.files_total is not None and self.files_done and elapsed > 0:
+            remaining = self.files_total - self.files_done - self.files_failed
+            eta = max(remaining, 0) * elapsed / self.files_done
+        else:
+            eta = None
+
+        return ProgressEvent(
+            kind,
+            self.node,
+            None if path is None else str(path),
+            message,
+            self.files_done,
+            self.files_failed,
+            self.files_total,
+            self.bytes_done,
+            self.bytes_total,
+            elapsed,
+            rate,
+            eta,
+        )
+
+    def emit(self, event: ProgressEvent) -> None:
+        """Gives an event to each reporter, one event at a time so reporters are never called concurrently.
+
+        Args:
+            event: The progress event.
+        """
+        with self._lock:
+            for reporter in self.reporters:
+                reporter.report(event)
+
+    def start(self, files_total: int | None = None, bytes_total: int | None = None) -> None:
+        """Starts tracking a job.
+
+        Args:
+            files_total: The total number of files, None if it is unknown.
+            bytes_total: The total number of bytes, None if it is unknown.
+        """
+        with self._lock:
+            self._start = time.monotonic()
+            self._samples.clear()
+            self.files_total = files_total
+            self.bytes_total = bytes_total
+            self.emit(self.create_event("start"))
+
+    def add_total(self, files: int = 0, size: int = 0) -> None:
+        """Adds to the total number of files and bytes of the job, such as when a plan is executed.
+
+        Args:
+            files: The number of files to add.
+            size: The number of bytes to add.
+        """
+        with self._lock:
+            self.files_total = (self.files_total or 0) + files
+            self.bytes_total = (self.bytes_total or 0) + size
+
+    def enter_node(self, node: str) -> None:
+        """Records the node being worked on.
+
+        Args:
+            node: The name of the node.
+        """
+        with self._lock:
+            self.node = node
+            self.emit(self.create_event("node"))
+
+    def file_done(self, path: Path | str, size: int = 0) -> None:
+        """Records a completed file.
+
+        Args:
+            path: The path of the file.
+            size: The size of the file in bytes.
+        """
+        with self._lock:
+            self.files_done += 1
+            self.bytes_done += size
+            self.emit(self.create_event("file", path))
+
+    def file_failed(self, path: Path | str | None, error: BaseException | str) -> None:
+        """Records a failed file.
+
+        Args:
+            path: The path of the file.
+            error: The error which caused the failure.
+        """
+        with self._lock:
+            self.files_failed += 1
+            self.emit(self.create_event("error", path, str(error)))
+
+    def finish(self) -> None:
+        """Finishes tracking the job and closes the reporters."""
+        with self._lock:
+            self.emit(self.create_event("finish"))
+            for reporter in self.reporters:
+                reporter.close()
+
+
+# Context Variables #
+current_progress: ContextVar[ProgressTracker | None] = ContextVar("current_progress", default=None)
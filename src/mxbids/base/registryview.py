@@ -0,0 +1,171 @@
+"""registryview.py
+A copy-on-write view of a class level registry.
+"""
+# Package Header #
+from ..header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+from collections.abc import Iterator, Mapping, MutableMapping
+from typing import Any
+
+# Third-Party Packages #
+
+# Local Packages #
+
+
+# Definitions #
+# Constants #
+_REMOVED = object()
+
+
+# Classes #
+class RegistryView(MutableMapping):
+    """A copy-on-write view of a class level registry.
+
+    Reads pass through to the registry until the view is mutated, at which point a per-instance layer is created
+    which holds only the changes. Entries removed from the view are masked in the layer rather than removed from the
+    registry, so the registry is never modified through the view.
+
+    Attributes:
+        _registry: The registry this view reads through to.
+        _layer: The per-instance changes to the registry, or None if the view has not been mutated.
+
+    Args:
+        registry: The registry this view reads through to.
+        layer: The per-instance changes to start with.
+    """
+
+    __slots__: tuple[str, ...] = ("_registry", "_layer")
+
+    # Magic Methods #
+    # Construction/Destruction
+    def __init__(self, registry: Mapping[str, Any], layer: dict[str, Any] | None = None) -> None:
+        # New Attributes #
+        self._registry: Mapping[str, Any] = registry
+        self._layer: dict[str, Any] | None = None if not layer else layer.copy()
+
+    # Container Methods
+    def __getitem__(self, key: str) -> Any:
+        """Gets an item from the layer or the registry.
+
+        Args:
+            key: The key of the item to get.
+
+        Returns:
+            The item.
+        """
+        if self._layer is not None and (item := self._layer.get(key, None)) is not None:
+            if item is _REMOVED:
+                raise KeyError(key)
+            return item
+        return self._registry[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        """Sets an item in the per-instance layer, creating the layer if needed.
+
+        Args:
+            key: The key of the item to set.
+            value: The item to set.
+        """
+        if self._layer is None:
+            self._layer = {}
+        self._layer[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        """Removes an item from this view, masking it if it is in the registry.
+
+        Args:
+            key: The key of the item to remove.
+        """
+        if key not in self:
+            raise KeyError(key)
+        if key in self._registry:
+            self[key] = _REMOVED
+        else:
+            del self._layer[key]
+
+    def __contains__(self, key: object) -> bool:
+        """Determines if a key is in this view.
+
+        Args:
+            key: The key to check for.
+
+        Returns:
+            True if the key is in this view.
+        """
+        if self._layer is not None and (item := self._layer.get(key, None)) is not None:
+            return item is not _REMOVED
+        return key in self._registry
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterates over the keys of this view.
+
+        Returns:
+            An iterator of the keys.
+        """
+        if self._layer is None:
+            return iter(self._registry)
+        else:
+            keys = dict.fromkeys(self._registry)
+            keys.update(self._layer)
+            return (k for k in keys if k in self)
+
+    def __len__(self) -> int:
+        """Gets the number of items in this view.
+
+        Returns:
+            The number of items.
+        """
+        if self._layer is None:
+            return len(self._registry)
+        else:
+            return sum(1 for _ in self)
+
+    # Representation
+    def __repr__(self) -> str:
+        """Gets the representation of this view.
+
+        Returns:
+            The representation of this view.
+        """
+        return f"{self.__class__.__name__}({dict(self)!r})"
+
+    # Instance Methods #
+    def get(self, key: str, default: Any = None) -> Any:
+        """Gets an item from the layer or the registry, returning a default if it is not present.
+
+        Args:
+            key: The key of the item to get.
+            default: The value to return if the key is not present.
+
+        Returns:
+            The item or the default.
+        """
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def is_materialized(self) -> bool:
+        """Determines if this view has a per-instance layer.
+
+        Returns:
+            True if this view has been mutated.
+        """
+        return self._layer is not None
+
+    def copy(self) -> "RegistryView":
+        """Creates a copy of this view which shares the registry but not the layer.
+
+        Returns:
+            A copy of this view.
+        """
+        return self.__class__(self._registry, self._layer)
@@ -0,0 +1,276 @@
+"""sourceindex.py
+An in-memory listing of a source tree which resolves the candidate paths of importers without statting each one.
+"""
+# Package Header #
+from ..header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from fnmatch import fnmatchcase
+import os
+from pathlib import Path, PurePath
+import posixpath
+from threading import Lock
+from typing import Any
+
+# Third-Party Packages #
+from baseobjects import BaseObject
+
+# Local Packages #
+from .archivesource import ArchivePath
+
+
+# Definitions #
+# Classes #
+class SourceIndex(BaseObject):
+    """An in-memory listing of a source tree which resolves the candidate paths of importers without statting each one.
+
+    Each directory of the source tree is listed once with a single scandir, and every candidate path of every file map
+    is resolved against the listings. This replaces a stat per candidate with a listing per directory, which matters
+    on network file systems where each stat is a round trip. Candidates may contain glob patterns in any of their
+    components. The tree can also be listed ahead of time by a pool of workers.
+
+    Attributes:
+        root: The root path of the source tree, which can be within an archive.
+        workers: The number of workers which list directories when scanning, None for the default of the executor.
+        _listings: The entries of each listed directory and whether they are directories keyed by relative path.
+        _lock: The lock which protects the listings.
+
+    Args:
+        root: The root path of the source tree, which can be within an archive.
+        workers: The number of workers which list directories when scanning, None for the default of the executor.
+        init: Determines if this object will construct.
+        **kwargs: Additional keyword arguments.
+    """
+
+    # Attributes #
+    root: Path | ArchivePath | None = None
+    workers: int | None = None
+
+    _listings: dict[str, dict[str, bool]]
+    _lock: Lock
+
+    # Magic Methods #
+    # Construction/Destruction
+    def __init__(
+        self,
+        root: Path | ArchivePath | str | None = None,
+        workers: int | None = None,
+        *,
+        init: bool = True,
+        **kwargs: Any,
+    ) -> None:
+        # New Attributes #
+        self._listings = {}
+        self._lock = Lock()
+
+        # Parent Attributes #
+        super().__init__(init=False)
+
+        # Object Construction #
+        if init:
+            self.construct(root=root, workers=workers, **kwargs)
+
+    # Pickling
+    def __getstate__(self) -> dict[str, Any]:
+        """Creates a dictionary of attributes which can be used to rebuild this object.
+
+        Returns:
+            A dictionary of this object's attributes.
+        """
+        state = super().__getstate__()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """Builds this object based on a dictionary of corresponding attributes.
+
+        Args:
+            state: The attributes to build this object from.
+        """
+        super().__setstate__(state)
+        self._lock = Lock()
+
+    # Instance Methods #
+    # Constructors/Destructors
+    def construct(
+        self,
+        root: Path | ArchivePath | str | None = None,
+        workers: int | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Constructs this object.
+
+        Args:
+            root: The root path of the source tree, which can be within an archive.
+            workers: The number of workers which list directories when scanning, None for the default of the executor.
+            **kwargs: Additional keyword arguments.
+        """
+        if root is not None:
+            self.root = root if isinstance(root, ArchivePath) else Path(root)
+
+        if workers is not None:
+            self.workers = workers
+
+        super().construct(**kwargs)
+
+    # Listing
+    def clear(self) -> None:
+        """Removes all listings."""
+        with self._lock:
+            self._listings.clear()
+
+    def get_relative(self, path: Path | ArchivePath) -> str | None:
+        """Gets the path of a directory relative to the root.
+
+        Args:
+            path: The path to get relative to the root.
+
+        Returns:
+            The relative path, empty for the root, or None if the path is not within the root.
+        """
+        if isinstance(self.root, ArchivePath):
+            if not isinstance(path, ArchivePath) or path.source is not self.root.source:
+                return None
+            relative = posixpath.relpath(path.member or ".", self.root.member or ".")
+        elif isinstance(path, ArchivePath):
+            return None
+        else:
+            relative = os.path.relpath(path, self.root).replace(os.sep, "/")
+
+        if relative == ".":
+            return ""
+        elif relative == ".." or relative[:3] == "../":
+            return None
+        else:
+            return relative
+
+    def list_directory(self, relative: str) -> dict[str, bool]:
+        """Lists a directory of the source tree once, using the cached listing afterwards.
+
+        Args:
+            relative: The path of the directory relative to the root, empty for the root.
+
+        Returns:
+            The names of the entries in the directory and whether each is a directory, empty if it does not exist.
+        """
+        if (listing := self._listings.get(relative, None)) is not None:
+            return listing
+
+        path = self.root.joinpath(relative) if relative else self.root
+        if isinstance(path, ArchivePath):
+            listing = {p.name: p.is_dir() for p in path.iterdir()}
+        else:
+            try:
+                with os.scandir(path) as entries:
+                    listing = {e.name: e.is_dir() for e in entries}
+            except (FileNotFoundError, NotADirectoryError):
+                listing = {}
+
+        with self._lock:
+            self._listings[relative] = listing
+        return listing
+
+    def scan(self, relative: str = "", workers: int | None = None) -> int:
+        """Lists a directory and all of its subdirectories ahead of time, listing each level in parallel.
+
+        Args:
+            relative: The path of the directory relative to the root, empty for the root.
+            workers: The number of workers which list directories. Defaults to the workers of this index.
+
+        Returns:
+            The number of directories which were listed.
+        """
+        if workers is None:
+            workers = self.workers
+
+        listed = 0
+        level = [relative]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            while level:
+                listings = executor.map(self.list_directory, level) if workers != 1 else map(self.list_directory, level)
+                next_level = []
+                for parent, listing in zip(level, listings):
+                    next_level.extend(f"{parent}/{n}" if parent else n for n, is_dir in listing.items() if is_dir)
+                listed += len(level)
+                level = next_level
+
+        return listed
+
+    # Resolve
+    def exists(self, relative: str) -> bool:
+        """Determines if a path relative to the root exists using the listing of its directory.
+
+        Args:
+            relative: The path relative to the root.
+
+        Returns:
+            True if the path exists.
+        """
+        parent, _, name = relative.rpartition("/")
+        return not name or name in self.list_directory(parent)
+
+    def resolve(self, relative: str) -> list[str]:
+        """Resolves a candidate path, which may contain glob patterns, to the matching paths which exist.
+
+        A component which names an existing entry exactly is matched literally, so names such as rec[1].edf are found
+        even though they contain glob characters.
+
+        Args:
+            relative: The candidate path relative to the root.
+
+        Returns:
+            The matching paths relative to the root in sorted order.
+        """
+        matches = [""]
+        for part in relative.split("/"):
+            if part in {"", "."}:
+                continue
+
+            next_matches = []
+            for match in matches:
+                listing = self.list_directory(match)
+                if part in listing:
+                    names = (part,)
+                elif any(c in part for c in "*?["):
+                    names = sorted(n for n in listing if fnmatchcase(n, part) and (n[0] != "." or part[0] == "."))
+                else:
+                    names = ()
+                next_matches.extend(f"{match}/{n}" if match else n for n in names)
+            matches = next_matches
+
+        return matches
+
+    def resolve_paths(self, path: Path | ArchivePath, candidate: PurePath | str) -> list[Path | ArchivePath]:
+        """Resolves a candidate path relative to a directory of the source tree to the matching paths which exist.
+
+        Candidates which leave the source tree are checked against the file system instead of the listings.
+
+        Args:
+            path: The directory the candidate is relative to.
+            candidate: The candidate path, which may contain glob patterns.
+
+        Returns:
+            The matching paths in sorted order.
+        """
+        base = self.get_relative(path)
+        candidate = PurePath(candidate).as_posix()
+        relative = None if base is None else posixpath.normpath(f"{base}/{candidate}" if base else candidate)
+        if relative is None or relative == ".." or relative[:3] == "../" or posixpath.isabs(relative):
+            inner_path = path / candidate
+            return [inner_path] if inner_path.exists() else []
+
+        return [self.root.joinpath(r) if r else self.root for r in self.resolve(relative)]
+
+
+# Context Variables #
+current_source_index: ContextVar[SourceIndex | None] = ContextVar("current_source_index", default=None)
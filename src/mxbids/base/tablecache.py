@@ -0,0 +1,314 @@
+"""tablecache.py
+A memory bounded LRU cache of loaded TSV tables shared by the nodes of a dataset.
+"""
+# Package Header #
+from ..header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+import os
+from pathlib import Path
+from threading import Lock, RLock
+from typing import Any, ClassVar, NamedTuple
+from weakref import WeakValueDictionary
+
+# Third-Party Packages #
+from baseobjects import BaseObject
+import pandas as pd
+
+# Local Packages #
+
+
+# Definitions #
+# Functions #
+def is_copy_on_write() -> bool:
+    """Determines if pandas copies on write, so shallow copies of a frame cannot modify it.
+
+    Returns:
+        True if copy on write is enabled.
+    """
+    try:
+        return int(pd.__version__.split(".")[0]) >= 3 or pd.get_option("mode.copy_on_write") is True
+    except (ValueError, KeyError, pd.errors.OptionError):
+        return False
+
+
+# Classes #
+class TableCacheEntry(NamedTuple):
+    """A cached table and the state of the file it was loaded from.
+
+    Attributes:
+        key: The inode, modification time, and size of the file when the table was loaded.
+        frame: The cached table.
+        size: The memory used by the table in bytes.
+    """
+
+    key: tuple[int, int, int]
+    frame: pd.DataFrame
+    size: int
+
+
+class TableCache(BaseObject):
+    """A memory bounded LRU cache of loaded TSV tables shared by the nodes of a dataset.
+
+    Tables are keyed by their path and the schema of their dtypes, and are only returned while the inode,
+    modification time, and size of their file are unchanged, so a table written by any node or process is loaded
+    again. Callers receive copies which cannot modify the cached table: shallow copy on write copies when pandas
+    supports them, otherwise deep copies. The least recently used tables are evicted once the cached tables exceed the
+    memory limit. The cache of a dataset root is only kept while a dataset or modality holds it.
+
+    Attributes:
+        caches: The cache of each dataset root, which are weakly referenced.
+        max_bytes: The maximum memory in bytes of the cached tables.
+        max_entries: The maximum number of cached tables, None for no limit.
+        hits: The number of tables returned from the cache.
+        misses: The number of tables which were loaded.
+        evictions: The number of tables which were evicted.
+        _entries: The cached tables in order of use.
+        _bytes: The memory used by the cached tables in bytes.
+        _lock: The lock which protects the cache.
+
+    Args:
+        max_bytes: The maximum memory in bytes of the cached tables.
+        max_entries: The maximum number of cached tables, None for no limit.
+        init: Determines if this object will construct.
+        **kwargs: Additional keyword arguments.
+    """
+
+    # Class Attributes #
+    caches: ClassVar[WeakValueDictionary[str, "TableCache"]] = WeakValueDictionary()
+    _registry_lock: ClassVar[Lock] = Lock()
+
+    # Class Methods #
+    @classmethod
+    def for_root(cls, root: Path | str) -> "TableCache":
+        """Gets the cache shared by the nodes of a dataset, creating it if needed.
+
+        Args:
+            root: The root path of the dataset.
+
+        Returns:
+            The cache of the dataset.
+        """
+        key = os.path.abspath(root)
+        with cls._registry_lock:
+            if (cache := cls.caches.get(key, None)) is None:
+                cls.caches[key] = cache = cls()
+        return cache
+
+    # Static Methods #
+    @staticmethod
+    def get_schema(dtypes: dict[str, Any] | None) -> tuple[tuple[str, str], ...]:
+        """Gets a hashable schema of the dtypes a table is loaded with.
+
+        Args:
+            dtypes: The dtype of each column.
+
+        Returns:
+            The names of the columns and their dtypes in sorted order.
+        """
+        return () if dtypes is None else tuple(sorted((str(k), str(v)) for k, v in dtypes.items()))
+
+    # Attributes #
+    max_bytes: int = 256 * 1024 * 1024
+    max_entries: int | None = None
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    _entries: OrderedDict[tuple[Path, Hashable], TableCacheEntry]
+    _bytes: int = 0
+    _lock: RLock
+
+    # Properties #
+    @property
+    def size(self) -> int:
+        """The memory used by the cached tables in bytes."""
+        return self._bytes
+
+    # Magic Methods #
+    # Construction/Destruction
+    def __init__(
+        self,
+        max_bytes: int | None = None,
+        max_entries: int | None = None,
+        *,
+        init: bool = True,
+        **kwargs: Any,
+    ) -> None:
+        # New Attributes #
+        self._entries = OrderedDict()
+        self._lock = RLock()
+
+        # Parent Attributes #
+        super().__init__(init=False)
+
+        # Object Construction #
+        if init:
+            self.construct(max_bytes=max_bytes, max_entries=max_entries, **kwargs)
+
+    def __len__(self) -> int:
+        """Gets the number of cached tables.
+
+        Returns:
+            The number of cached tables.
+        """
+        return len(self._entries)
+
+    # Pickling
+    def __getstate__(self) -> dict[str, Any]:
+        """Creates a dictionary of attributes which can be used to rebuild this object.
+
+        Returns:
+            A dictionary of this object's attributes.
+        """
+        state = super().__getstate__()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """Builds this object based on a dictionary of corresponding attributes.
+
+        Args:
+            state: The attributes to build this object from.
+        """
+        super().__setstate__(state)
+        self._lock = RLock()
+
+    # Instance Methods #
+    # Constructors/Destructors
+    def construct(self, max_bytes: int | None = None, max_entries: int | None = None, **kwargs: Any) -> None:
+        """Constructs this object.
+
+        Args:
+            max_bytes: The maximum memory in bytes of the cached tables.
+            max_entries: The maximum number of cached tables, None for no limit.
+            **kwargs: Additional keyword arguments.
+        """
+        if max_bytes is not None:
+            self.max_bytes = max_bytes
+
+        if max_entries is not None:
+            self.max_entries = max_entries
+
+        super().construct(**kwargs)
+
+    # Cache
+    @staticmethod
+    def copy_frame(frame: pd.DataFrame) -> pd.DataFrame:
+        """Copies a table so changes to the copy do not change the original.
+
+        Args:
+            frame: The table to copy.
+
+        Returns:
+            A shallow copy if pandas copies on write, otherwise a deep copy.
+        """
+        return frame.copy(deep=not is_copy_on_write())
+
+    def get(
+        self,
+        path: Path | str,
+        loader: Callable[[Path], pd.DataFrame],
+        schema: Hashable = (),
+    ) -> pd.DataFrame:
+        """Gets a table from the cache if its file is unchanged, otherwise loads and caches it.
+
+        Args:
+            path: The path to the table's file.
+            loader: The callable which loads the table from its path.
+            schema: The schema of the dtypes the loader applies, so tables loaded with other dtypes are not returned.
+
+        Returns:
+            A copy of the table which can be changed without changing the cached table.
+        """
+        path = Path(path)
+        stat = os.stat(path)
+        key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            if (entry := self._entries.get((path, schema), None)) is not None and entry.key == key:
+                self._entries.move_to_end((path, schema))
+                self.hits += 1
+                return self.copy_frame(entry.frame)
+            self.misses += 1
+
+        frame = loader(path)
+        self.put(path, frame, key, schema)
+        return self.copy_frame(frame)
+
+    def put(self, path: Path, frame: pd.DataFrame, key: tuple[int, int, int], schema: Hashable = ()) -> None:
+        """Caches a table and evicts the least recently used tables which exceed the limits.
+
+        Args:
+            path: The path to the table's file.
+            frame: The table to cache.
+            key: The inode, modification time, and size of the file when the table was loaded.
+            schema: The schema of the dtypes the table was loaded with.
+        """
+        size = int(frame.memory_usage(index=True, deep=True).sum())
+        with self._lock:
+            self.discard_entry((path, schema))
+            if size > self.max_bytes:
+                return
+            self._entries[(path, schema)] = TableCacheEntry(key, frame, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes or (self.max_entries is not None and len(self) > self.max_entries):
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+                self.evictions += 1
+
+    def discard_entry(self, key: tuple[Path, Hashable]) -> None:
+        """Removes an entry from the cache, which must be called while holding the lock.
+
+        Args:
+            key: The path and schema of the entry.
+        """
+        if (entry := self._entries.pop(key, None)) is not None:
+            self._bytes -= entry.size
+
+    def invalidate(self, path: Path | str) -> None:
+        """Removes the tables of a file from the cache for every schema they were loaded with.
+
+        Args:
+            path: The path to the table's file.
+        """
+        path = Path(path)
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == path]:
+                self.discard_entry(key)
+
+    def clear(self) -> None:
+        """Removes all tables from the cache and resets the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def get_statistics(self) -> dict[str, int | float]:
+        """Gets the hit and miss statistics and the memory used by the cache.
+
+        Returns:
+            The hits, misses, evictions, hit rate, number of tables, and bytes of the cache.
+        """
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                "Hits": self.hits,
+                "Misses": self.misses,
+                "Evictions": self.evictions,
+                "HitRate": self.hits / requests if requests else 0.0,
+                "Tables": len(self._entries),
+                "Bytes": self._bytes,
+            }
@@ -0,0 +1,93 @@
+"""tableschema.py
+Declarative dtypes for the BIDS TSV tables, which keep cohort-wide tables compact in memory.
+"""
+# Package Header #
+from ..header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any
+from warnings import warn
+
+# Third-Party Packages #
+import pandas as pd
+
+# Local Packages #
+
+
+# Definitions #
+# Functions #
+def apply_dtypes(frame: pd.DataFrame, dtypes: Mapping[str, Any]) -> pd.DataFrame:
+    """Converts the columns of a table to the dtypes of a schema, keeping columns which cannot be converted as they are.
+
+    Args:
+        frame: The table to convert.
+        dtypes: The dtype of each column, where columns without a dtype or which are not in the table are ignored.
+
+    Returns:
+        The converted table, which is the given table if no column needed converting.
+    """
+    conversions = {}
+    for name, dtype in dtypes.items():
+        if dtype is not None and name in frame.columns and frame[name].dtype != dtype:
+            conversions[name] = dtype
+
+    if not conversions:
+        return frame
+
+    frame = frame.copy(deep=False)
+    for name, dtype in conversions.items():
+        try:
+            frame[name] = frame[name].astype(dtype)
+        except (ValueError, TypeError) as e:
+            warn(f"Column {name} cannot be converted to {dtype} and keeps its inferred dtype: {e}", RuntimeWarning)
+    return frame
+
+
+def read_tsv(path: Path | str, dtypes: Mapping[str, Any] | None = None, **kwargs: Any) -> pd.DataFrame:
+    """Reads a TSV table, parsing its categorical columns as categories and converting the rest to their dtypes.
+
+    Categorical columns are parsed directly into categories, so their strings are never all held as objects at once.
+    Other columns are converted after parsing, so a value which does not fit a dtype only leaves that column inferred.
+
+    Args:
+        path: The path to the TSV file.
+        dtypes: The dtype of each column, None to infer all dtypes.
+        **kwargs: The keyword arguments for pandas.read_csv.
+
+    Returns:
+        The table.
+    """
+    if not dtypes:
+        return pd.read_csv(path, sep="\t", **kwargs)
+
+    categories = {n: d for n, d in dtypes.items() if isinstance(d, pd.CategoricalDtype) or d == "category"}
+    frame = pd.read_csv(path, sep="\t", dtype=categories, **kwargs)
+    return apply_dtypes(frame, dtypes)
+
+
+def memory_report(frame: pd.DataFrame | None) -> dict[str, int]:
+    """Measures the memory used by each column of a table, including the strings of object columns.
+
+    Args:
+        frame: The table to measure, None for a table which is not loaded.
+
+    Returns:
+        The bytes used by each column and by the whole table under "Total".
+    """
+    if frame is None:
+        return {"Total": 0}
+
+    usage = frame.memory_usage(index=True, deep=True)
+    report = {str(name): int(size) for name, size in usage.items()}
+    report["Total"] = int(usage.sum())
+    return report
@@ -0,0 +1,178 @@
+"""timeindex.py
+An interval index for finding which BIDS objects contain data within a time range.
+"""
+# Package Header #
+from ..header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+from bisect import bisect_left, bisect_right
+import datetime
+from itertools import accumulate
+import numbers
+from typing import NamedTuple, Any
+
+# Third-Party Packages #
+from baseobjects import BaseObject
+import numpy as np
+import pandas as pd
+
+# Local Packages #
+
+
+# Definitions #
+# Functions #
+def to_nanostamp(value: datetime.datetime | pd.Timestamp | np.datetime64 | float | int) -> int:
+    """Converts a time to nanoseconds since the epoch.
+
+    Integers, including numpy integers, are treated as nanostamps, real numbers, including numpy floats, as seconds
+    since the epoch, and naive datetimes and numpy datetimes as UTC.
+
+    Args:
+        value: The time to convert.
+
+    Returns:
+        The time as nanoseconds since the epoch.
+    """
+    if isinstance(value, (datetime.datetime, pd.Timestamp, np.datetime64)):
+        value = pd.Timestamp(value)
+        if value.tzinfo is None:
+            value = value.tz_localize("UTC")
+        return int(value.value)
+    elif isinstance(value, numbers.Integral):
+        return int(value)
+    elif isinstance(value, (numbers.Real, np.floating)):
+        return int(float(value) * 1_000_000_000)
+    else:
+        return int(value)
+
+
+# Classes #
+class TimeDataSlice(NamedTuple):
+    """A named tuple which refers to the data of a BIDS object within a time range without reading it.
+
+    Attributes:
+        name: The name of the BIDS object which contains the data.
+        bids_object: The BIDS object which contains the data.
+        start: The start of the range as a nanostamp.
+        stop: The stop of the range as a nanostamp.
+    """
+
+    name: str
+    bids_object: Any
+    start: int
+    stop: int
+
+    def read(self, **kwargs: Any) -> Any:
+        """Reads the data in the time range from the BIDS object.
+
+        Args:
+            **kwargs: The keyword arguments for finding the data.
+
+        Returns:
+            The data within the time range.
+        """
+        return self.bids_object.find_data(self.start, self.stop, **kwargs)
+
+
+class TimeIntervalIndex(BaseObject):
+    """An interval index for finding which BIDS objects contain data within a time range.
+
+    The intervals are kept sorted by their start along with the running maximum of their stops, so a search only
+    visits intervals which can overlap the requested range.
+
+    Attributes:
+        _starts: The starts of the intervals in sorted order.
+        _intervals: The intervals in order of their start.
+        _max_stops: The running maximum of the stops of the intervals.
+    """
+
+    # Attributes #
+    _starts: list[int]
+    _intervals: list[tuple[int, int, str, Any]]
+    _max_stops: list[int] | None
+
+    # Magic Methods #
+    # Construction/Destruction
+    def __init__(self, *, init: bool = True, **kwargs: Any) -> None:
+        # New Attributes #
+        self._starts = []
+        self._intervals = []
+        self._max_stops = []
+
+        # Parent Attributes #
+        super().__init__(init=False)
+
+        # Object Construction #
+        if init:
+            self.construct(**kwargs)
+
+    def __len__(self) -> int:
+        """Gets the number of intervals in the index.
+
+        Returns:
+            The number of intervals.
+        """
+        return len(self._intervals)
+
+    # Instance Methods #
+    def add(self, start: int, stop: int, name: str, bids_object: Any = None) -> None:
+        """Adds an interval to the index.
+
+        Args:
+            start: The start of the interval as a nanostamp.
+            stop: The stop of the interval as a nanostamp.
+            name: The name of the BIDS object which contains data within the interval.
+            bids_object: The BIDS object which contains data within the interval.
+        """
+        index = bisect_right(self._starts, start)
+        self._starts.insert(index, start)
+        self._intervals.insert(index, (start, stop, name, bids_object))
+        self._max_stops = None
+
+    def clear(self) -> None:
+        """Removes all intervals from the index."""
+        self._starts.clear()
+        self._intervals.clear()
+        self._max_stops = []
+
+    def find(
+        self,
+        start: datetime.datetime | float | int | None = None,
+        stop: datetime.datetime | float | int | None = None,
+    ) -> list[TimeDataSlice]:
+        """Finds the BIDS objects which have data within a time range.
+
+        Args:
+            start: The start of the range, None for no lower bound.
+            stop: The stop of the range, None for no upper bound.
+
+        Returns:
+            Slices of the overlapping BIDS objects clipped to the range, in order of their start.
+        """
+        if self._max_stops is None:
+            self._max_stops = list(accumulate((i[1] for i in self._intervals), max))
+
+        start = None if start is None else to_nanostamp(start)
+        stop = None if stop is None else to_nanostamp(stop)
+
+        first = 0 if start is None else bisect_right(self._max_stops, start)
+        last = len(self._intervals) if stop is None else bisect_left(self._starts, stop)
+
+        return [
+            TimeDataSlice(
+                name,
+                bids_object,
+                i_start if start is None else max(start, i_start),
+                i_stop if stop is None else min(stop, i_stop),
+            )
+            for i_start, i_stop, name, bids_object in self._intervals[first:last]
+            if start is None or i_stop > start
+        ]
@@ -13,6 +13,8 @@ __email__ = __email__
 
 # Imports #
 # Local Packages #
+from .sqlitecontentsfile import SQLiteContentsFile
+from .cdfspool import CDFSPool
 from .ieegcdfscomponent import IEEGCDFSComponent
 from .ieegcdfs import IEEGCDFS
 from .cdfssession import CDFSSession
@@ -0,0 +1,246 @@
+"""cdfspool.py
+A least recently used pool which bounds the number of open CDFS handles.
+"""
+# Package Header #
+from ..header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+from collections import OrderedDict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from threading import RLock
+from typing import Any
+from weakref import ref
+
+# Third-Party Packages #
+from baseobjects import BaseObject
+
+# Local Packages #
+
+
+# Definitions #
+# Classes #
+class CDFSPool(BaseObject):
+    """A least recently used pool which bounds the number of open CDFS handles.
+
+    Components add themselves to the pool when they open their CDFS and touch the pool whenever the CDFS is accessed.
+    When the pool exceeds its maximum size, the least recently used components are told to close their CDFS, which
+    they will reopen on their next access. Components which are acquired are pinned and are never closed by the pool
+    until they are released, so the pool may exceed its maximum size while too many handles are in use.
+
+    Attributes:
+        maxsize: The maximum number of open CDFS handles, None for unbounded.
+        _handles: The components with open handles ordered from least to most recently used.
+        _pins: The number of times each acquired component is pinned.
+        _lock: The lock which protects the pool from concurrent access.
+
+    Args:
+        maxsize: The maximum number of open CDFS handles, None for unbounded.
+        init: Determines if this object will construct.
+        **kwargs: Additional keyword arguments.
+    """
+
+    # Attributes #
+    maxsize: int | None = 128
+
+    _handles: OrderedDict[int, ref]
+    _pins: dict[int, int]
+    _lock: RLock
+
+    # Magic Methods #
+    # Construction/Destruction
+    def __init__(self, maxsize: int | None = None, *, init: bool = True, **kwargs: Any) -> None:
+        # New Attributes #
+        self._handles = OrderedDict()
+        self._pins = {}
+        self._lock = RLock()
+
+        # Parent Attributes #
+        super().__init__(init=False)
+
+        # Object Construction #
+        if init:
+            self.construct(maxsize=maxsize, **kwargs)
+
+    def __len__(self) -> int:
+        """Gets the number of open handles in the pool.
+
+        Returns:
+            The number of open handles.
+        """
+        return len(self._handles)
+
+    def __contains__(self, component: Any) -> bool:
+        """Determines if a component has an open handle in this pool.
+
+        Args:
+            component: The component to check for.
+
+        Returns:
+            True if the component is in the pool.
+        """
+        return id(component) in self._handles
+
+    # Pickling
+    def __getstate__(self) -> dict[str, Any]:
+        """Creates a dictionary of attributes which can be used to rebuild this object.
+
+        Returns:
+            A dictionary of this object's attributes.
+        """
+        state = super().__getstate__()
+        del state["_handles"]
+        del state["_pins"]
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """Builds this object based on a dictionary of corresponding attributes.
+
+        Args:
+            state: The attributes to build this object from.
+        """
+        super().__setstate__(state)
+        self._handles = OrderedDict()
+        self._pins = {}
+        self._lock = RLock()
+
+    # Instance Methods #
+    # Constructors/Destructors
+    def construct(self, maxsize: int | None = None, **kwargs: Any) -> None:
+        """Constructs this object.
+
+        Args:
+            maxsize: The maximum number of open CDFS handles, None for unbounded.
+            **kwargs: Additional keyword arguments.
+        """
+        if maxsize is not None:
+            self.maxsize = maxsize
+
+        super().construct(**kwargs)
+
+    # Pool
+    def touch(self, component: Any) -> None:
+        """Marks a component as the most recently used, adding it to the pool and evicting others if needed.
+
+        Args:
+            component: The component which accessed its CDFS.
+        """
+        key = id(component)
+        with self._lock:
+            if key in self._handles:
+                self._handles.move_to_end(key)
+            else:
+                self._handles[key] = ref(component, lambda _, k=key: self.remove_key(k))
+                if self.maxsize is not None:
+                    self.evict(maxsize=max(self.maxsize, 1))
+
+    def remove_key(self, key: int) -> None:
+        """Removes a component from the pool by its key, which is used when the component is garbage collected.
+
+        Args:
+            key: The key of the component.
+        """
+        with self._lock:
+            self._handles.pop(key, None)
+            self._pins.pop(key, None)
+
+    def acquire(self, component: Any) -> None:
+        """Pins a component so the pool does not close its CDFS until it is released.
+
+        Args:
+            component: The component which is using its CDFS.
+        """
+        key = id(component)
+        with self._lock:
+            self._pins[key] = self._pins.get(key, 0) + 1
+
+    def release(self, component: Any) -> None:
+        """Unpins a component, evicting handles if the pool exceeded its maximum size while it was pinned.
+
+        Args:
+            component: The component which finished using its CDFS.
+        """
+        key = id(component)
+        with self._lock:
+            if (count := self._pins.get(key, 0)) > 1:
+                self._pins[key] = count - 1
+            else:
+                self._pins.pop(key, None)
+                self.evict()
+
+    @contextmanager
+    def pinned(self, component: Any) -> Iterator[None]:
+        """Pins a component while the context is open.
+
+        Args:
+            component: The component which is using its CDFS.
+        """
+        self.acquire(component)
+        try:
+            yield
+        finally:
+            self.release(component)
+
+    def is_pinned(self, component: Any) -> bool:
+        """Determines if a component is pinned.
+
+        Args:
+            component: The component to check.
+
+        Returns:
+            True if the component is acquired and not yet released.
+        """
+        return id(component) in self._pins
+
+    def discard(self, component: Any) -> None:
+        """Removes a component from the pool without closing its CDFS.
+
+        Args:
+            component: The component to remove.
+        """
+        with self._lock:
+            self._handles.pop(id(component), None)
+
+    def evict(self, maxsize: int | None = None) -> None:
+        """Closes the least recently used idle handles until the pool is within its maximum size.
+
+        Pinned handles are skipped, so the pool stays over its maximum size if only pinned handles remain.
+
+        Args:
+            maxsize: The size to evict down to. Defaults to the maximum size of the pool.
+        """
+        if maxsize is None:
+            maxsize = self.maxsize
+
+        if maxsize is None:
+            return
+
+        with self._lock:
+            excess = len(self._handles) - maxsize
+            idle = [k for k in self._handles if k not in self._pins]
+            for key in idle[:excess] if excess > 0 else ():
+                component_ref = self._handles.pop(key)
+                if (component := component_ref()) is not None:
+                    component.close_cdfs()
+
+    def resize(self, maxsize: int | None) -> None:
+        """Sets the maximum size of the pool, evicting handles if needed.
+
+        Args:
+            maxsize: The new maximum number of open CDFS handles, None for unbounded.
+        """
+        self.maxsize = maxsize
+        self.evict()
+
+    def close_all(self) -> None:
+        """Closes all handles in the pool."""
+        self.evict(maxsize=0)
@@ -42,3 +42,34 @@ class IEEGCDFS(IEEG):
     default_component_types: ClassVar[dict[str, tuple[type, dict[str, Any]]]] = {
         "cdfs": (IEEGCDFSComponent, {}),
     }
+
+    # Instance Methods #
+    def unload(self) -> None:
+        """Releases the loaded tables of this modality and closes its CDFS, which is reopened on its next access."""
+        self.components["cdfs"].close_cdfs()
+        super().unload()
+
+    # Time Data
+    def get_time_coverage(self, refresh: bool = False) -> tuple[int, int] | None:
+        """Gets the time range the CDFS of this modality has data for.
+
+        Args:
+            refresh: Determines if any cached coverage will be ignored and recomputed.
+
+        Returns:
+            The start and stop of the data as nanostamps, or None if the CDFS has no time data.
+        """
+        return self.components["cdfs"].get_time_coverage(refresh=refresh)
+
+    def find_data(self, start: Any = None, stop: Any = None, **kwargs: Any) -> Any:
+        """Finds the data of the CDFS of this modality within a time range.
+
+        Args:
+            start: The start of the range, None for no lower bound.
+            stop: The stop of the range, None for no upper bound.
+            **kwargs: The keyword arguments for finding the data slice.
+
+        Returns:
+            The data within the time range.
+        """
+        return self.components["cdfs"].find_data(start, stop, **kwargs)
@@ -13,13 +13,20 @@ __email__ = __email__
 
 # Imports #
 # Standard Libraries #
+from collections.abc import Iterator
+from contextlib import contextmanager
 from typing import ClassVar, Any
 
 # Third-Party Packages #
 from baseobjects.composition import BaseComponent
-from cdfs import BaseCDFS
+from cdfs import BaseCDFS, ContentsFile
+from cdfs.components import TimeContentsCDFSComponent
+import numpy as np
 
 # Local Packages #
+from ..base import to_nanostamp
+from .cdfspool import CDFSPool
+from .sqlitecontentsfile import SQLiteContentsFile
 from ..modalities import IEEG
 
 
@@ -28,28 +35,111 @@ from ..modalities import IEEG
 class IEEGCDFSComponent(BaseComponent):
     """A component for the IEEG modality which implements access a CDFS.
 
-    Attributes:
+    The CDFS is opened lazily on the first access to the cdfs property or get_cdfs, and the open handle is tracked
+    by a pool which closes the least recently used handles when too many are open. A closed handle is reopened on
+    its next access.
+
+    Class Attributes:
         _module_: The module name for this class.
+        default_cdfs_pool: The pool of open CDFS handles shared by all components which do not set their own.
+
+    Attributes:
         cdfs_type: The type of the CDFS to access.
-        cdfs: The CDFS instance.
+        contents_file_type: The type of the contents file the CDFS uses, None to use the CDFS's own type.
+        cdfs_pool: The pool which tracks the open CDFS handle of this component.
+        _cdfs: The CDFS instance, None if it is not open.
+        _contents_proxy: The time contents proxy of the open CDFS, None if it has not been created.
     """
 
     # Class Attributes #
     _module_: ClassVar[str | None] = "mxbids.cdfsbids"
+    default_cdfs_pool: ClassVar[CDFSPool] = CDFSPool()
 
     # Attributes #
     cdfs_type: type[BaseCDFS] = BaseCDFS
-    cdfs: BaseCDFS | None = None
+    contents_file_type: type[ContentsFile] | None = SQLiteContentsFile
+    cdfs_pool: CDFSPool | None = None
+    _cdfs: BaseCDFS | None = None
+    _contents_proxy: Any = None
+
+    # Properties #
+    @property
+    def cdfs(self) -> BaseCDFS:
+        """The CDFS of this modality, which is opened on first access."""
+        return self.get_cdfs()
+
+    @cdfs.setter
+    def cdfs(self, value: BaseCDFS | None) -> None:
+        if self._cdfs is not None and self._cdfs is not value:
+            self.close_cdfs()
+        self._cdfs = value
+        if value is not None:
+            self.get_cdfs_pool().touch(self)
+
+    @property
+    def is_cdfs_open(self) -> bool:
+        """Determines if the CDFS of this modality is currently open."""
+        return self._cdfs is not None
+
+    # Magic Methods #
+    # Pickling
+    def __getstate__(self) -> dict[str, Any]:
+        """Creates a dictionary of attributes which can be used to rebuild this object.
+
+        Returns:
+            A dictionary of this object's attributes.
+        """
+        state = super().__getstate__()
+        state.pop("_cdfs", None)
+        state.pop("_contents_proxy", None)
+        return state
 
     # Instance Methods #
     # Construction/Destruction
+    def construct(
+        self,
+        composite: Any = None,
+        cdfs_type: type[BaseCDFS] | None = None,
+        contents_file_type: type[ContentsFile] | None = None,
+        cdfs_pool: CDFSPool | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Constructs this object.
+
+        Args:
+            composite: The object which this object is a component of.
+            cdfs_type: The type of the CDFS to access.
+            contents_file_type: The type of the contents file the CDFS uses.
+            cdfs_pool: The pool which tracks the open CDFS handle of this component.
+            **kwargs: Keyword arguments for inheritance.
+        """
+        if cdfs_type is not None:
+            self.cdfs_type = cdfs_type
+
+        if contents_file_type is not None:
+            self.contents_file_type = contents_file_type
+
+        if cdfs_pool is not None:
+            self.cdfs_pool = cdfs_pool
+
+        super().construct(composite=composite, **kwargs)
+
     def build(self) -> None:
         """Builds the CDFS for this modality."""
         self.construct_cdfs(create=True, build=True)
 
     def load(self) -> None:
-        """Loads the CDFS for this modality."""
-        self.construct_cdfs(open_=True, create=False)
+        """Loads the CDFS for this modality, deferring opening it until it is accessed."""
+        self.close_cdfs()
+
+    # CDFS Pool
+    def get_cdfs_pool(self) -> CDFSPool:
+        """Gets the pool which tracks the open CDFS handle of this component.
+
+        Returns:
+            The CDFS pool.
+        """
+        return self.default_cdfs_pool if self.cdfs_pool is None else self.cdfs_pool
 
     # CDFS Object
     def construct_cdfs(self, file_name: str | None = None, create: bool = False, **kwargs: Any) -> BaseCDFS:
@@ -66,15 +156,34 @@ class IEEGCDFSComponent(BaseComponent):
         if file_name is None:
             file_name = self.generate_contents_file_name()
 
+        if self._cdfs is not None:
+            self.close_cdfs()
+
+        open_ = kwargs.pop("open_", True)
+        load = kwargs.pop("load", True)
+        build = kwargs.pop("build", True)
+
         composite = self._composite()
-        self.cdfs = cdfs = self.cdfs_type(
+        cdfs = self.cdfs_type(
             path=composite.path,
             name=composite.full_name,
             mode=composite._mode,
-            create=create,
+            open_=False,
+            create=False,
+            load=False,
             contents_name=file_name,
             **kwargs,
         )
+
+        open_kwargs = {}
+        if self.contents_file_type is not None:
+            cdfs.contents_file_type = self.contents_file_type
+            open_kwargs["read_only"] = composite._mode == "r"
+
+        if open_ or load or create:
+            cdfs.open(create=create, build=build, load=load, **open_kwargs)
+
+        self.cdfs = cdfs
         return cdfs
 
     def create_cdfs(self, file_name: str | None = None, **kwargs: Any) -> BaseCDFS:
@@ -99,10 +208,12 @@ class IEEGCDFSComponent(BaseComponent):
         Returns:
             The CDFS of this modality.
         """
-        if self.cdfs is None:
+        if self._cdfs is None:
             self.construct_cdfs(file_name=file_name, create=True, **kwargs)
+        else:
+            self.get_cdfs_pool().touch(self)
 
-        return self.cdfs
+        return self._cdfs
 
     def load_cdfs(self, file_name: str | None = None, **kwargs: Any) -> BaseCDFS:
         """Loads the CDFS of this modality from the file system.
@@ -126,10 +237,31 @@ class IEEGCDFSComponent(BaseComponent):
         Returns:
             The CDFS of this modality.
         """
-        if self.cdfs is None:
-            self.construct_cdfs(file_name=file_name, **kwargs)
+        if self._cdfs is None:
+            self.construct_cdfs(file_name=file_name, open_=True, **kwargs)
+        else:
+            self.get_cdfs_pool().touch(self)
+
+        return self._cdfs
 
-        return self.cdfs
+    @contextmanager
+    def use_cdfs(self) -> Iterator[BaseCDFS]:
+        """Opens the CDFS of this modality and pins it in the pool so it is not closed while the context is open.
+
+        Returns:
+            The CDFS of this modality.
+        """
+        pool = self.get_cdfs_pool()
+        with pool.pinned(self):
+            yield self.get_cdfs()
+
+    def close_cdfs(self) -> None:
+        """Closes the CDFS of this modality if it is open, it will be reopened on its next access."""
+        self.get_cdfs_pool().discard(self)
+        self._contents_proxy = None
+        if (cdfs := self._cdfs) is not None:
+            self._cdfs = None
+            cdfs.close()
 
     # Content File
     def generate_contents_file_name(self) -> str:
@@ -140,6 +272,105 @@ class IEEGCDFSComponent(BaseComponent):
         """
         return f"{self._composite().full_name}_contents.sqlite3"
 
+    def get_contents_mtime(self) -> int | None:
+        """Gets the latest modification time of the contents file including its write-ahead log.
+
+        Returns:
+            The modification time in nanoseconds, or None if the contents file does not exist.
+        """
+        contents_path = self._composite().path / self.generate_contents_file_name()
+        wal_path = contents_path.with_name(f"{contents_path.name}-wal")
+        if not contents_path.is_file():
+            return None
+        elif wal_path.is_file():
+            return max(contents_path.stat().st_mtime_ns, wal_path.stat().st_mtime_ns)
+        else:
+            return contents_path.stat().st_mtime_ns
+
+    # Time Data
+    def get_time_contents_component(self) -> TimeContentsCDFSComponent | None:
+        """Gets the component of the CDFS which contains the time contents.
+
+        Returns:
+            The time contents component, or None if the CDFS does not have one.
+        """
+        for component in self.get_cdfs().components.values():
+            if isinstance(component, TimeContentsCDFSComponent):
+                return component
+        return None
+
+    def get_contents_proxy(self) -> Any:
+        """Gets the time contents proxy of the CDFS, creating it if needed.
+
+        Returns:
+            The time contents proxy.
+        """
+        if self._contents_proxy is None or self._cdfs is None:
+            component = self.get_time_contents_component()
+            if component is None:
+                raise ValueError(f"The CDFS of {self._composite().full_name} does not contain time contents.")
+            self._contents_proxy = component.create_contents_proxy()
+        return self._contents_proxy
+
+    def get_time_coverage(self, refresh: bool = False) -> tuple[int, int] | None:
+        """Gets the time range the CDFS has data for, using the coverage cached in the meta information if valid.
+
+        The cached coverage is keyed by the modification time of the contents file, so the CDFS is only opened when
+        the contents have changed since the coverage was cached.
+
+        Args:
+            refresh: Determines if the cached coverage will be ignored and recomputed.
+
+        Returns:
+            The start and stop of the data as nanostamps, or None if the CDFS has no time data.
+        """
+        if (mtime := self.get_contents_mtime()) is None:
+            return None
+
+        composite = self._composite()
+        cached = composite.meta_information.get("CDFSTimeCoverage", None)
+        if not refresh and cached is not None and cached["ContentsMTime"] == mtime:
+            return cached["Start"], cached["Stop"]
+
+        with self.use_cdfs():
+            component = self.get_time_contents_component()
+            if component is None:
+                return None
+
+            start = component.get_start_datetime()
+            stop = component.get_end_datetime()
+        if start is None or stop is None:
+            return None
+
+        coverage = (to_nanostamp(start), to_nanostamp(stop))
+        if composite.meta_information:
+            composite.meta_information["CDFSTimeCoverage"] = {
+                "Start": coverage[0],
+                "Stop": coverage[1],
+                "ContentsMTime": mtime,
+            }
+            if composite._mode == "w" and composite.meta_information_path.exists():
+                composite.save_meta_information()
+        return coverage
+
+    def find_data(self, start: Any = None, stop: Any = None, **kwargs: Any) -> Any:
+        """Finds the data of the CDFS within a time range.
+
+        Args:
+            start: The start of the range, None for no lower bound.
+            stop: The stop of the range, None for no upper bound.
+            **kwargs: The keyword arguments for finding the data slice.
+
+        Returns:
+            The data within the time range.
+        """
+        with self.use_cdfs():
+            return self.get_contents_proxy().find_data_slice(
+                start=None if start is None else np.uint64(to_nanostamp(start)),
+                stop=None if stop is None else np.uint64(to_nanostamp(stop)),
+                **kwargs,
+            )
+
 
 # Registration #
 IEEG.component_types_register.register_class(IEEGCDFSComponent)
@@ -0,0 +1,193 @@
+"""sqlitecontentsfile.py
+A CDFS contents file which shares tuned and pooled SQLite engines between its instances.
+"""
+# Package Header #
+from ..header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+from asyncio import run
+from threading import Lock
+from typing import ClassVar, Any
+
+# Third-Party Packages #
+from cdfs import ContentsFile
+from sqlalchemy import create_engine, event, Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+# Local Packages #
+
+
+# Definitions #
+# Classes #
+class SQLiteContentsFile(ContentsFile):
+    """A CDFS contents file which shares tuned and pooled SQLite engines between its instances.
+
+    Every instance which opens the same file in the same access mode uses the same pair of engines, so connections
+    are pooled across sessions and constructs rather than being set up on every open. The engines are disposed when
+    the last instance using them closes. Each new connection has the pragmas applied to it and caches its prepared
+    statements. Read-only instances open the database through a read-only URI, so readers never take write locks.
+
+    Class Attributes:
+        _engines: The shared engines and their reference counts keyed by path and access mode.
+        _engines_lock: The lock which protects the shared engines.
+
+    Attributes:
+        read_only: Determines if the file will be opened through a read-only URI.
+        pragmas: The pragmas to apply to every new connection.
+        write_pragmas: The pragmas to apply to every new connection which can write.
+        cached_statements: The number of prepared statements each connection caches.
+        pool_size: The number of connections each engine keeps open in its pool.
+        query_cache_size: The number of compiled SQL statements each engine caches.
+    """
+
+    # Class Attributes #
+    _engines: ClassVar[dict[tuple[str, bool], list[Engine | AsyncEngine | int]]] = {}
+    _engines_lock: ClassVar[Lock] = Lock()
+
+    # Attributes #
+    read_only: bool = False
+
+    pragmas: dict[str, Any] = {
+        "mmap_size": 268435456,
+        "cache_size": -65536,
+        "temp_store": "MEMORY",
+    }
+    write_pragmas: dict[str, Any] = {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+    }
+    cached_statements: int = 256
+    pool_size: int = 8
+    query_cache_size: int = 1024
+
+    # Instance Methods #
+    # Constructors/Destructors
+    def close(self) -> bool:
+        """Closes the contents file, disposing the shared engines if no other instance uses them.
+
+        Returns:
+            bool: True if the file is closed, False otherwise.
+        """
+        self.dispose_engines(self.release_engines())
+        return self._engine is None
+
+    async def close_async(self) -> bool:
+        """Asynchronously closes the contents file, disposing the shared engines if no other instance uses them.
+
+        Returns:
+            bool: True if the file is closed, False otherwise.
+        """
+        if (engines := self.release_engines()) is not None:
+            engine, async_engine = engines
+            engine.dispose()
+            await async_engine.dispose()
+        return self._engine is None
+
+    # Engine
+    def generate_url(self, driver: str = "sqlite") -> str:
+        """Generates the database URL of this file for the given driver.
+
+        Args:
+            driver: The SQLAlchemy driver name to use in the URL.
+
+        Returns:
+            The database URL.
+        """
+        if self.read_only:
+            return f"{driver}:///file:{self._path.as_posix()}?mode=ro&uri=true"
+        else:
+            return f"{driver}:///{self._path.as_posix()}"
+
+    @staticmethod
+    def apply_pragmas(dbapi_connection: Any, pragmas: dict[str, Any]) -> None:
+        """Applies pragmas to a database connection.
+
+        Args:
+            dbapi_connection: The DBAPI connection to apply the pragmas to.
+            pragmas: The pragmas to apply.
+        """
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+    def create_engine(self, read_only: bool | None = None, **kwargs: Any) -> None:
+        """Gets the shared SQLAlchemy engines for this file, creating them if they do not exist.
+
+        Args:
+            read_only: Determines if the file will be opened through a read-only URI.
+            **kwargs: Additional keyword arguments for creating the engines.
+        """
+        if self._engine is not None:
+            self.dispose_engines(self.release_engines())
+
+        if read_only is not None:
+            self.read_only = read_only
+
+        key = (self._path.as_posix(), self.read_only)
+        with self._engines_lock:
+            if (engines := self._engines.get(key, None)) is None:
+                kwargs = {"pool_size": self.pool_size, "query_cache_size": self.query_cache_size} | kwargs
+                connect_args = {"cached_statements": self.cached_statements} | kwargs.pop("connect_args", {})
+                pragmas = self.pragmas if self.read_only else self.pragmas | self.write_pragmas
+                apply_pragmas = self.apply_pragmas
+
+                def on_connect(dbapi_connection: Any, connection_record: Any) -> None:
+                    apply_pragmas(dbapi_connection, pragmas)
+
+                engine = create_engine(self.generate_url(), connect_args=connect_args, **kwargs)
+                event.listen(engine, "connect", on_connect)
+
+                async_engine = create_async_engine(
+                    self.generate_url("sqlite+aiosqlite"),
+                    connect_args=connect_args,
+                    **kwargs,
+                )
+                event.listen(async_engine.sync_engine, "connect", on_connect)
+
+                self._engines[key] = engines = [engine, async_engine, 0]
+
+            engines[2] += 1
+            self._engine, self._async_engine = engines[0], engines[1]
+
+    def release_engines(self) -> tuple[Engine, AsyncEngine] | None:
+        """Releases this instance's use of the shared engines.
+
+        Returns:
+            The engines if this was the last instance using them and they must be disposed, otherwise None.
+        """
+        disposable = None
+        if self._engine is not None:
+            key = (self._path.as_posix(), self.read_only)
+            with self._engines_lock:
+                if (engines := self._engines.get(key, None)) is not None and engines[0] is self._engine:
+                    engines[2] -= 1
+                    if engines[2] <= 0:
+                        del self._engines[key]
+                        disposable = (engines[0], engines[1])
+
+        self._engine = None
+        self._async_engine = None
+        self._session_maker = None
+        self._async_session_maker = None
+        return disposable
+
+    @staticmethod
+    def dispose_engines(engines: tuple[Engine, AsyncEngine] | None) -> None:
+        """Disposes engines released by the last instance using them.
+
+        Args:
+            engines: The engines to dispose, or None if there is nothing to dispose.
+        """
+        if engines is not None:
+            engine, async_engine = engines
+            engine.dispose()
+            run(async_engine.dispose())
@@ -13,4 +13,6 @@ __email__ = __email__
 
 # Imports #
 # Local Packages #
+from .datasetvalidator import ValidationIssue, ValidationReport, DatasetValidator
+from .datasetmanifest import ManifestReport, DatasetManifest
 from .dataset import Dataset
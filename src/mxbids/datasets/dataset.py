@@ -14,8 +14,9 @@ __email__ = __email__
 
 # Imports #
 # Standard Libraries #
-from collections.abc import Iterable, MutableMapping
-from collections import ChainMap
+from collections.abc import Callable, Iterable, Iterator, MutableMapping
+from collections import ChainMap, deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from copy import deepcopy
 from pathlib import Path
 import json
@@ -26,8 +27,27 @@ from baseobjects.objects import ClassNamespaceRegister
 import pandas as pd
 
 # Local Packages #
-from ..base import BaseBIDSDirectory, BaseImporter, BaseExporter
+from ..base import (
+    BaseBIDSDirectory,
+    BaseImporter,
+    BaseExporter,
+    FileIndex,
+    FileIndexEntry,
+    FileLock,
+    NodeCache,
+    NodeHandle,
+    NodeMap,
+    NodeResult,
+    TableCache,
+    TimeDataSlice,
+    map_nodes,
+    merge_tsv_rows,
+)
+from ..modalities import Modality
+from ..sessions import Session
 from ..subjects import Subject
+from .datasetvalidator import DatasetValidator, ValidationReport
+from .datasetmanifest import DatasetManifest, ManifestReport
 
 
 # Definitions #
@@ -42,6 +62,7 @@ class Dataset(BaseBIDSDirectory):
         class_register_namespace: The namespace of this class for class registration.
         default_meta_information: Default metadata information for the dataset.
         default_description: Default description for the dataset.
+        walk_levels: The levels of nodes which can be walked and the type of node at each level.
 
     Attributes:
         component_types_register: Register for component types.
@@ -52,7 +73,15 @@ class Dataset(BaseBIDSDirectory):
         _description: Description of the dataset.
         participant_fields: Fields for participants.
         participants: DataFrame containing participant information.
-        subjects: Dictionary of subjects in the dataset.
+        participant_key: The participants column which identifies rows when merging the participants file.
+        subjects: Map of the subjects in the dataset, which evicts and reloads subjects when it has a node cache.
+        node_cache: The cache which bounds the loaded nodes of the dataset, None to keep every loaded node.
+        _table_cache: The cache of loaded tables shared by the modalities of the dataset.
+        file_index_name: The name of the file index database in the dataset directory.
+        _file_index: The index of the files in the dataset.
+        validation_cache_name: The name of the file in the dataset directory which caches validation results.
+        _validator: The validator of the dataset.
+        manifest_name: The name of the integrity manifest file in the dataset directory.
 
     Args:
         path: The path to the dataset's directory.
@@ -63,6 +92,7 @@ class Dataset(BaseBIDSDirectory):
         build: Determines if the dataset will be built after creation.
         load: Determines if the dataset will be load.
         subjects_to_load: List of subjects to load.
+        node_cache: The cache which bounds the loaded nodes of the dataset, None to keep every loaded node.
         init: Determines if the object will construct. Defaults to True.
         **kwargs: Additional keyword arguments.
     """
@@ -86,6 +116,11 @@ class Dataset(BaseBIDSDirectory):
             "Description": "A unique identifier for the participant.",
         },
     }
+    walk_levels: ClassVar[dict[str, type[BaseBIDSDirectory]]] = {
+        "subject": Subject,
+        "session": Session,
+        "modality": Modality,
+    }
 
     # Class Methods #
     @classmethod
@@ -126,10 +161,26 @@ class Dataset(BaseBIDSDirectory):
 
     _participant_fields: dict[str, Any] | None = None
     participants: pd.DataFrame | None = None
+    participant_key: str = "participant_id"
+
+    subjects: NodeMap
+    node_cache: NodeCache | None = None
+    _table_cache: TableCache | None = None
+
+    file_index_name: str = ".mxbids_index.sqlite3"
+    _file_index: FileIndex | None = None
 
-    subjects: dict[str, Subject]
+    validation_cache_name: str = ".mxbids_validation.json"
+    _validator: DatasetValidator | None = None
+
+    manifest_name: str = "dataset_manifest.json"
 
     # Properties #
+    @property
+    def child_nodes(self) -> NodeMap:
+        """The map of the subjects of this Dataset."""
+        return self.subjects
+
     @property
     def directory_name(self) -> str:
         """The directory name of this Dataset."""
@@ -150,6 +201,11 @@ class Dataset(BaseBIDSDirectory):
         """The path to the description json file."""
         return self._path / f"dataset_description.json"
 
+    @property
+    def file_index_path(self) -> Path:
+        """The path to the file index database."""
+        return self._path / self.file_index_name
+
     @property
     def description(self) -> dict[str, Any]:
         """The description of the dataset."""
@@ -176,6 +232,13 @@ class Dataset(BaseBIDSDirectory):
         """The path to the participant tsv file."""
         return self._path / f"participants.tsv"
 
+    @property
+    def table_cache(self) -> TableCache:
+        """The cache of loaded tables shared by the modalities of this Dataset."""
+        if self._table_cache is None:
+            self._table_cache = TableCache.for_root(self._path)
+        return self._table_cache
+
     # Magic Methods #
     # Construction/Destruction
     def __init__(
@@ -188,12 +251,13 @@ class Dataset(BaseBIDSDirectory):
         build: bool = True,
         load: bool = False,
         subjects_to_load: list[str] | None = None,
+        node_cache: NodeCache | None = None,
         *,
         init: bool = True,
         **kwargs: Any,
     ) -> None:
         # New Attributes #
-        self.subjects = {}
+        self.subjects = NodeMap()
 
         # Parent Attributes #
         super().__init__(init=False)
@@ -209,6 +273,7 @@ class Dataset(BaseBIDSDirectory):
                 build=build,
                 load=load,
                 subjects_to_load=subjects_to_load,
+                node_cache=node_cache,
                 **kwargs,
             )
 
@@ -224,6 +289,7 @@ class Dataset(BaseBIDSDirectory):
         build: bool = True,
         load: bool = False,
         subjects_to_load: list[str] | None = None,
+        node_cache: NodeCache | None = None,
         **kwargs: Any,
     ) -> None:
         """Constructs this object.
@@ -237,6 +303,7 @@ class Dataset(BaseBIDSDirectory):
             build: Determines if the dataset will be built after creation.
             load: Determines if the dataset will be load.
             subjects_to_load: List of subjects to load.
+            node_cache: The cache which bounds the loaded nodes of the dataset, None to keep every loaded node.
             kwargs: The keyword arguments for inheritance if any.
         """
         if name is not None:
@@ -253,6 +320,9 @@ class Dataset(BaseBIDSDirectory):
                 parent_path = Path(parent_path)
             self.path = parent_path / name
 
+        if node_cache is not None:
+            self.set_node_cache(node_cache)
+
         # Load
         if self.path is not None and self.path.exists() and load:
             self.load(subjects_to_load)
@@ -288,14 +358,31 @@ class Dataset(BaseBIDSDirectory):
         super().load()
         self.load_subjects(names, mode, load)
 
+    def unload(self) -> None:
+        """Releases the loaded subjects of this dataset and their contents."""
+        for subject in self.subjects.loaded_values():
+            subject.unload()
+        self.subjects.clear()
+        super().unload()
+
+    def set_node_cache(self, node_cache: NodeCache | None) -> None:
+        """Sets the cache which bounds the loaded subjects, sessions, and modalities of this dataset.
+
+        Nodes which are already loaded are tracked by the cache and evicted if they exceed its limits.
+
+        Args:
+            node_cache: The cache to bound the loaded nodes with, None to keep every loaded node.
+        """
+        self.node_cache = node_cache
+        self.subjects.set_cache(node_cache)
+
     # Description
     def create_description(self) -> None:
         """Creates description file and saves the description."""
         if self._description is None:
             self._description = deepcopy(self.default_description)
         self._description["Name"] = self.name
-        with self.description_path.open(self._mode) as file:
-            json.dump(self._description, file)
+        self.write_json(self.description_path, self._description)
 
     def load_description(self) -> dict:
         """Loads the description from the file.
@@ -318,16 +405,14 @@ class Dataset(BaseBIDSDirectory):
     def save_description(self) -> None:
         """Saves the description to the file."""
         self.description["Name"] = self.name
-        with self.description_path.open(self._mode) as file:
-            json.dump(self.description, file)
+        self.write_json(self.description_path, self.description)
 
     # Participant Fields
     def create_participant_fields(self) -> None:
         """Creates participant fields file and saves the participant_fields."""
         if self._participant_fields is None:
             self._participant_fields = deepcopy(self.default_participant_fields)
-        with self.participant_fields_path.open(self._mode) as file:
-            json.dump(self._participant_fields, file)
+        self.write_json(self.participant_fields_path, self._participant_fields)
 
     def load_participant_fields(self) -> dict:
         """Loads the participant fields from the file.
@@ -347,8 +432,7 @@ class Dataset(BaseBIDSDirectory):
 
     def save_participant_fields(self) -> None:
         """Saves the participant_fields to the file."""
-        with self.participant_fields_path.open(self._mode) as file:
-            json.dump(self.participant_fields, file)
+        self.write_json(self.participant_fields_path, self.participant_fields)
 
     # Participants
     def create_participants(self) -> None:
@@ -356,7 +440,7 @@ class Dataset(BaseBIDSDirectory):
         if self.participants is None:
             self.participants = pd.DataFrame(columns=tuple(self.participant_fields.keys()))
 
-        self.participants.to_csv(self.participants_path, mode=self._mode, sep="\t")
+        self.save_participants(merge=False)
 
     def load_participants(self) -> pd.DataFrame:
         """Loads the participant information from the file.
@@ -367,17 +451,40 @@ class Dataset(BaseBIDSDirectory):
         self.participants = participants = pd.read_csv(self.participants_path, sep="\t")
         return participants
 
-    def save_participants(self) -> None:
-        """Saves the participants to the file."""
-        self.participants.to_csv(self.participants_path, mode=self._mode, sep="\t")
+    def save_participants(self, merge: bool = True) -> None:
+        """Saves the participants to the file, merging them with the participants other workers saved.
+
+        The file is read and written while holding its file lock. When merging, the participants on disk which are not
+        in this dataset's table are kept before the rows of the table, and rows with the same participant_id are
+        replaced by the rows of the table. The merged table becomes the participants of this dataset.
+
+        Args:
+            merge: Determines if the participants on disk are merged, otherwise the file is overwritten.
+        """
+        path = self.participants_path
+        with FileLock.for_file(path):
+            participants = self.participants
+            if merge and path.exists():
+                participants = merge_tsv_rows(pd.read_csv(path, sep="\t"), participants, key=self.participant_key)
+            self.write_tsv(path, participants, index=False)
+            self.participants = participants
 
     # Subjects
-    def generate_latest_subject_name(self, prefix: str | None = None, digits: int | None = None) -> str:
+    def generate_latest_subject_name(
+        self,
+        prefix: str | None = None,
+        digits: int | None = None,
+        reserve: bool | None = None,
+    ) -> str:
         """Generates a subject name for a new latest subject.
 
+        The name is allocated from the ID counter persisted in the meta information, so the subjects do not need to be
+        loaded and concurrent workers receive different names.
+
         Args:
             prefix: Prefix for the subject name.
             digits: Number of digits for the subject name.
+            reserve: Determines if the name is reserved. Defaults to reserving it unless the dataset is read only.
 
         Returns:
             The name of the latest subject to create.
@@ -386,7 +493,7 @@ class Dataset(BaseBIDSDirectory):
             prefix = self.subject_prefix
         if digits is None:
             digits = self.subject_digits
-        return f"{prefix}{len(self.subjects):0{digits}d}"
+        return self.allocate_child_name("sub-", prefix, digits, len(self.subjects), reserve)
 
     def create_subject(
         self,
@@ -440,9 +547,425 @@ class Dataset(BaseBIDSDirectory):
 
         # Create path iterator
         if names is None:
-            paths = (p for p in self.path.iterdir() if p.is_dir())
+            paths = (p for p in self.path.iterdir() if p.is_dir() and p.name[:4] == "sub-")
         else:
             paths = (self.path / n for n in names)
 
         # Use an iterator to load subjects
         self.subjects.update((s.name, s) for p in paths if (s := Subject(path=p, mode=mode, load=load)) is not None)
+
+    def get_node(
+        self,
+        subject: str,
+        session: str | None = None,
+        modality: str | None = None,
+    ) -> BaseBIDSDirectory:
+        """Gets the node which contains a file, loading its subject, session, or modality if it is not loaded.
+
+        Args:
+            subject: The name of the subject.
+            session: The name of the session, None to get the subject.
+            modality: The name of the modality, None to get the session.
+
+        Returns:
+            The subject, session, or modality.
+        """
+        if (node := self.subjects.get(subject, None)) is None:
+            self.subjects[subject] = node = Subject(path=self.path / f"sub-{subject}", mode=self._mode, load=True)
+
+        if session is not None:
+            if (child := node.sessions.get(session, None)) is None:
+                path = node.path / f"ses-{session}"
+                node.sessions[session] = child = Session(path=path, mode=self._mode, load=True)
+            node = child
+
+            if modality is not None:
+                if (child := node.modalities.get(modality, None)) is None:
+                    node.modalities[modality] = child = Modality(path=node.path / modality, mode=self._mode, load=True)
+                node = child
+
+        return node
+
+    # Traversal
+    def iter_node_paths(self, level: str = "session", index: bool = False) -> Iterator[Path]:
+        """Iterates over the paths to the nodes at a level of this dataset without loading any nodes.
+
+        Args:
+            level: The level of the nodes, which is "subject", "session", or "modality".
+            index: Determines if the nodes are found from the file index instead of scanning the directories.
+
+        Returns:
+            The paths to the nodes.
+
+        Raises:
+            ValueError: If the level is not a walk level.
+        """
+        if level not in self.walk_levels:
+            raise ValueError(f"{level} is not a walk level, which are {', '.join(self.walk_levels)}.")
+        depth = list(self.walk_levels).index(level) + 1
+
+        if index:
+            seen = set()
+            for entry in self.get_file_index().query():
+                key = (entry.subject, entry.session, entry.modality)[:depth]
+                if None not in key and key not in seen:
+                    seen.add(key)
+                    yield self.path.joinpath(*(f"{p}{n}" for p, n in zip(("sub-", "ses-", ""), key)))
+        else:
+            yield from self.iter_child_directories(self.path, ("sub-", "ses-", "")[:depth])
+
+    @classmethod
+    def iter_child_directories(cls, path: Path, prefixes: tuple[str, ...]) -> Iterator[Path]:
+        """Iterates over the directories nested below a directory in name order, skipping hidden directories.
+
+        Args:
+            path: The directory to iterate below.
+            prefixes: The prefix the names of the directories must start with at each level below the directory.
+
+        Returns:
+            The paths to the directories at the last level.
+        """
+        prefix, inner = prefixes[0], prefixes[1:]
+        for child in sorted(path.iterdir()):
+            if child.is_dir() and child.name.startswith(prefix) and child.name[0] != ".":
+                if inner:
+                    yield from cls.iter_child_directories(child, inner)
+                else:
+                    yield child
+
+    def open_walk_node(
+        self,
+        path: Path,
+        level: str,
+        filter: Callable[[BaseBIDSDirectory], bool] | None = None,
+        mode: str | None = None,
+    ) -> BaseBIDSDirectory | None:
+        """Opens a node for a walk, only loading its contents if it passes the filter.
+
+        Args:
+            path: The path to the node.
+            level: The level of the node.
+            filter: The predicate which is given the node before its contents are loaded, None to accept every node.
+            mode: The file mode to open the node in, defaults to the mode of this dataset.
+
+        Returns:
+            The loaded node, or None if it was filtered out.
+        """
+        node = self.walk_levels[level](path=path, mode=self._mode if mode is None else mode, load=False)
+        if filter is not None and not filter(node):
+            return None
+        node.load()
+        return node
+
+    def walk(
+        self,
+        level: str = "session",
+        filter: Callable[[BaseBIDSDirectory], bool] | None = None,
+        prefetch: int = 0,
+        index: bool = False,
+        mode: str | None = None,
+    ) -> Iterator[BaseBIDSDirectory]:
+        """Iterates over the nodes at a level of this dataset, only holding the nodes near the current one in memory.
+
+        Nodes are opened independently of the subjects of this dataset, and each node is unloaded once the caller
+        moves on to the next one, so a node and its contents should not be kept after its iteration. When prefetching,
+        the next nodes are opened and loaded in background threads while the current node is processed.
+
+        Args:
+            level: The level of the nodes, which is "subject", "session", or "modality".
+            filter: The predicate which is given each node before its contents are loaded, None to accept every node.
+            prefetch: The number of nodes to load ahead of the current node, 0 to load each node when it is reached.
+            index: Determines if the nodes are found from the file index instead of scanning the directories.
+            mode: The file mode to open the nodes in, defaults to the mode of this dataset.
+
+        Returns:
+            The loaded nodes which pass the filter.
+        """
+        paths = self.iter_node_paths(level, index)
+        if prefetch < 1:
+            nodes = (self.open_walk_node(p, level, filter, mode) for p in paths)
+        else:
+            nodes = self.prefetch_walk_nodes(paths, level, filter, mode, prefetch)
+
+        try:
+            for node in nodes:
+                if node is not None:
+                    try:
+                        yield node
+                    finally:
+                        node.unload()
+        finally:
+            nodes.close()
+
+    def prefetch_walk_nodes(
+        self,
+        paths: Iterable[Path],
+        level: str,
+        filter: Callable[[BaseBIDSDirectory], bool] | None = None,
+        mode: str | None = None,
+        prefetch: int = 1,
+    ) -> Iterator[BaseBIDSDirectory | None]:
+        """Opens the nodes of a walk in background threads, keeping a number of nodes loading ahead of the current one.
+
+        Args:
+            paths: The paths to the nodes in the order to yield them.
+            level: The level of the nodes.
+            filter: The predicate which is given each node before its contents are loaded, None to accept every node.
+            mode: The file mode to open the nodes in, defaults to the mode of this dataset.
+            prefetch: The number of nodes to load ahead of the current node.
+
+        Returns:
+            The loaded nodes in order, with None for the nodes which were filtered out.
+        """
+        pending: deque[Future] = deque()
+        with ThreadPoolExecutor(max_workers=prefetch) as executor:
+            try:
+                for path in paths:
+                    pending.append(executor.submit(self.open_walk_node, path, level, filter, mode))
+                    if len(pending) > prefetch:
+                        yield pending.popleft().result()
+                while pending:
+                    yield pending.popleft().result()
+            finally:
+                # Release the nodes which were loaded ahead but never reached
+                for future in pending:
+                    if not future.cancel() and future.exception() is None and (node := future.result()) is not None:
+                        node.unload()
+
+    # Parallel Map
+    def iter_node_handles(
+        self,
+        level: str = "session",
+        index: bool = False,
+        mode: str | None = None,
+    ) -> Iterator[NodeHandle]:
+        """Iterates over picklable handles to the nodes at a level of this dataset without loading any nodes.
+
+        Args:
+            level: The level of the nodes, which is "subject", "session", or "modality".
+            index: Determines if the nodes are found from the file index instead of scanning the directories.
+            mode: The file mode to open the nodes in, defaults to the mode of this dataset.
+
+        Returns:
+            The handles to the nodes.
+        """
+        paths = self.iter_node_paths(level, index)
+        head = self.walk_levels.get(level, None)
+        mode = self._mode if mode is None else mode
+        return (NodeHandle.from_path(head, p, mode) for p in paths)
+
+    def map_nodes(
+        self,
+        fn: Callable[[BaseBIDSDirectory], Any],
+        level: str = "session",
+        workers: int | None = None,
+        backend: str = "process",
+        chunksize: int = 1,
+        retries: int = 0,
+        index: bool = False,
+        mode: str | None = None,
+    ) -> Iterator[NodeResult]:
+        """Applies a function to each node at a level of this dataset in parallel workers.
+
+        Args:
+            fn: The function to apply to each node, which must be picklable with the process backend.
+            level: The level of the nodes, which is "subject", "session", or "modality".
+            workers: The number of workers, None for the default of the executor.
+            backend: The kind of workers, which is "process" or "thread".
+            chunksize: The number of nodes sent to a worker at a time.
+            retries: The number of times to retry the function after it fails on a node.
+            index: Determines if the nodes are found from the file index instead of scanning the directories.
+            mode: The file mode to open the nodes in, defaults to the mode of this dataset.
+
+        Returns:
+            The result for each node in order of completion, which holds the exception if the function failed.
+        """
+        handles = self.iter_node_handles(level, index, mode)
+        return map_nodes(fn, handles, workers, backend, chunksize, retries)
+
+    def map_sessions(
+        self,
+        fn: Callable[[Session], Any],
+        workers: int | None = None,
+        backend: str = "process",
+        chunksize: int = 1,
+        retries: int = 0,
+        index: bool = False,
+        mode: str | None = None,
+    ) -> Iterator[NodeResult]:
+        """Applies a function to each session of this dataset in parallel workers.
+
+        Each worker reopens its sessions from picklable handles, so the subjects of this dataset do not need to be
+        loaded, and the sessions are unloaded after the function returns. Results are yielded as they complete.
+
+        Args:
+            fn: The function to apply to each session, which must be picklable with the process backend.
+            workers: The number of workers, None for the default of the executor.
+            backend: The kind of workers, which is "process" or "thread".
+            chunksize: The number of sessions sent to a worker at a time.
+            retries: The number of times to retry the function after it fails on a session.
+            index: Determines if the sessions are found from the file index instead of scanning the directories.
+            mode: The file mode to open the sessions in, defaults to the mode of this dataset.
+
+        Returns:
+            The result for each session in order of completion, which holds the exception if the function failed.
+        """
+        return self.map_nodes(fn, "session", workers, backend, chunksize, retries, index, mode)
+
+    # Sidecar Metadata
+    def resolve_metadata(self, path: Path | str) -> dict[str, Any]:
+        """Resolves the metadata a file in this dataset inherits from the sidecars at each level above it.
+
+        Args:
+            path: The path to the file.
+
+        Returns:
+            The merged metadata of the file.
+        """
+        return self.get_metadata_resolver().resolve(path, root=self.path)
+
+    # File Index
+    def get_file_index(self, refresh: bool = False) -> FileIndex:
+        """Gets the index of the files in this dataset, opening and updating it on first use.
+
+        A dataset opened in read mode keeps its index in memory, so it never writes into the dataset.
+
+        Args:
+            refresh: Determines if the index will be updated with the changes since its last update.
+
+        Returns:
+            The file index.
+        """
+        if self._file_index is None:
+            path = None if self._mode == "r" else self.file_index_path
+            self._file_index = FileIndex(root=self.path, path=path)
+            refresh = True
+
+        if refresh:
+            self._file_index.update()
+
+        return self._file_index
+
+    def query(
+        self,
+        subject: str | Iterable[str] | Callable[[str | None], bool] | None = None,
+        session: str | Iterable[str] | Callable[[str | None], bool] | None = None,
+        modality: str | Iterable[str] | Callable[[str | None], bool] | None = None,
+        suffix: str | Iterable[str] | Callable[[str], bool] | None = None,
+        extension: str | Iterable[str] | Callable[[str], bool] | None = None,
+        nodes: bool = False,
+        refresh: bool = False,
+        **entities: str | Iterable[str] | Callable[[str | None], bool],
+    ) -> list[FileIndexEntry] | list[tuple[FileIndexEntry, BaseBIDSDirectory]]:
+        """Finds the files in this dataset which match the given names and entities using the file index.
+
+        Each filter is either a name, an iterable of names to match any of, or a predicate which is given the value of
+        each file. Filters which are None match every file.
+
+        Args:
+            subject: The subjects to match.
+            session: The sessions to match.
+            modality: The modalities to match.
+            suffix: The suffixes to match.
+            extension: The extensions to match.
+            nodes: Determines if the node which contains each file will be returned with it.
+            refresh: Determines if the index will be updated with the changes since its last update.
+            **entities: The values of entities in the file names to match.
+
+        Returns:
+            The matching files, or the matching files and their nodes if nodes is True.
+        """
+        entries = self.get_file_index(refresh=refresh).query(
+            subject=subject,
+            session=session,
+            modality=modality,
+            suffix=suffix,
+            extension=extension,
+            **entities,
+        )
+        if nodes:
+            return [(e, self.get_node(e.subject, e.session, e.modality)) for e in entries if e.subject is not None]
+        else:
+            return entries
+
+    # Validation
+    def get_validator(self) -> DatasetValidator:
+        """Gets the validator of this dataset, creating it if needed.
+
+        Returns:
+            The dataset validator.
+        """
+        if self._validator is None:
+            self._validator = DatasetValidator(root=self.path, cache_path=self.path / self.validation_cache_name)
+        return self._validator
+
+    def validate(self, workers: int | None = None, full: bool = False) -> ValidationReport:
+        """Validates the structure of this dataset, only rechecking the nodes which changed since the last validation.
+
+        Args:
+            workers: The number of workers which check nodes, None for the default of the executor.
+            full: Determines if all nodes will be checked even if they have not changed.
+
+        Returns:
+            The report of the issues found in the dataset.
+        """
+        return self.get_validator().validate(workers=workers, full=full)
+
+    # Manifest
+    @property
+    def manifest_path(self) -> Path:
+        """The path to the integrity manifest file."""
+        return self._path / self.manifest_name
+
+    def compute_manifest(self, workers: int | None = None, algorithm: str | None = None, full: bool = False) -> int:
+        """Computes the integrity manifest of this dataset, only hashing the files which changed since the last one.
+
+        Args:
+            workers: The number of workers which hash files, None for the default of the executor.
+            algorithm: The name of the hashlib algorithm to use, defaults to the algorithm of the existing manifest.
+            full: Determines if every file will be hashed even if its size and modification time did not change.
+
+        Returns:
+            The number of files which were hashed.
+        """
+        return DatasetManifest(root=self.path, path=self.manifest_path).compute(workers, algorithm, full)
+
+    def verify_manifest(self, workers: int | None = None, full: bool = False) -> ManifestReport:
+        """Verifies the contents of this dataset against its integrity manifest.
+
+        Args:
+            workers: The number of workers which hash files, None for the default of the executor.
+            full: Determines if every file will be hashed even if its size and modification time did not change.
+
+        Returns:
+            The report of the missing, modified, and added files.
+
+        Raises:
+            FileNotFoundError: If this dataset has no integrity manifest.
+        """
+        return DatasetManifest(root=self.path, path=self.manifest_path).verify(workers, full)
+
+    # Time Data
+    def find_data(
+        self,
+        start: Any = None,
+        stop: Any = None,
+        names: Iterable[str] | None = None,
+        refresh: bool = False,
+    ) -> dict[str, list[TimeDataSlice]]:
+        """Finds the data within a time range across the subjects of this dataset without reading it.
+
+        Args:
+            start: The start of the range, None for no lower bound.
+            stop: The stop of the range, None for no upper bound.
+            names: Names of the subjects to search. The default None searches all subjects.
+            refresh: Determines if the time indices will be rebuilt from recomputed coverage.
+
+        Returns:
+            The slices of the data in each overlapping modality for each subject which has data within the range.
+        """
+        if not self.subjects:
+            self.load_subjects(load=False)
+
+        subjects = self.subjects.values() if names is None else (self.subjects[n] for n in names)
+        return {s.name: slices for s in subjects if (slices := s.find_data(start, stop, refresh=refresh))}
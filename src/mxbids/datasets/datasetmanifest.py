@@ -0,0 +1,304 @@
+"""datasetmanifest.py
+An integrity manifest of the contents of a dataset which hashes files in parallel.
+"""
+# Package Header #
+from ..header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import NamedTuple, Any
+
+# Third-Party Packages #
+from baseobjects import BaseObject
+
+# Local Packages #
+
+
+# Definitions #
+# Classes #
+class ManifestReport(NamedTuple):
+    """The results of verifying a dataset against its manifest.
+
+    Attributes:
+        missing: The files in the manifest which no longer exist.
+        modified: The files whose contents do not match the manifest.
+        added: The files which are not in the manifest.
+        hashed: The number of files which were hashed.
+        skipped: The number of files which were not hashed because their size and modification time did not change.
+    """
+
+    missing: list[str]
+    modified: list[str]
+    added: list[str]
+    hashed: int
+    skipped: int
+
+    @property
+    def is_intact(self) -> bool:
+        """Determines if no files in the manifest are missing or modified."""
+        return not self.missing and not self.modified
+
+
+class DatasetManifest(BaseObject):
+    """An integrity manifest of the contents of a dataset which hashes files in parallel.
+
+    The manifest maps the path of every visible file in the dataset, relative to its root, to the file's size,
+    modification time, and hash. Files are hashed by a pool of workers with large reads into a reused buffer, and the
+    hash functions release the GIL while they digest, so hashing scales with the workers until the disks are saturated.
+    Files whose size and modification time match the manifest are not hashed again unless a full check is forced.
+
+    Attributes:
+        root: The root path of the dataset.
+        path: The path to the manifest file.
+        algorithm: The name of the hashlib algorithm used to hash files.
+        workers: The number of workers which hash files, None for the default of the executor.
+        buffer_size: The size in bytes of each read when hashing a file.
+        files: The size, modification time, and hash of each file keyed by its path relative to the root.
+
+    Args:
+        root: The root path of the dataset.
+        path: The path to the manifest file.
+        algorithm: The name of the hashlib algorithm used to hash files.
+        workers: The number of workers which hash files, None for the default of the executor.
+        init: Determines if this object will construct.
+        **kwargs: Additional keyword arguments.
+    """
+
+    # Attributes #
+    root: Path | None = None
+    path: Path | None = None
+    algorithm: str = "sha256"
+    workers: int | None = None
+    buffer_size: int = 8 * 1024 * 1024
+
+    files: dict[str, dict[str, Any]]
+
+    # Magic Methods #
+    # Construction/Destruction
+    def __init__(
+        self,
+        root: Path | str | None = None,
+        path: Path | str | None = None,
+        algorithm: str | None = None,
+        workers: int | None = None,
+        *,
+        init: bool = True,
+        **kwargs: Any,
+    ) -> None:
+        # New Attributes #
+        self.files = {}
+
+        # Parent Attributes #
+        super().__init__(init=False)
+
+        # Object Construction #
+        if init:
+            self.construct(root=root, path=path, algorithm=algorithm, workers=workers, **kwargs)
+
+    # Instance Methods #
+    # Constructors/Destructors
+    def construct(
+        self,
+        root: Path | str | None = None,
+        path: Path | str | None = None,
+        algorithm: str | None = None,
+        workers: int | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Constructs this object.
+
+        Args:
+            root: The root path of the dataset.
+            path: The path to the manifest file.
+            algorithm: The name of the hashlib algorithm used to hash files.
+            workers: The number of workers which hash files, None for the default of the executor.
+            **kwargs: Additional keyword arguments.
+        """
+        if root is not None:
+            self.root = Path(root)
+
+        if path is not None:
+            self.path = Path(path)
+
+        if algorithm is not None:
+            self.algorithm = algorithm
+
+        if workers is not None:
+            self.workers = workers
+
+        super().construct(**kwargs)
+
+    # File
+    def load(self) -> None:
+        """Loads the manifest from its file, leaving it empty if the file does not exist."""
+        self.files.clear()
+        if self.path.exists():
+            with self.path.open("r") as file:
+                manifest = json.load(file)
+            self.algorithm = manifest["Algorithm"]
+            self.files.update(manifest["Files"])
+
+    def save(self) -> None:
+        """Saves the manifest to its file."""
+        with self.path.open("w") as file:
+            json.dump({"Algorithm": self.algorithm, "Files": self.files}, file, indent=1)
+
+    # Hashing
+    def scan_files(self) -> dict[str, os.stat_result]:
+        """Finds the visible files in the dataset other than the manifest.
+
+        Returns:
+            The stat results of the files keyed by their paths relative to the root.
+        """
+        files = {}
+        stack = [""]
+        while stack:
+            relative = stack.pop()
+            with os.scandir(self.root / relative) as entries:
+                for entry in entries:
+                    if entry.name[0] == ".":
+                        continue
+                    name = f"{relative}/{entry.name}" if relative else entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(name)
+                    elif entry.is_file():
+                        files[name] = entry.stat()
+
+        if self.path is not None and self.path.parent == self.root:
+            files.pop(self.path.name, None)
+        return files
+
+    def hash_file(self, relative: str, algorithm: str | None = None) -> str:
+        """Hashes the contents of a file with large streaming reads.
+
+        Args:
+            relative: The path to the file relative to the root.
+            algorithm: The name of the hashlib algorithm to use. Defaults to the algorithm of this manifest.
+
+        Returns:
+            The hexadecimal digest of the file.
+        """
+        digest = hashlib.new(self.algorithm if algorithm is None else algorithm)
+        with open(self.root / relative, "rb", buffering=0) as file:
+            buffer = bytearray(min(self.buffer_size, os.fstat(file.fileno()).st_size + 1))
+            view = memoryview(buffer)
+            while size := file.readinto(buffer):
+                digest.update(view[:size])
+        return digest.hexdigest()
+
+    def hash_files(self, relatives: list[str], workers: int | None = None) -> list[str]:
+        """Hashes files in parallel.
+
+        Args:
+            relatives: The paths to the files relative to the root.
+            workers: The number of workers which hash files. Defaults to the workers of this manifest.
+
+        Returns:
+            The hexadecimal digests of the files in the same order.
+        """
+        if workers is None:
+            workers = self.workers
+
+        if workers == 1 or len(relatives) < 2:
+            return [self.hash_file(r) for r in relatives]
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                return list(executor.map(self.hash_file, relatives))
+
+    @staticmethod
+    def is_unchanged(entry: dict[str, Any] | None, stat: os.stat_result) -> bool:
+        """Determines if a file has the same size and modification time as its manifest entry.
+
+        Args:
+            entry: The manifest entry of the file, None if it is not in the manifest.
+            stat: The current stat result of the file.
+
+        Returns:
+            True if the file appears unchanged.
+        """
+        return entry is not None and entry["Size"] == stat.st_size and entry["MTime"] == stat.st_mtime_ns
+
+    def compute(self, workers: int | None = None, algorithm: str | None = None, full: bool = False) -> int:
+        """Computes the manifest of the dataset and saves it, only hashing files which changed unless forced.
+
+        Args:
+            workers: The number of workers which hash files. Defaults to the workers of this manifest.
+            algorithm: The name of the hashlib algorithm to use. Changing the algorithm hashes every file.
+            full: Determines if every file will be hashed even if it appears unchanged.
+
+        Returns:
+            The number of files which were hashed.
+        """
+        if self.path.exists():
+            self.load()
+
+        if algorithm is not None and algorithm != self.algorithm:
+            self.algorithm = algorithm
+            full = True
+
+        stats = self.scan_files()
+        changed = [r for r, s in stats.items() if full or not self.is_unchanged(self.files.get(r, None), s)]
+        digests = self.hash_files(changed, workers=workers)
+
+        files = {r: self.files[r] for r in stats.keys() - set(changed)}
+        for relative, digest in zip(changed, digests):
+            stat = stats[relative]
+            files[relative] = {"Size": stat.st_size, "MTime": stat.st_mtime_ns, "Hash": digest}
+
+        self.files.clear()
+        self.files.update(sorted(files.items()))
+        self.save()
+        return len(changed)
+
+    def verify(self, workers: int | None = None, full: bool = False) -> ManifestReport:
+        """Verifies the dataset against the saved manifest.
+
+        Files whose size changed are modified without being hashed, and files whose size and modification time are
+        unchanged are skipped unless a full check is forced.
+
+        Args:
+            workers: The number of workers which hash files. Defaults to the workers of this manifest.
+            full: Determines if every file will be hashed even if it appears unchanged.
+
+        Returns:
+            The report of the missing, modified, and added files.
+
+        Raises:
+            FileNotFoundError: If the manifest file does not exist, so there is nothing to verify against.
+        """
+        if not self.path.exists():
+            raise FileNotFoundError(f"The manifest {self.path} does not exist, so the dataset cannot be verified.")
+
+        self.load()
+        stats = self.scan_files()
+
+        missing = sorted(self.files.keys() - stats.keys())
+        added = sorted(stats.keys() - self.files.keys())
+        modified = []
+        to_hash = []
+        for relative, entry in self.files.items():
+            if (stat := stats.get(relative, None)) is None:
+                continue
+            elif stat.st_size != entry["Size"]:
+                modified.append(relative)
+            elif full or stat.st_mtime_ns != entry["MTime"]:
+                to_hash.append(relative)
+
+        skipped = len(self.files) - len(missing) - len(modified) - len(to_hash)
+        digests = self.hash_files(to_hash, workers=workers)
+        modified.extend(r for r, d in zip(to_hash, digests) if d != self.files[r]["Hash"])
+        modified.sort()
+
+        return ManifestReport(missing, modified, added, len(to_hash), skipped)
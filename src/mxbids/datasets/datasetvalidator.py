@@ -0,0 +1,455 @@
+"""datasetvalidator.py
+A validator which checks the structure of a dataset in parallel and caches the results of unchanged nodes.
+"""
+# Package Header #
+from ..header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+from concurrent.futures import ThreadPoolExecutor
+from importlib import import_module
+from importlib.util import find_spec
+import json
+import os
+from pathlib import Path
+from threading import Lock
+from typing import NamedTuple, Any
+from warnings import warn
+
+# Third-Party Packages #
+from baseobjects import BaseObject
+
+# Local Packages #
+from ..base import MetaSerializer, format_bids_name, strip_entity_key
+from ..modalities import Modality
+from ..sessions import Session
+from ..subjects import Subject
+
+
+# Definitions #
+# Classes #
+class ValidationIssue(NamedTuple):
+    """A problem found in a node of a dataset.
+
+    Attributes:
+        path: The path to the node or file with the problem.
+        severity: The severity of the problem, either "error" or "warning".
+        code: A short identifier of the kind of problem.
+        message: A description of the problem.
+    """
+
+    path: Path
+    severity: str
+    code: str
+    message: str
+
+
+class ValidationReport(NamedTuple):
+    """The results of validating a dataset.
+
+    Attributes:
+        issues: The problems found in the dataset.
+        checked: The number of nodes which were checked.
+        cached: The number of checked nodes whose results were reused because they did not change.
+    """
+
+    issues: list[ValidationIssue]
+    checked: int
+    cached: int
+
+    @property
+    def is_valid(self) -> bool:
+        """Determines if the dataset has no errors."""
+        return not self.errors
+
+    @property
+    def errors(self) -> list[ValidationIssue]:
+        """The issues which are errors."""
+        return [i for i in self.issues if i.severity == "error"]
+
+    @property
+    def warnings(self) -> list[ValidationIssue]:
+        """The issues which are warnings."""
+        return [i for i in self.issues if i.severity == "warning"]
+
+
+class DatasetValidator(BaseObject):
+    """A validator which checks the structure of a dataset in parallel and caches the results of unchanged nodes.
+
+    Each directory of the dataset, subject, session, and modality levels is a node. A node is checked for its naming,
+    a parseable meta information file, an importable dispatch class, and, for modalities with table columns, TSV
+    headers which contain those columns. The results of each node are cached with a stamp of the names, sizes, and
+    modification times of the files in its directory and a stamp of the module which defines its class, so
+    revalidation only checks the nodes which changed or whose class module was upgraded or moved.
+
+    Attributes:
+        root: The root path of the dataset to validate.
+        cache_path: The path to the file which persists the cached results, None to not persist them.
+        workers: The number of workers which check nodes, None for the default of the executor.
+        allowed_directories: The directories in the dataset root which are not subjects but are allowed.
+        _cache: The cached results of each node keyed by its path relative to the root.
+        _lock: The lock which protects the cache.
+
+    Args:
+        root: The root path of the dataset to validate.
+        cache_path: The path to the file which persists the cached results, None to not persist them.
+        workers: The number of workers which check nodes, None for the default of the executor.
+        init: Determines if this object will construct.
+        **kwargs: Additional keyword arguments.
+    """
+
+    # Attributes #
+    root: Path | None = None
+    cache_path: Path | None = None
+    workers: int | None = None
+    allowed_directories: set[str] = {"code", "derivatives", "phenotype", "sourcedata", "stimuli"}
+
+    _cache: dict[str, dict[str, Any]] | None = None
+    _lock: Lock
+
+    # Magic Methods #
+    # Construction/Destruction
+    def __init__(
+        self,
+        root: Path | str | None = None,
+        cache_path: Path | str | None = None,
+        workers: int | None = None,
+        *,
+        init: bool = True,
+        **kwargs: Any,
+    ) -> None:
+        # New Attributes #
+        self._lock = Lock()
+
+        # Parent Attributes #
+        super().__init__(init=False)
+
+        # Object Construction #
+        if init:
+            self.construct(root=root, cache_path=cache_path, workers=workers, **kwargs)
+
+    # Pickling
+    def __getstate__(self) -> dict[str, Any]:
+        """Creates a dictionary of attributes which can be used to rebuild this object.
+
+        Returns:
+            A dictionary of this object's attributes.
+        """
+        state = super().__getstate__()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """Builds this object based on a dictionary of corresponding attributes.
+
+        Args:
+            state: The attributes to build this object from.
+        """
+        super().__setstate__(state)
+        self._lock = Lock()
+
+    # Instance Methods #
+    # Constructors/Destructors
+    def construct(
+        self,
+        root: Path | str | None = None,
+        cache_path: Path | str | None = None,
+        workers: int | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Constructs this object.
+
+        Args:
+            root: The root path of the dataset to validate.
+            cache_path: The path to the file which persists the cached results, None to not persist them.
+            workers: The number of workers which check nodes, None for the default of the executor.
+            **kwargs: Additional keyword arguments.
+        """
+        if root is not None:
+            self.root = Path(root)
+
+        if cache_path is not None:
+            self.cache_path = Path(cache_path)
+
+        if workers is not None:
+            self.workers = workers
+
+        super().construct(**kwargs)
+
+    # Cache
+    def load_cache(self) -> dict[str, dict[str, Any]]:
+        """Loads the cached results from the cache file if they are not loaded.
+
+        Returns:
+            The cached results of each node.
+        """
+        if self._cache is None:
+            self._cache = {}
+            if self.cache_path is not None and self.cache_path.exists():
+                try:
+                    with self.cache_path.open("r") as file:
+                        self._cache.update(json.load(file))
+                except (OSError, ValueError):
+                    self._cache.clear()
+        return self._cache
+
+    def save_cache(self) -> None:
+        """Saves the cached results to the cache file."""
+        if self.cache_path is not None and self._cache is not None:
+            try:
+                with self.cache_path.open("w") as file:
+                    json.dump(self._cache, file)
+            except OSError as e:
+                warn(f"Failed to save the validation cache to {self.cache_path} with error: {e}", RuntimeWarning)
+
+    def clear_cache(self) -> None:
+        """Removes all cached results."""
+        self._cache = {}
+        self.save_cache()
+
+    # Nodes
+    def find_nodes(self) -> tuple[list[tuple[str, str]], list[ValidationIssue]]:
+        """Finds the nodes of the dataset and checks the names of their directories.
+
+        Returns:
+            The relative paths and levels of the nodes, and the issues with the directory names.
+        """
+        nodes = [("", "dataset")]
+        issues = []
+        for subject in self.list_directories(self.root):
+            if subject.name[:4] != "sub-":
+                if subject.name not in self.allowed_directories:
+                    issues.append(
+                        ValidationIssue(subject, "warning", "unexpected_directory", "Directory is not a subject.")
+                    )
+                continue
+
+            nodes.append((subject.name, "subject"))
+            for session in self.list_directories(subject):
+                if session.name[:4] != "ses-":
+                    issues.append(ValidationIssue(session, "error", "session_name", "Session must start with ses-."))
+                    continue
+
+                nodes.append((f"{subject.name}/{session.name}", "session"))
+                for modality in self.list_directories(session):
+                    nodes.append((f"{subject.name}/{session.name}/{modality.name}", "modality"))
+
+        return nodes, issues
+
+    @staticmethod
+    def list_directories(path: Path) -> list[Path]:
+        """Lists the visible directories in a directory.
+
+        Args:
+            path: The directory to list.
+
+        Returns:
+            The paths of the directories.
+        """
+        with os.scandir(path) as entries:
+            return [Path(e.path) for e in entries if e.name[0] != "." and e.is_dir()]
+
+    @staticmethod
+    def stamp_node(path: Path) -> list[list[Any]]:
+        """Creates a stamp of the names, sizes, and modification times of the files in a node.
+
+        Args:
+            path: The path to the node.
+
+        Returns:
+            The stamp of the node.
+        """
+        stamp = []
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.name[0] != "." and entry.is_file():
+                    stat = entry.stat()
+                    stamp.append([entry.name, stat.st_size, stat.st_mtime_ns])
+        stamp.sort()
+        return stamp
+
+    def stamp_class(self, path: Path, level: str) -> list[Any] | None:
+        """Creates a stamp of the module which defines the class of a node without importing the module.
+
+        Args:
+            path: The path to the node.
+            level: The level of the node.
+
+        Returns:
+            The name, file, size, and modification time of the module, None if the meta information cannot be read.
+        """
+        try:
+            module = MetaSerializer.default.load(self.get_meta_information_path(path, level))["Python"]["Module"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+        try:
+            origin = None if (spec := find_spec(module)) is None else spec.origin
+        except (ImportError, ValueError, AttributeError):
+            origin = None
+
+        try:
+            stat = os.stat(origin)
+        except (OSError, TypeError):
+            return [module, origin]
+        return [module, origin, stat.st_size, stat.st_mtime_ns]
+
+    def get_meta_information_path(self, path: Path, level: str) -> Path:
+        """Gets the path to the meta information file of a node.
+
+        Args:
+            path: The path to the node.
+            level: The level of the node.
+
+        Returns:
+            The path to the meta information file.
+        """
+        if level == "dataset":
+            from .dataset import Dataset  # The dataset module imports this module.
+
+            return Dataset.generate_meta_information_path(path=path)
+        elif level == "subject":
+            return Subject.generate_meta_information_path(path=path)
+        elif level == "session":
+            return Session.generate_meta_information_path(path=path)
+        else:
+            return Modality.generate_meta_information_path(path=path)
+
+    # Checks
+    def check_node(self, relative: str, level: str) -> list[ValidationIssue]:
+        """Checks a node of the dataset.
+
+        Args:
+            relative: The path to the node relative to the root.
+            level: The level of the node.
+
+        Returns:
+            The issues found in the node.
+        """
+        path = self.root / relative
+        issues = []
+        meta_path = self.get_meta_information_path(path, level)
+        if not meta_path.exists():
+            return [ValidationIssue(meta_path, "error", "missing_meta", "Meta information file is missing.")]
+
+        try:
+            info = MetaSerializer.default.load(meta_path)["Python"]
+            module, class_name = info["Module"], info["Class"]
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            return [ValidationIssue(meta_path, "error", "invalid_meta", f"Meta information cannot be parsed: {e}")]
+
+        try:
+            cls = getattr(import_module(module), class_name)
+        except Exception as e:
+            message = f"{module}.{class_name} cannot be imported: {e}"
+            return [ValidationIssue(meta_path, "error", "class_import", message)]
+
+        if level == "dataset":
+            description = path / "dataset_description.json"
+            if not description.exists():
+                issues.append(ValidationIssue(description, "error", "missing_description", "Description is missing."))
+            else:
+                try:
+                    with description.open("r") as file:
+                        json.load(file)
+                except (OSError, ValueError) as e:
+                    message = f"Description cannot be parsed: {e}"
+                    issues.append(ValidationIssue(description, "error", "invalid_description", message))
+        elif level == "modality":
+            full_name = format_bids_name(
+                {"sub": strip_entity_key(path.parts[-3], "sub"), "ses": strip_entity_key(path.parts[-2], "ses")}
+            )
+            for table in ("electrode", "channel", "event"):
+                if (columns := getattr(cls, f"{table}_columns", None)) is not None:
+                    issues.extend(self.check_tsv_columns(path / f"{full_name}_{table}s.tsv", columns))
+
+        return issues
+
+    @staticmethod
+    def check_tsv_columns(path: Path, columns: tuple[str, ...]) -> list[ValidationIssue]:
+        """Checks that the header of a TSV file contains the required columns, if the file exists.
+
+        Args:
+            path: The path to the TSV file.
+            columns: The required columns.
+
+        Returns:
+            The issues found in the TSV file.
+        """
+        if not path.exists():
+            return []
+
+        with path.open("r") as file:
+            header = file.readline().rstrip("\r\n").split("\t")
+
+        if missing := [c for c in columns if c not in header]:
+            return [ValidationIssue(path, "error", "missing_columns", f"Missing columns: {', '.join(missing)}.")]
+        else:
+            return []
+
+    def validate_node(self, relative: str, level: str, full: bool = False) -> tuple[list[ValidationIssue], bool]:
+        """Validates a node, reusing its cached results if it has not changed.
+
+        Args:
+            relative: The path to the node relative to the root.
+            level: The level of the node.
+            full: Determines if the node will be checked even if it has not changed.
+
+        Returns:
+            The issues found in the node and if they were from the cache.
+        """
+        stamp = self.stamp_node(self.root / relative)
+        class_stamp = self.stamp_class(self.root / relative, level)
+        cached = self._cache.get(relative, None)
+        if not full and cached is not None and cached["stamp"] == stamp and cached.get("class") == class_stamp:
+            return [ValidationIssue(Path(p), *i) for p, *i in cached["issues"]], True
+
+        issues = self.check_node(relative, level)
+        with self._lock:
+            self._cache[relative] = {
+                "stamp": stamp,
+                "class": class_stamp,
+                "issues": [[str(i.path), *i[1:]] for i in issues],
+            }
+        return issues, False
+
+    def validate(self, workers: int | None = None, full: bool = False) -> ValidationReport:
+        """Validates the dataset, checking the nodes in parallel.
+
+        Args:
+            workers: The number of workers which check nodes. Defaults to the workers of this validator.
+            full: Determines if all nodes will be checked even if they have not changed.
+
+        Returns:
+            The report of the issues found in the dataset.
+        """
+        if workers is None:
+            workers = self.workers
+
+        self.load_cache()
+        nodes, issues = self.find_nodes()
+        if workers == 1:
+            results = [self.validate_node(r, l, full) for r, l in nodes]
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(lambda n: self.validate_node(*n, full), nodes))
+
+        # Remove results of nodes which no longer exist.
+        relatives = {r for r, _ in nodes}
+        for relative in self._cache.keys() - relatives:
+            del self._cache[relative]
+        self.save_cache()
+
+        cached = 0
+        for node_issues, from_cache in results:
+            issues.extend(node_issues)
+            cached += from_cache
+
+        return ValidationReport(issues, len(nodes), cached)
@@ -20,3 +20,4 @@ from .ieegbidsexporter import IEEGBIDSExporter
 from .sessionbidsexporter import SessionBIDSExporter
 from .subjectbidsexporter import SubjectBIDSExporter
 from .datasetbidsexporter import DatasetBIDSExporter
+from .datasetarchiveexporter import DatasetArchiveExporter
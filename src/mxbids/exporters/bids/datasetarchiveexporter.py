@@ -0,0 +1,118 @@
+"""datasetarchiveexporter.py
+A class for exporting BIDS datasets directly into tar or zip archives.
+"""
+# Package Header #
+from ...header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+from pathlib import Path
+from typing import Any
+
+# Third-Party Packages #
+
+# Local Packages #
+from ...base import ArchiveSink, current_export_sink
+from ...datasets import Dataset
+from .datasetbidsexporter import DatasetBIDSExporter
+
+
+# Definitions #
+# Classes #
+class DatasetArchiveExporter(DatasetBIDSExporter):
+    """A class for exporting BIDS datasets directly into tar or zip archives.
+
+    The export selects and renames the same files as the BIDS exporter, but each file is streamed from the dataset into
+    the archive instead of being copied into a directory tree first.
+
+    Attributes:
+        archive_format: The default format of the archive.
+        volume_size: The default maximum size in bytes of each volume, None to write a single file.
+        workers: The default number of compression threads, None for all processors.
+        compresslevel: The default compression level, None for the default of the format.
+    """
+
+    # Attributes #
+    archive_format: str = "tar"
+    volume_size: int | None = None
+    workers: int | None = None
+    compresslevel: int | None = None
+
+    # Instance Methods #
+    def execute_export(
+        self,
+        path: Path,
+        name: str | None = None,
+        files: bool | set[str, ...] | None = True,
+        inner: bool = True,
+        name_map: dict[str, str] | None = None,
+        type_map: dict[type, type] | None = None,
+        overwrite: bool | None = None,
+        format: str | None = None,
+        volume_size: int | None = None,
+        workers: int | None = None,
+        compresslevel: int | None = None,
+        **kwargs: Any,
+    ) -> Path:
+        """Exports the dataset into an archive named after the dataset in the given directory.
+
+        Args:
+            path: The directory to write the archive to.
+            name: The new name of the exported dataset. Defaults to None, retaining its name.
+            files: A set of files to export or a boolean indicating whether to export files.
+            inner: Determines if the inner objects (e.g., subjects) will be exported.
+            name_map: A mapping of original names to new names.
+            type_map: A mapping of object types to exporter types.
+            overwrite: Determines if existing files will be overwritten.
+            format: The format of the archive: "tar", "tar.gz", "tar.zst", or "zip".
+            volume_size: The maximum size in bytes of each volume, None to write a single file.
+            workers: The number of compression threads, None for all processors.
+            compresslevel: The compression level, None for the default of the format.
+            **kwargs: Additional keyword arguments.
+
+        Returns:
+            The path to the archive, which is the base name of the volumes if the archive is split.
+        """
+        if name is None:
+            name = self.bids_object.full_name
+
+        if format is None:
+            format = self.archive_format
+
+        sink = ArchiveSink(
+            path=path / f"{name}.{format}",
+            root=path,
+            format=format,
+            volume_size=self.volume_size if volume_size is None else volume_size,
+            workers=self.workers if workers is None else workers,
+            compresslevel=self.compresslevel if compresslevel is None else compresslevel,
+        )
+        sink.open()
+        token = current_export_sink.set(sink)
+        try:
+            super().execute_export(
+                path=path,
+                name=name,
+                files=files,
+                inner=inner,
+                name_map=name_map,
+                type_map=type_map,
+                overwrite=overwrite,
+                **kwargs,
+            )
+        finally:
+            current_export_sink.reset(token)
+            sink.close()
+
+        return sink.path
+
+
+# Assign Exporter
+Dataset.exporters["Archive"] = (DatasetArchiveExporter, {})
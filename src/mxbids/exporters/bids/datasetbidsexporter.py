@@ -29,7 +29,7 @@ class DatasetBIDSExporter(DatasetExporter):
 
     # Attributes #
     exporter_name: str = "BIDS"
-    export_exclude_names: set[str, ...] = {"meta"}
+    export_exclude_names: set[str, ...] = {"meta", "manifest"}
     default_type: type = (SubjectBIDSExporter, {})
 
 
@@ -28,7 +28,7 @@ class IEEGBIDSExporter(ModalityBIDSExporter):
 
     # Attributes #
     export_file_names: set[str, ...] = {"ieeg", "coordsystem", "electrodes", "channels", "photo"}
-    export_exclude_names: set[str, ...] = {"ieeg_meta"}
+    export_exclude_names: set[str, ...] = {"meta"}
 
 
 # Assign Exporter
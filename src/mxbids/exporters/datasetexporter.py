@@ -20,7 +20,7 @@ from typing import Any
 # Third-Party Packages #
 
 # Local Packages #
-from ..base import BaseExporter
+from ..base import BaseExporter, format_bids_name, strip_entity_key
 
 
 # Definitions #
@@ -55,10 +55,8 @@ class DatasetExporter(BaseExporter):
         if name_map:
             for subject_name, new_name in name_map.items():
                 # Correct names
-                if subject_name[:4] == "sub-":
-                    subject_name = subject_name[4:]
-                if new_name[:4] != "sub-":
-                    new_name = f"sub-{new_name}"
+                subject_name = strip_entity_key(subject_name, "sub")
+                new_name = format_bids_name({"sub": strip_entity_key(new_name, "sub")})
 
                 # Get subject
                 subject = self.bids_object.subjects[subject_name]
@@ -119,7 +117,7 @@ class DatasetExporter(BaseExporter):
             name = self.bids_object.full_name
 
         new_path = path if name is None else path / name
-        new_path.mkdir(exist_ok=True)
+        self.make_directory(new_path)
         if files or files is None:
             self.export_files(
                 path=new_path,
@@ -49,7 +49,7 @@ class ModalityExporter(BaseExporter):
             name = self.bids_object.name
 
         new_path = path / name
-        new_path.mkdir(exist_ok=True)
+        self.make_directory(new_path)
         if files or files is None:
             new_name = f"{path.parts[-2]}_{path.parts[-1]}"
             self.export_files(
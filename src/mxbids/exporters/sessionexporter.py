@@ -102,7 +102,7 @@ class SessionExporter(BaseExporter):
             name = self.bids_object.full_name.split('_')[1]
 
         new_path = path / name
-        new_path.mkdir(exist_ok=True)
+        self.make_directory(new_path)
         if files or files is None:
             new_name = f"{path.parts[-1]}_{name}"
             self.export_files(
@@ -19,7 +19,7 @@ from typing import Any
 # Third-Party Packages #
 
 # Local Packages #
-from ..base import BaseExporter
+from ..base import BaseExporter, format_bids_name, strip_entity_key
 
 
 # Definitions #
@@ -54,10 +54,8 @@ class SubjectExporter(BaseExporter):
         if name_map:
             for session_name, new_name in name_map.items():
                 # Correct names
-                if session_name[:4] == "ses-":
-                    session_name = session_name[4:]
-                if new_name[:4] != "ses-":
-                    new_name = f"ses-{new_name}"
+                session_name = strip_entity_key(session_name, "ses")
+                new_name = format_bids_name({"ses": strip_entity_key(new_name, "ses")})
 
                 # Get session
                 session = self.bids_object.sessions[session_name]
@@ -108,7 +106,7 @@ class SubjectExporter(BaseExporter):
             name = self.bids_object.full_name
 
         new_path = path / name
-        new_path.mkdir(exist_ok=True)
+        self.make_directory(new_path)
         if files or files is None:
             self.export_files(
                 path=new_path,
@@ -18,3 +18,4 @@ from .modalityimporter import ModalityImporter
 from .sessionimporter import SessionImporter
 from .subjectimporter import SubjectImporter
 from .datasetimporter import DatasetImporter
+from .bids import *
@@ -13,3 +13,4 @@ __email__ = __email__
 
 # Imports #
 # Local Packages #
+from .datasetbidsimporter import ModalityBIDSImporter, DatasetBIDSImporter
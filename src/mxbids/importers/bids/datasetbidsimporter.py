@@ -0,0 +1,621 @@
+"""datasetbidsimporter.py
+A class for importing existing BIDS datasets.
+"""
+# Package Header #
+from ...header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+from concurrent.futures import Future, ThreadPoolExecutor
+import os
+from pathlib import Path
+from shutil import copytree
+from typing import Any
+from warnings import warn
+
+# Third-Party Packages #
+
+# Local Packages #
+from ...base import (
+    ArchivePath,
+    ImportFileMap,
+    ImportPlan,
+    current_journal,
+    current_progress,
+    ImportInnerMap,
+    format_bids_name,
+    parse_bids_name,
+    strip_entity_key,
+)
+from ...modalities import Modality, Anatomy, CT, IEEG, DWI
+from ...sessions import Session
+from ...subjects import Subject
+from ...datasets import Dataset
+from ..file import python_copy, link_copy
+from ..modalityimporter import ModalityImporter
+from ..sessionimporter import SessionImporter
+from ..subjectimporter import SubjectImporter
+from ..datasetimporter import DatasetImporter
+
+
+# Definitions #
+# Classes #
+class ModalityBIDSImporter(ModalityImporter):
+    """A class for importing the modalities of existing BIDS datasets."""
+
+    # Attributes #
+    importer_name: str = "BIDS"
+
+    # Instance Methods #
+    def execute_import(
+        self,
+        path: Path,
+        file_maps: bool | list[ImportFileMap, ...] | None = True,
+        overwrite: bool | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Executes the import process for the modality.
+
+        The modality's default files are not built because the imported files replace them, but its meta information
+        is created so the modality can be loaded with its type.
+
+        Args:
+            path: The root path the files to import.
+            file_maps: A list of file maps which contain the path information and a callable which imports the file.
+            overwrite: Determines if the files should be overridden if they already exist.
+            **kwargs: Additional keyword arguments.
+        """
+        super().execute_import(path=path, file_maps=file_maps, overwrite=overwrite, **kwargs)
+        self.require_meta_information()
+
+    def plan_import(
+        self,
+        path: Path | ArchivePath,
+        file_maps: bool | list[ImportFileMap, ...] | None = True,
+        overwrite: bool | None = None,
+        plan: ImportPlan | None = None,
+        **kwargs: Any,
+    ) -> ImportPlan:
+        """Plans the import of the modality, creating its meta information after its files are imported.
+
+        Args:
+            path: The root path the files to import.
+            file_maps: A list of file maps which contain the path information and a callable which imports the file.
+            overwrite: Determines if the files should be overridden if they already exist.
+            plan: The plan to add to, None to create a new plan.
+            **kwargs: Additional keyword arguments.
+
+        Returns:
+            The plan of the import.
+        """
+        plan = super().plan_import(path=path, file_maps=file_maps, overwrite=overwrite, plan=plan, **kwargs)
+        plan.add_finalizer(self.require_meta_information)
+        return plan
+
+    def require_meta_information(self) -> None:
+        """Creates the meta information of the modality if it does not exist."""
+        if not self.bids_object.meta_information_path.exists():
+            self.bids_object.create_meta_information()
+
+
+class DatasetBIDSImporter(DatasetImporter):
+    """A class for importing existing BIDS datasets.
+
+    The source tree is scanned once and the file and inner maps of every subject, session, and modality are built from
+    the directory layout and the entities in the file names. The nodes are created in order while the files are copied
+    or hard linked by a pool of workers, so the import is limited by disk throughput rather than by walking the tree.
+
+    Attributes:
+        subject_type: The type and keyword arguments of the subjects to create.
+        session_type: The type and keyword arguments of the sessions to create.
+        modality_types: The types and keyword arguments of the modalities to create keyed by their directory name.
+        default_modality_type: The type and keyword arguments of modalities without a known directory name.
+        default_session_name: The name of the session to create for subjects without session directories.
+        parent_entities: The entities which name the parent directories and are replaced by the names of the nodes.
+        exclude_directories: The names of directories in the dataset root which will not be imported.
+        workers: The number of workers which copy files, None for the default of the executor.
+        hardlink: Determines if files will be hard linked instead of copied when possible.
+        _executor: The executor of the current import.
+        _futures: The files submitted to the executor and their futures.
+
+    Args:
+        bids_object: The mxbids object to import to.
+        file_maps: A list of file maps which contain the path information and a callable which imports the file.
+        inner_maps: The list of maps which map inner objects created from this import and importers for those objects.
+        overwrite: Determines if the files should be overridden if they already exist.
+        workers: The number of workers which copy files, None for the default of the executor.
+        hardlink: Determines if files will be hard linked instead of copied when possible.
+        init: Determines if the object will construct. Defaults to True.
+        **kwargs: Additional keyword arguments.
+    """
+
+    # Attributes #
+    importer_name: str = "BIDS"
+
+    subject_type: tuple[type[Subject], dict[str, Any]] = (Subject, {})
+    session_type: tuple[type[Session], dict[str, Any]] = (Session, {})
+    modality_types: dict[str, tuple[type[Modality], dict[str, Any]]] = {
+        "anat": (Anatomy, {}),
+        "ct": (CT, {}),
+        "dwi": (DWI, {}),
+        "ieeg": (IEEG, {}),
+    }
+    default_modality_type: tuple[type[Modality], dict[str, Any]] = (Modality, {})
+    default_session_name: str = "1"
+    parent_entities: set[str] = {"sub", "ses"}
+    exclude_directories: set[str] = {"code", "derivatives", "sourcedata"}
+
+    workers: int | None = None
+    hardlink: bool = False
+
+    _executor: ThreadPoolExecutor | None = None
+    _futures: list[tuple[Path, Path, Future]]
+
+    # Magic Methods #
+    # Construction/Destruction
+    def __init__(
+        self,
+        bids_object: Any = None,
+        file_maps: list[ImportFileMap, ...] | None = None,
+        inner_maps: list[ImportInnerMap, ...] | None = None,
+        overwrite: bool | None = None,
+        workers: int | None = None,
+        hardlink: bool | None = None,
+        *,
+        init: bool = True,
+        **kwargs: Any,
+    ) -> None:
+        # New Attributes #
+        self._futures = []
+
+        # Parent Attributes #
+        super().__init__(init=False)
+
+        # Object Construction #
+        if init:
+            self.construct(
+                bids_object=bids_object,
+                file_maps=file_maps,
+                inner_maps=inner_maps,
+                overwrite=overwrite,
+                workers=workers,
+                hardlink=hardlink,
+                **kwargs,
+            )
+
+    # Instance Methods #
+    # Constructors/Destructors
+    def construct(
+        self,
+        bids_object: Any = None,
+        file_maps: list[ImportFileMap, ...] | None = None,
+        inner_maps: list[ImportInnerMap, ...] | None = None,
+        overwrite: bool | None = None,
+        workers: int | None = None,
+        hardlink: bool | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Constructs this object.
+
+        Args:
+            bids_object: The mxbids object to import to.
+            file_maps: A list of file maps which contain the path information and a callable which imports the file.
+            inner_maps: The list of maps which map inner objects created from this import and importers for those
+                objects.
+            overwrite: Determines if the files should be overridden if they already exist.
+            workers: The number of workers which copy files, None for the default of the executor.
+            hardlink: Determines if files will be hard linked instead of copied when possible.
+            **kwargs: Additional keyword arguments.
+        """
+        if workers is not None:
+            self.workers = workers
+
+        if hardlink is not None:
+            self.hardlink = hardlink
+
+        super().construct(
+            bids_object=bids_object,
+            file_maps=file_maps,
+            inner_maps=inner_maps,
+            overwrite=overwrite,
+            **kwargs,
+        )
+
+    # Scanning
+    @staticmethod
+    def list_entries(path: Path | ArchivePath) -> list[tuple[str, Path | ArchivePath, bool]]:
+        """Lists the visible entries in a directory of a source BIDS tree, which can be within an archive.
+
+        Args:
+            path: The path to the directory.
+
+        Returns:
+            The names, paths, and whether each entry is a directory.
+        """
+        if isinstance(path, ArchivePath):
+            return [(p.name, p, p.is_dir()) for p in path.iterdir() if p.name[0] != "."]
+        else:
+            with os.scandir(path) as entries:
+                return [
+                    (e.name, Path(e.path), e.is_dir())
+                    for e in entries
+                    if e.name[0] != "." and (e.is_dir() or e.is_file())
+                ]
+
+    def scan_source(self, path: Path) -> dict[str, Any]:
+        """Scans a source BIDS tree once, grouping its files by subject, session, and modality.
+
+        Args:
+            path: The root path of the source BIDS dataset.
+
+        Returns:
+            The files of the dataset root and the scanned subjects keyed by their names.
+        """
+        files = []
+        directories = []
+        subjects = {}
+        for name, entry_path, is_dir in self.list_entries(path):
+            if is_dir:
+                if name[:4] == "sub-":
+                    subjects[strip_entity_key(name, "sub")] = self.scan_subject(entry_path)
+                elif name not in self.exclude_directories:
+                    directories.append(name)
+            else:
+                files.append(name)
+
+        return {"files": files, "directories": directories, "subjects": subjects}
+
+    def scan_subject(self, path: Path) -> dict[str, Any]:
+        """Scans a subject directory of a source BIDS tree.
+
+        Args:
+            path: The path to the subject directory.
+
+        Returns:
+            The files of the subject and its scanned sessions keyed by their names.
+        """
+        files = []
+        modalities = {}
+        sessions = {}
+        for name, entry_path, is_dir in self.list_entries(path):
+            if is_dir:
+                if name[:4] == "ses-":
+                    sessions[strip_entity_key(name, "ses")] = self.scan_session(entry_path, name)
+                else:
+                    modalities[name] = self.scan_modality(entry_path)
+            else:
+                files.append(name)
+
+        # Datasets without session directories have their modalities directly in the subject directories.
+        if modalities:
+            sessions[self.default_session_name] = {"stem": "", "files": [], "modalities": modalities}
+
+        return {"files": files, "sessions": sessions}
+
+    def scan_session(self, path: Path, stem: str = "") -> dict[str, Any]:
+        """Scans a session directory of a source BIDS tree.
+
+        Args:
+            path: The path to the session directory.
+            stem: The name of the session directory relative to the subject directory.
+
+        Returns:
+            The files of the session and its scanned modalities keyed by their names.
+        """
+        files = []
+        modalities = {}
+        for name, entry_path, is_dir in self.list_entries(path):
+            if is_dir:
+                modalities[name] = self.scan_modality(entry_path)
+            else:
+                files.append(name)
+
+        return {"stem": stem, "files": files, "modalities": modalities}
+
+    def scan_modality(self, path: Path) -> list[str]:
+        """Scans a modality directory of a source BIDS tree.
+
+        Recordings can be directories, such as iEEG MEF3 *_ieeg.mefd or MEG CTF *_meg.ds, so the directories are
+        listed with the files and are copied as whole trees.
+
+        Args:
+            path: The path to the modality directory.
+
+        Returns:
+            The names of the files and recording directories in the modality directory.
+        """
+        return [name for name, _, _ in self.list_entries(path)]
+
+    # Maps
+    def create_file_maps(self, names: list[str]) -> list[ImportFileMap]:
+        """Creates file maps for BIDS files, naming each by its entities other than the subject and session.
+
+        Args:
+            names: The names of the files to create maps for.
+
+        Returns:
+            The file maps of the files.
+        """
+        file_maps = []
+        for name in names:
+            entities, suffix, extension = parse_bids_name(name)
+            entities = {k: v for k, v in entities.items() if k not in self.parent_entities}
+            file_maps.append(
+                ImportFileMap(format_bids_name(entities, suffix), extension, (Path(name),), self.submit_file, None, {})
+            )
+
+        return file_maps
+
+    def create_subject_maps(self, scan: dict[str, Any]) -> list[ImportInnerMap]:
+        """Creates the inner maps of the subjects, sessions, and modalities of a scanned BIDS tree.
+
+        Args:
+            scan: The scanned BIDS tree.
+
+        Returns:
+            The inner maps of the subjects.
+        """
+        subject_maps = []
+        for s_name, subject in scan["subjects"].items():
+            s_prefix = format_bids_name({"sub": s_name})
+            session_maps = []
+            for ses_name, session in subject["sessions"].items():
+                modality_maps = []
+                for m_name, names in session["modalities"].items():
+                    m_type, m_kwargs = self.modality_types.get(m_name, self.default_modality_type)
+                    modality_maps.append(
+                        ImportInnerMap(
+                            m_name,
+                            m_type,
+                            self.importer_name,
+                            m_name,
+                            ModalityBIDSImporter,
+                            None,
+                            {"build": False} | m_kwargs,
+                            {"file_maps": self.create_file_maps(names)},
+                        )
+                    )
+
+                ses_type, ses_kwargs = self.session_type
+                session_maps.append(
+                    ImportInnerMap(
+                        ses_name,
+                        ses_type,
+                        self.importer_name,
+                        session["stem"],
+                        SessionImporter,
+                        None,
+                        ses_kwargs,
+                        {"file_maps": self.create_file_maps(session["files"]), "inner_maps": modality_maps},
+                    )
+                )
+
+            s_type, s_kwargs = self.subject_type
+            subject_maps.append(
+                ImportInnerMap(
+                    s_name,
+                    s_type,
+                    self.importer_name,
+                    s_prefix,
+                    SubjectImporter,
+                    None,
+                    s_kwargs,
+                    {"file_maps": self.create_file_maps(subject["files"]), "inner_maps": session_maps},
+                )
+            )
+
+        return subject_maps
+
+    # Files
+    def copy_file(self, old_path: Path, new_path: Path) -> None:
+        """Copies or hard links a file, or the tree of a recording which is a directory.
+
+        Args:
+            old_path: The path to the original file.
+            new_path: The path to the new file.
+        """
+        if old_path.is_dir():
+            if isinstance(old_path, ArchivePath):
+                old_path.copy_tree(new_path)
+            else:
+                copy_function = link_copy if self.hardlink else python_copy
+                copytree(old_path, new_path, copy_function=copy_function, dirs_exist_ok=True)
+        elif self.hardlink:
+            link_copy(old_path, new_path)
+        else:
+            python_copy(old_path, new_path)
+
+    def submit_file(self, old_path: Path, new_path: Path) -> Future | None:
+        """Submits a file to be copied by the workers, or copies it if there are no workers.
+
+        Args:
+            old_path: The path to the original file.
+            new_path: The path to the new file.
+
+        Returns:
+            The future of the copy, None if the file was copied.
+        """
+        if self._executor is None:
+            self.copy_file(old_path, new_path)
+            return None
+        else:
+            future = self._executor.submit(self.copy_file, old_path, new_path)
+            self._futures.append((old_path, new_path, future))
+            return future
+
+    def import_root(self, path: Path, scan: dict[str, Any], overwrite: bool | None = None) -> None:
+        """Imports the files and extra directories of the dataset root, which keep their names.
+
+        Args:
+            path: The root path of the source BIDS dataset.
+            scan: The scanned BIDS tree.
+            overwrite: Determines if the files should be overridden if they already exist.
+        """
+        progress = current_progress.get()
+        journal = current_journal.get()
+        over = overwrite if overwrite is not None else self.overwrite
+        for name in scan["files"]:
+            new_path = self.bids_object.path / name
+            if self.needs_import(new_path, over, journal):
+                if journal is not None:
+                    journal.file_begin(new_path)
+                self.report_file(progress, new_path, self.submit_file(path / name, new_path), journal)
+
+        self.import_root_directories(path, scan, overwrite=overwrite)
+
+    def import_root_directories(self, path: Path, scan: dict[str, Any], overwrite: bool | None = None) -> None:
+        """Imports the extra directories of the dataset root, which keep their names.
+
+        Args:
+            path: The root path of the source BIDS dataset.
+            scan: The scanned BIDS tree.
+            overwrite: Determines if the files should be overridden if they already exist.
+        """
+        journal = current_journal.get()
+        over = overwrite if overwrite is not None else self.overwrite
+        copy_function = link_copy if self.hardlink else python_copy
+        for name in scan["directories"]:
+            new_path = self.bids_object.path / name
+            if journal is not None and journal.is_node_done(new_path):
+                continue
+            elif not new_path.exists() or over or (journal is not None and journal.is_node_pending(new_path)):
+                if journal is not None:
+                    journal.node_begin(new_path)
+                if isinstance(path, ArchivePath):
+                    (path / name).copy_tree(new_path)
+                else:
+                    copytree(path / name, new_path, copy_function=copy_function, dirs_exist_ok=True)
+                if journal is not None:
+                    journal.node_done(new_path)
+
+    def wait_files(self) -> None:
+        """Waits for the workers to finish the submitted files, warning about any which failed."""
+        for old_path, new_path, future in self._futures:
+            if (e := future.exception()) is not None:
+                warn(f"Failed to BIDS import {old_path} to {new_path} with error: {e}", RuntimeWarning)
+        self._futures.clear()
+
+    def plan_import(
+        self,
+        path: Path | ArchivePath,
+        file_maps: bool | list[ImportFileMap, ...] | None = True,
+        inner_maps: bool | list[ImportInnerMap, ...] | None = True,
+        overwrite: bool | None = None,
+        plan: ImportPlan | None = None,
+        workers: int | None = None,
+        hardlink: bool | None = None,
+        **kwargs: Any,
+    ) -> ImportPlan:
+        """Plans the import of the dataset without writing anything, so it can be inspected before it is executed.
+
+        Args:
+            path: The root path of the source BIDS dataset, which can be a tar or zip archive.
+            file_maps: A list of file maps which contain the path information and a callable which imports the file.
+            inner_maps: The list of maps which map inner objects created from this import and importers for those
+                objects.
+            overwrite: Determines if the files should be overridden if they already exist.
+            plan: The plan to add to, None to create a new plan.
+            workers: The number of workers which copy files, None for the default of the executor.
+            hardlink: Determines if files will be hard linked instead of copied when possible.
+            **kwargs: Additional keyword arguments.
+
+        Returns:
+            The plan of the import.
+        """
+        if workers is not None:
+            self.workers = workers
+
+        if hardlink is not None:
+            self.hardlink = hardlink
+
+        with self.open_plan(path if isinstance(path, ArchivePath) else Path(path), plan) as (path, plan):
+            if plan.workers is None:
+                plan.workers = self.workers
+
+            scan = self.scan_source(path)
+            if inner_maps is True:
+                inner_maps = self.create_subject_maps(scan)
+
+            plan.add_node(self.bids_object)
+            journal = current_journal.get()
+            over = overwrite if overwrite is not None else self.overwrite
+            for name in scan["files"]:
+                new_path = self.bids_object.path / name
+                if self.needs_import(new_path, over, journal):
+                    plan.add_job(new_path, (path / name,), self.copy_file)
+
+            super().plan_import(
+                path=path,
+                file_maps=file_maps,
+                inner_maps=inner_maps,
+                overwrite=overwrite,
+                plan=plan,
+                **kwargs,
+            )
+            plan.add_finalizer(lambda: self.import_root_directories(path, scan, overwrite=overwrite))
+            plan.add_finalizer(self.bids_object.build)
+
+        return plan
+
+    def execute_import(
+        self,
+        path: Path,
+        file_maps: bool | list[ImportFileMap, ...] | None = True,
+        inner_maps: bool | list[ImportInnerMap, ...] | None = True,
+        overwrite: bool | None = None,
+        workers: int | None = None,
+        hardlink: bool | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Executes the import process for the dataset.
+
+        Args:
+            path: The root path of the source BIDS dataset, which can be a tar or zip archive.
+            file_maps: A list of file maps which contain the path information and a callable which imports the file.
+            inner_maps: The list of maps which map inner objects created from this import and importers for those
+                objects.
+            overwrite: Determines if the files should be overridden if they already exist.
+            workers: The number of workers which copy files, None for the default of the executor.
+            hardlink: Determines if files will be hard linked instead of copied when possible.
+            **kwargs: Additional keyword arguments.
+        """
+        if workers is not None:
+            self.workers = workers
+
+        if hardlink is not None:
+            self.hardlink = hardlink
+
+        with self.open_source(path if isinstance(path, ArchivePath) else Path(path)) as path:
+            scan = self.scan_source(path)
+            if inner_maps is True:
+                inner_maps = self.create_subject_maps(scan)
+
+            self._executor = None if self.workers == 1 else ThreadPoolExecutor(max_workers=self.workers)
+            try:
+                self.bids_object.create(build=False)
+                self.import_root(path, scan, overwrite=overwrite)
+                super().execute_import(
+                    path=path,
+                    file_maps=file_maps,
+                    inner_maps=inner_maps,
+                    overwrite=overwrite,
+                    **kwargs,
+                )
+            finally:
+                if self._executor is not None:
+                    self._executor.shutdown(wait=True)
+                    self._executor = None
+                self.wait_files()
+
+        self.bids_object.build()
+
+
+# Assign Importer
+Dataset.importers["BIDS"] = (DatasetBIDSImporter, {})
@@ -13,13 +13,14 @@ __email__ = __email__
 
 # Imports #
 # Standard Libraries #
+from collections.abc import MutableMapping
 from pathlib import Path
 from typing import Any
 
 # Third-Party Packages #
 
 # Local Packages #
-from ..base import BaseImporter, ImportFileMap, ImportInnerMap
+from ..base import strip_entity_key, BaseImporter, ImportFileMap, ImportInnerMap
 
 
 # Definitions #
@@ -48,8 +49,7 @@ class DatasetImporter(BaseImporter):
 
         for s_name, s_type, i_name, stem, importer, i_overwrite, s_kwargs, i_kwargs in inner_maps:
             # Correct names
-            if s_name[:4] == "sub-":
-                s_name = s_name[4:]
+            s_name = strip_entity_key(s_name, "sub")
 
             subject = self.bids_object.subjects.get(s_name, None)
             if subject is None:
@@ -66,7 +66,15 @@ class DatasetImporter(BaseImporter):
                 importer, i_kwargs = self.default_inner_importer
 
             over = overwrite if overwrite is not None else i_overwrite
-            importer(bids_object=subject, **i_kwargs).execute_import(path.joinpath(stem), overwrite=over)
+            self.import_inner(subject, importer, i_kwargs, path.joinpath(stem), overwrite=over)
+
+    def get_inner_nodes(self) -> tuple[MutableMapping[str, Any], str | None]:
+        """Gets the mapping of the subjects this importer creates and the entity key of their names.
+
+        Returns:
+            The mapping and the entity key.
+        """
+        return self.bids_object.subjects, "sub"
 
     def execute_import(
         self,
@@ -79,22 +87,23 @@ class DatasetImporter(BaseImporter):
         """Executes the import process for the dataset.
 
         Args:
-            path: The root path the files to import.
+            path: The root path the files to import, which can be a tar or zip archive.
             file_maps: A list of file maps which contain the path information and a callable which imports the file.
             inner_maps: The list of maps which map inner objects created from this import and importers for those objects.
             overwrite: Determines if the files should be overridden if they already exist.
             **kwargs: Additional keyword arguments.
         """
-        self.bids_object.create(build=False)
-        if file_maps or file_maps is None:
-            self.import_files(
-                path=path,
-                file_maps=None if isinstance(file_maps, bool) else file_maps,
-                overwrite=overwrite,
-            )
-        if inner_maps or inner_maps is None:
-            self.import_subjects(
-                path=path,
-                inner_maps=None if isinstance(inner_maps, bool) else inner_maps,
-                overwrite=overwrite,
-            )
+        with self.open_source(path) as path:
+            self.bids_object.create(build=False)
+            if file_maps or file_maps is None:
+                self.import_files(
+                    path=path,
+                    file_maps=None if isinstance(file_maps, bool) else file_maps,
+                    overwrite=overwrite,
+                )
+            if inner_maps or inner_maps is None:
+                self.import_subjects(
+                    path=path,
+                    inner_maps=None if isinstance(inner_maps, bool) else inner_maps,
+                    overwrite=overwrite,
+                )
@@ -15,14 +15,15 @@ __email__ = __email__
 # Standard Libraries #
 from collections.abc import Iterable
 from json import dump, load
+import os
 from pathlib import Path
-from shutil import copy2
 import subprocess
 from warnings import warn
 
 # Third-Party Packages #
 
 # Local Packages #
+from ...base import ArchivePath, BulkCopier
 
 
 # Definitions #
@@ -38,7 +39,7 @@ def strip_json_copy(old_path: Path, new_path: Path, strip: Iterable[str] = ()) -
     if not old_path.exists():
         warn(f"could not find {old_path}")
         return
-    with open(old_path, "r") as f:
+    with old_path.open("r") as f:
         data_orig = load(f)
 
     data_clean = {key: value for key, value in data_orig.items() if key not in strip}
@@ -55,17 +56,40 @@ def command_copy(old_path: Path, new_path: Path, command: str) -> None:
         new_path: The path to the new file.
         command: The command to use for copying the file.
     """
-    subprocess.run([command, str(old_path), str(new_path)])
+    subprocess.run([command, os.fspath(old_path), str(new_path)])
 
 
 def python_copy(old_path: Path, new_path: Path) -> None:
-    """Copies a file using the shutil.copy2 function.
+    """Copies a file with its metadata using the default bulk copier, or streams it if it is in an archive.
 
     Args:
         old_path: The path to the original file.
         new_path: The path to the new file.
     """
-    copy2(old_path, new_path)
+    if isinstance(old_path, ArchivePath):
+        old_path.copy_to(new_path)
+    else:
+        BulkCopier.default.copy(old_path, new_path)
 
 
-__all__ = ["strip_json_copy", "command_copy", "python_copy"]
+def link_copy(old_path: Path, new_path: Path) -> None:
+    """Hard links a file, copying it with the default bulk copier if it cannot be linked.
+
+    Files in archives cannot be linked, so they are streamed instead.
+
+    Args:
+        old_path: The path to the original file.
+        new_path: The path to the new file.
+    """
+    if os.path.lexists(new_path):
+        os.remove(new_path)
+    if isinstance(old_path, ArchivePath):
+        old_path.copy_to(new_path)
+        return
+    try:
+        os.link(old_path, new_path)
+    except OSError:
+        BulkCopier.default.copy(old_path, new_path)
+
+
+__all__ = ["strip_json_copy", "command_copy", "python_copy", "link_copy"]
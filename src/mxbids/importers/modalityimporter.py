@@ -38,15 +38,16 @@ class ModalityImporter(BaseImporter):
         """Executes the import process for the modality.
 
         Args:
-            path: The root path the files to import.
+            path: The root path the files to import, which can be a tar or zip archive.
             file_maps: A list of file maps which contain the path information and a callable which imports the file.
             overwrite: Determines if the files should be overridden if they already exist.
             **kwargs: Additional keyword arguments.
         """
-        self.bids_object.create(build=False)
-        if file_maps or file_maps is None:
-            self.import_files(
-                path=path,
-                file_maps=None if isinstance(file_maps, bool) else file_maps,
-                overwrite=overwrite,
-            )
+        with self.open_source(path) as path:
+            self.bids_object.create(build=False)
+            if file_maps or file_maps is None:
+                self.import_files(
+                    path=path,
+                    file_maps=None if isinstance(file_maps, bool) else file_maps,
+                    overwrite=overwrite,
+                )
@@ -24,7 +24,7 @@ from baseobjects.objects import ClassNamespaceRegister
 import pandas as pd
 
 # Local Packages #
-from ...base import BaseImporter, BaseExporter
+from ...base import BaseImporter, BaseExporter, TableCache, apply_dtypes, memory_report, read_tsv
 from ..modality import Modality
 
 
@@ -44,12 +44,16 @@ class IEEG(Modality):
         name: The name of the modality.
         _ieeg_metadata: The IEEG metadata.
         _coordinate_system: The coordinate system.
-        electrode_columns: List of electrode column names.
+        electrode_columns: Electrode column names, shared with the class until assigned.
+        electrode_dtypes: The dtypes of the electrode columns, where None keeps the inferred dtype.
         electrodes: DataFrame containing electrode information.
-        channel_columns: List of channel column names.
+        channel_columns: Channel column names, shared with the class until assigned.
+        channel_dtypes: The dtypes of the channel columns, where None keeps the inferred dtype.
         channels: DataFrame containing channel information.
-        event_columns: List of event column names.
+        event_columns: Event column names, shared with the class until assigned.
+        event_dtypes: The dtypes of the event columns, where None keeps the inferred dtype.
         events: DataFrame containing event information.
+        table_cache: The cache of loaded tables, None to use the cache shared by the modalities of the dataset.
         importers: Mapping of importers.
         exporters: Mapping of exporters.
 
@@ -81,7 +85,7 @@ class IEEG(Modality):
 
     _coordinate_system: dict[str, Any] | None = None
 
-    electrode_columns: list[str] = [
+    electrode_columns: tuple[str, ...] = (
         "name",
         "x",
         "y",
@@ -94,27 +98,59 @@ class IEEG(Modality):
         "type",
         "impedance",
         "dimension",
-    ]
+    )
+    electrode_dtypes: dict[str, Any] = {
+        "name": None,
+        "x": "float32",
+        "y": "float32",
+        "z": "float32",
+        "size": "float32",
+        "material": "category",
+        "manufacturer": "category",
+        "group": "category",
+        "hemisphere": "category",
+        "type": "category",
+        "impedance": "float32",
+        "dimension": "category",
+    }
     electrodes: pd.DataFrame | None = None
 
-    channel_columns: list[str] = [
+    channel_columns: tuple[str, ...] = (
         "name",
         "type",
         "units",
         "low_cutoff",
         "high_cutoff",
-    ]
+    )
+    channel_dtypes: dict[str, Any] = {
+        "name": None,
+        "type": "category",
+        "units": "category",
+        "low_cutoff": "float32",
+        "high_cutoff": "float32",
+        "status": "category",
+    }
     channels: pd.DataFrame | None = None
 
-    event_columns: list[str] = [
+    event_columns: tuple[str, ...] = (
         "onset",
         "duration",
         "electrical_stimulation_type",
         "electrical_stimulation_site",
         "electrical_stimulation_current",
-    ]
+    )
+    event_dtypes: dict[str, Any] = {
+        "onset": "float64",
+        "duration": "float64",
+        "electrical_stimulation_type": "category",
+        "electrical_stimulation_site": "category",
+        "electrical_stimulation_current": "float32",
+        "trial_type": "category",
+    }
     events: pd.DataFrame | None = None
 
+    table_cache: TableCache | None = None
+
     importers: MutableMapping[str, tuple[type[BaseImporter], dict[str, Any]]] = Modality.importers.new_child()
     exporters: MutableMapping[str, tuple[type[BaseExporter], dict[str, Any]]] = Modality.exporters.new_child()
 
@@ -132,6 +168,11 @@ class IEEG(Modality):
         else:
             return self._ieeg_metadata
     
+    @property
+    def inherited_ieeg_metadata(self) -> dict[str, Any]:
+        """The ieeg metadata merged with the ieeg sidecars it inherits from the dataset, subject, and session."""
+        return self.resolve_metadata(self.ieeg_metadata_path)
+
     @property
     def coordinate_system_path(self) -> Path:
         """The path to the coordinate system json file."""
@@ -176,9 +217,6 @@ class IEEG(Modality):
         **kwargs: Any,
     ) -> None:
         # New Attributes #
-        self.electrode_columns = self.electrode_columns.copy()
-        self.channel_columns = self.channel_columns.copy()
-        self.event_columns = self.event_columns.copy()
 
         # Parent Attributes #
         super().__init__(init=False)
@@ -202,13 +240,58 @@ class IEEG(Modality):
         super().build()
         self.create_ieeg_metadata()
 
+    def unload(self) -> None:
+        """Releases the loaded electrodes, channels, and events tables of this modality."""
+        self.electrodes = None
+        self.channels = None
+        self.events = None
+        super().unload()
+
+    def estimate_memory(self) -> int:
+        """Estimates the memory used by this modality and its loaded tables.
+
+        Returns:
+            The estimated memory in bytes.
+        """
+        return super().estimate_memory() + sum(r["Total"] for r in self.get_memory_report().values())
+
+    # Tables
+    def get_table_cache(self) -> TableCache:
+        """Gets the cache of loaded tables for this modality.
+
+        Returns:
+            The table cache of this modality or the cache shared by the modalities of its dataset.
+        """
+        if self.table_cache is None:
+            try:
+                root = self.path.parents[2]
+            except IndexError:
+                root = self.path.parent
+            self.table_cache = TableCache.for_root(root)
+        return self.table_cache
+
+    def load_table(self, path: Path, dtypes: dict[str, Any], cache: bool = True) -> pd.DataFrame:
+        """Loads a TSV table with its dtypes, from the table cache if its file is unchanged.
+
+        Args:
+            path: The path to the TSV file.
+            dtypes: The dtype of each column.
+            cache: Determines if the table cache is used.
+
+        Returns:
+            The table, which can be changed without changing the cached table.
+        """
+        if cache:
+            return self.get_table_cache().get(path, lambda p: read_tsv(p, dtypes), TableCache.get_schema(dtypes))
+        else:
+            return read_tsv(path, dtypes)
+
     # IEEG Metadata
     def create_ieeg_metadata(self) -> None:
         """Creates ieeg metadata file and saves the metadata."""
         if self._ieeg_metadata is None:
             self._ieeg_metadata = deepcopy(self.default_ieeg_metadata)
-        with self.ieeg_metadata_path.open(self._mode) as file:
-            json.dump(self._ieeg_metadata, file)
+        self.write_json(self.ieeg_metadata_path, self._ieeg_metadata)
 
     def load_ieeg_data(self) -> dict:
         """Loads the ieeg metadata from the file.
@@ -228,16 +311,14 @@ class IEEG(Modality):
 
     def save_ieeg_metadata(self) -> None:
         """Saves the ieeg metadata to the file."""
-        with self.ieeg_metadata_path.open(self._mode) as file:
-            json.dump(self.ieeg_metadata, file)
+        self.write_json(self.ieeg_metadata_path, self.ieeg_metadata)
     
     # Coordinate System
     def create_coordinate_system(self) -> None:
         """Creates coordinate system file and saves the coordinate system."""
         if self._coordinate_system is None:
             self._coordinate_system = deepcopy(self.default_coordinate_system)
-        with self.coordinate_system_path.open(self._mode) as file:
-            json.dump(self._coordinate_system, file)
+        self.write_json(self.coordinate_system_path, self._coordinate_system)
 
     def load_coordinate_system(self) -> dict:
         """Loads the coordinate system from the file.
@@ -257,68 +338,95 @@ class IEEG(Modality):
 
     def save_coordinate_system(self) -> None:
         """Saves the coordinate system to the file."""
-        with self.coordinate_system_path.open(self._mode) as file:
-            json.dump(self.coordinate_system, file)
+        self.write_json(self.coordinate_system_path, self.coordinate_system)
     
     # Electrodes
     def create_electrodes(self) -> None:
         """Creates electrodes file and saves the electrodes."""
         if self.electrodes is None:
-            self.electrodes = pd.DataFrame(columns=self.electrode_columns)
+            self.electrodes = pd.DataFrame(columns=list(self.electrode_columns))
+
+        self.save_electrodes()
 
-        self.electrodes.to_csv(self.electrodes_path, mode=self._mode, sep="\t")
+    def load_electrodes(self, cache: bool = True) -> pd.DataFrame:
+        """Loads the electrode information from the file, or from the table cache if the file is unchanged.
 
-    def load_electrodes(self) -> pd.DataFrame:
-        """Loads the electrode information from the file.
+        Args:
+            cache: Determines if the table cache is used.
 
         Returns:
             The electrode information.
         """
-        self.electrodes = electrodes = pd.read_csv(self.electrodes_path, sep="\t")
+        self.electrodes = electrodes = self.load_table(self.electrodes_path, self.electrode_dtypes, cache)
         return electrodes
 
     def save_electrodes(self) -> None:
         """Saves the electrodes to the file."""
-        self.electrodes.to_csv(self.electrodes_path, mode=self._mode, sep="\t")
+        self.electrodes = apply_dtypes(self.electrodes, self.electrode_dtypes)
+        self.write_tsv(self.electrodes_path, self.electrodes)
+        self.get_table_cache().invalidate(self.electrodes_path)
 
     # Channels
     def create_channels(self) -> None:
         """Creates channels file and saves the channels."""
         if self.channels is None:
-            self.channels = pd.DataFrame(columns=self.channel_columns)
+            self.channels = pd.DataFrame(columns=list(self.channel_columns))
+
+        self.save_channels()
 
-        self.channels.to_csv(self.channels_path, mode=self._mode, sep="\t")
+    def load_channels(self, cache: bool = True) -> pd.DataFrame:
+        """Loads the channel information from the file, or from the table cache if the file is unchanged.
 
-    def load_channels(self) -> pd.DataFrame:
-        """Loads the channel information from the file.
+        Args:
+            cache: Determines if the table cache is used.
 
         Returns:
             The channel information.
         """
-        self.channels = channels = pd.read_csv(self.channels_path, sep="\t")
+        self.channels = channels = self.load_table(self.channels_path, self.channel_dtypes, cache)
         return channels
 
     def save_channels(self) -> None:
         """Saves the channels to the file."""
-        self.channels.to_csv(self.channels_path, mode=self._mode, sep="\t")
+        self.channels = apply_dtypes(self.channels, self.channel_dtypes)
+        self.write_tsv(self.channels_path, self.channels)
+        self.get_table_cache().invalidate(self.channels_path)
 
     # Stimulation Events
     def create_events(self) -> None:
         """Creates stimulation events file and saves the events."""
         if self.events is None:
-            self.events = pd.DataFrame(columns=self.event_columns)
+            self.events = pd.DataFrame(columns=list(self.event_columns))
 
-        self.events.to_csv(self.events_path, mode=self._mode, sep="\t")
+        self.save_events()
 
-    def load_events(self) -> pd.DataFrame:
-        """Loads the stimulation event information from the file.
+    def load_events(self, cache: bool = True) -> pd.DataFrame:
+        """Loads the stimulation event information from the file, or from the table cache if the file is unchanged.
+
+        Args:
+            cache: Determines if the table cache is used.
 
         Returns:
             The stimulation event information.
         """
-        self.events = events = pd.read_csv(self.events_path, sep="\t")
+        self.events = events = self.load_table(self.events_path, self.event_dtypes, cache)
         return events
 
     def save_events(self) -> None:
         """Saves the stimulation events to the file."""
-        self.events.to_csv(self.events_path, mode=self._mode, sep="\t")
+        self.events = apply_dtypes(self.events, self.event_dtypes)
+        self.write_tsv(self.events_path, self.events)
+        self.get_table_cache().invalidate(self.events_path)
+
+    # Memory
+    def get_memory_report(self) -> dict[str, dict[str, int]]:
+        """Measures the memory used by the loaded electrodes, channels, and events tables.
+
+        Returns:
+            The bytes used by each column of each table and by each whole table under "Total".
+        """
+        return {
+            "electrodes": memory_report(self.electrodes),
+            "channels": memory_report(self.channels),
+            "events": memory_report(self.events),
+        }
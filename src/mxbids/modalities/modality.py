@@ -22,7 +22,7 @@ from typing import ClassVar, Any
 # Third-Party Packages #
 
 # Local Packages #
-from ..base import BaseBIDSDirectory, BaseImporter, BaseExporter
+from ..base import BaseBIDSDirectory, BaseImporter, BaseExporter, format_bids_name, strip_entity_key
 
 
 # Definitions #
@@ -95,10 +95,10 @@ class Modality(BaseBIDSDirectory):
         else:
             raise ValueError("Either path or (parent_path and name) must be given to dispatch class.")
 
-        subject_name = path.parts[-3][4:]
-        session_name = path.parts[-2][4:]
+        subject_name = strip_entity_key(path.parts[-3], "sub")
+        session_name = strip_entity_key(path.parts[-2], "ses")
 
-        return path / f"sub-{subject_name}_ses-{session_name}_{name}_meta.json"
+        return path / f"{format_bids_name({'sub': subject_name, 'ses': session_name})}_{name}_meta.json"
 
     # Attributes #
     subject_name: str | None = None
@@ -116,7 +116,7 @@ class Modality(BaseBIDSDirectory):
     @property
     def full_name(self) -> str:
         """The full name of this Modality."""
-        return f"sub-{self.subject_name}_ses-{self.session_name}"
+        return format_bids_name({"sub": self.subject_name, "ses": self.session_name})
 
     @property
     def meta_information_path(self) -> Path | None:
@@ -198,8 +198,8 @@ class Modality(BaseBIDSDirectory):
             self.path = (parent_path if isinstance(parent_path, Path) else Path(parent_path)) / self.directory_name
 
         if self.path is not None:
-            self.subject_name = self.path.parts[-3][4:]
-            self.session_name = self.path.parts[-2][4:]
+            self.subject_name = strip_entity_key(self.path.parts[-3], "sub")
+            self.session_name = strip_entity_key(self.path.parts[-2], "ses")
 
         # Create or Load
         if self.path is not None:
@@ -210,4 +210,41 @@ class Modality(BaseBIDSDirectory):
                 self.load()
 
         # Construct Parent #
-        super().construct(**kwargs)
\ No newline at end of file
+        super().construct(**kwargs)
+
+    # Sidecar Metadata
+    def resolve_metadata(self, path: Path | str) -> dict[str, Any]:
+        """Resolves the metadata a file in this modality inherits from the sidecars in the dataset.
+
+        Args:
+            path: The path to the file.
+
+        Returns:
+            The merged metadata of the file.
+        """
+        return self.get_metadata_resolver().resolve(path, root=self.path.parents[2])
+
+    # Time Data
+    def get_time_coverage(self, refresh: bool = False) -> tuple[int, int] | None:
+        """Gets the time range this modality has data for.
+
+        Args:
+            refresh: Determines if any cached coverage will be ignored and recomputed.
+
+        Returns:
+            The start and stop of the data as nanostamps, or None if this modality does not contain time data.
+        """
+        return None
+
+    def find_data(self, start: Any = None, stop: Any = None, **kwargs: Any) -> Any:
+        """Finds the data of this modality within a time range.
+
+        Args:
+            start: The start of the range, None for no lower bound.
+            stop: The stop of the range, None for no upper bound.
+            **kwargs: The keyword arguments for finding the data.
+
+        Returns:
+            The data within the time range, None if this modality does not contain time data.
+        """
+        return None
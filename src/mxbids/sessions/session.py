@@ -23,7 +23,7 @@ from typing import ClassVar, Any
 from baseobjects.objects import ClassNamespaceRegister
 
 # Local Packages #
-from ..base import BaseBIDSDirectory, BaseImporter, BaseExporter
+from ..base import BaseBIDSDirectory, format_bids_name, strip_entity_key, BaseImporter, BaseExporter, NodeMap
 from ..modalities import Modality
 
 
@@ -45,7 +45,7 @@ class Session(BaseBIDSDirectory):
         subject_name: The name of the subject associated with this session.
         importers: Mapping of importers.
         exporters: Mapping of exporters.
-        modalities: Dictionary of modalities.
+        modalities: Map of the modalities, which evicts and reloads modalities when it has a node cache.
 
     Args:
         path: The path to the session's directory.
@@ -97,15 +97,15 @@ class Session(BaseBIDSDirectory):
                 path = Path(path)
 
             if name is None:
-                name = path.stem[4:]
+                name = strip_entity_key(path.name, "ses")
         elif parent_path is not None and name is not None:
             path = (parent_path if isinstance(parent_path, Path) else Path(parent_path)) / f"ses-{name}"
         else:
             raise ValueError("Either path or (parent_path and name) must be given to dispatch class.")
 
-        parent_name = path.parts[-2][4:]
+        parent_name = strip_entity_key(path.parts[-2], "sub")
 
-        return path / f"sub-{parent_name}_ses-{name}_meta.json"
+        return path / format_bids_name({"sub": parent_name, "ses": name}, "meta", ".json")
 
     # Attributes #
     component_types_register: ClassNamespaceRegister = ClassNamespaceRegister()
@@ -115,18 +115,23 @@ class Session(BaseBIDSDirectory):
     importers: MutableMapping[str, tuple[type[BaseImporter], dict[str, Any]]] = ChainMap()
     exporters: MutableMapping[str, tuple[type[BaseExporter], dict[str, Any]]] = ChainMap()
 
-    modalities: dict[str, Any] = {}
+    modalities: NodeMap
 
     # Properties #
+    @property
+    def child_nodes(self) -> NodeMap:
+        """The map of the modalities of this Session."""
+        return self.modalities
+
     @property
     def directory_name(self) -> str:
         """The directory name of this Session."""
-        return f"ses-{self.name}"
+        return format_bids_name({"ses": self.name})
 
     @property
     def full_name(self) -> str:
         """The full name of this Session."""
-        return f"sub-{self.subject_name}_ses-{self.name}"
+        return format_bids_name({"sub": self.subject_name, "ses": self.name})
 
     # Magic Methods #
     # Construction/Destruction
@@ -145,7 +150,7 @@ class Session(BaseBIDSDirectory):
         **kwargs: Any,
     ) -> None:
         # New Attributes #
-        self.modalities = {}
+        self.modalities = NodeMap()
 
         # Parent Attributes #
         super().__init__(init=False)
@@ -203,12 +208,12 @@ class Session(BaseBIDSDirectory):
     
         if self.path is not None:
             if name is None:
-                self.name = self.path.stem[4:]
+                self.name = strip_entity_key(self.path.name, "ses")
         elif parent_path is not None and self.name is not None:
             self.path = (parent_path if isinstance(parent_path, Path) else Path(parent_path)) / self.directory_name
     
         if self.path is not None:
-            self.subject_name = self.path.parts[-2][4:]
+            self.subject_name = strip_entity_key(self.path.parts[-2], "sub")
     
         # Load
         if self.path is not None and self.path.exists():
@@ -246,6 +251,13 @@ class Session(BaseBIDSDirectory):
         """
         super().load()
         self.load_modalities(names, mode, load)
+
+    def unload(self) -> None:
+        """Releases the loaded modalities of this session and their contents."""
+        for modality in self.modalities.loaded_values():
+            modality.unload()
+        self.modalities.clear()
+        super().unload()
     
     # Modalities
     def construct_modalities(self) -> None:
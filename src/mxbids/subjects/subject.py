@@ -16,6 +16,7 @@ __email__ = __email__
 from collections.abc import Iterable, MutableMapping
 from collections import ChainMap
 from copy import deepcopy
+import os
 from pathlib import Path
 from typing import ClassVar, Any
 
@@ -23,7 +24,17 @@ from typing import ClassVar, Any
 from baseobjects.objects import ClassNamespaceRegister
 
 # Local Packages #
-from ..base import BaseBIDSDirectory, BaseImporter, BaseExporter
+from ..base import (
+    BaseBIDSDirectory,
+    format_bids_name,
+    strip_entity_key,
+    BaseImporter,
+    BaseExporter,
+    NodeMap,
+    TimeDataSlice,
+    TimeIntervalIndex,
+)
+from ..modalities import Modality
 from ..sessions import Session
 
 
@@ -45,7 +56,9 @@ class Subject(BaseBIDSDirectory):
         session_digits: Number of digits in session names.
         importers: Mapping of importers.
         exporters: Mapping of exporters.
-        sessions: Dictionary of sessions.
+        sessions: Map of the sessions, which evicts and reloads sessions when it has a node cache.
+        _time_index: The cached interval index of the time coverage of the modalities in the sessions.
+        _time_index_key: The stamp of the session and modality directories the time index was built from.
 
     Args:
         path: The path to the subject's directory.
@@ -96,13 +109,13 @@ class Subject(BaseBIDSDirectory):
                 path = Path(path)
 
             if name is None:
-                name = path.stem[4:]
+                name = strip_entity_key(path.name, "sub")
         elif parent_path is not None and name is not None:
             path = (parent_path if isinstance(parent_path, Path) else Path(parent_path)) / f"sub-{name}"
         else:
             raise ValueError("Either path or (parent_path and name) must be given to dispatch class.")
 
-        return path / f"sub-{name}_meta.json"
+        return path / format_bids_name({"sub": name}, "meta", ".json")
 
     # Attributes #
     component_types_register: ClassNamespaceRegister = ClassNamespaceRegister()
@@ -113,18 +126,26 @@ class Subject(BaseBIDSDirectory):
     importers: MutableMapping[str, tuple[type[BaseImporter], dict[str, Any]]] = ChainMap()
     exporters: MutableMapping[str, tuple[type[BaseExporter], dict[str, Any]]] = ChainMap()
 
-    sessions: dict[str, Session]
+    sessions: NodeMap
+
+    _time_index: TimeIntervalIndex | None = None
+    _time_index_key: frozenset[tuple[str, str, tuple[tuple[str, int, int], ...]]] = frozenset()
 
     # Properties #
+    @property
+    def child_nodes(self) -> NodeMap:
+        """The map of the sessions of this Subject."""
+        return self.sessions
+
     @property
     def directory_name(self) -> str:
         """The directory name of this Subject."""
-        return f"sub-{self.name}"
+        return format_bids_name({"sub": self.name})
 
     @property
     def full_name(self) -> str:
         """The full name of this Subject."""
-        return f"sub-{self.name}"
+        return format_bids_name({"sub": self.name})
 
     # Magic Methods #
     # Construction/Destruction
@@ -143,7 +164,7 @@ class Subject(BaseBIDSDirectory):
         **kwargs: Any,
     ) -> None:
         # New Attributes #
-        self.sessions: dict[str, Session] = {}
+        self.sessions: NodeMap = NodeMap()
 
         # Parent Attributes #
         super().__init__(init=False)
@@ -201,7 +222,7 @@ class Subject(BaseBIDSDirectory):
 
         if self.path is not None:
             if name is None:
-                self.name = self.path.stem[4:]
+                self.name = strip_entity_key(self.path.name, "sub")
         elif parent_path is not None and self.name is not None:
             self.path = (parent_path if isinstance(parent_path, Path) else Path(parent_path)) / self.directory_name
 
@@ -226,13 +247,29 @@ class Subject(BaseBIDSDirectory):
         super().load()
         self.load_sessions(names, mode, load)
 
+    def unload(self) -> None:
+        """Releases the loaded sessions of this subject and their contents."""
+        for session in self.sessions.loaded_values():
+            session.unload()
+        self.sessions.clear()
+        super().unload()
+
     # Session
-    def generate_latest_session_name(self, prefix: str | None = None, digits: int | None = None) -> str:
+    def generate_latest_session_name(
+        self,
+        prefix: str | None = None,
+        digits: int | None = None,
+        reserve: bool | None = None,
+    ) -> str:
         """Generates a session name for a new latest session.
 
+        The name is allocated from the ID counter persisted in the meta information, so the sessions do not need to be
+        loaded and concurrent workers receive different names.
+
         Args:
             prefix: Prefix for the session name.
             digits: Number of digits for the session name.
+            reserve: Determines if the name is reserved. Defaults to reserving it unless the subject is read only.
 
         Returns:
             The name of the latest session to create.
@@ -241,7 +278,7 @@ class Subject(BaseBIDSDirectory):
             prefix = self.session_prefix
         if digits is None:
             digits = self.session_digits
-        return f"{prefix}{len(self.sessions):0{digits}d}"
+        return self.allocate_child_name("ses-", prefix, digits, len(self.sessions), reserve)
 
     def create_session(
         self,
@@ -301,4 +338,120 @@ class Subject(BaseBIDSDirectory):
 
         # Use an iterator to load sessions
         self.sessions.update((s.name, s) for p in paths if (s := Session(path=p, mode=mode, load=load)) is not None)
-    
\ No newline at end of file
+    
+
+    # Time Data
+    @staticmethod
+    def list_directories(path: Path) -> list[Path]:
+        """Lists the visible directories in a directory.
+
+        Args:
+            path: The path to the directory.
+
+        Returns:
+            The paths of the directories in sorted order, empty if the directory does not exist.
+        """
+        try:
+            with os.scandir(path) as entries:
+                return sorted(Path(e.path) for e in entries if e.name[0] != "." and e.is_dir())
+        except FileNotFoundError:
+            return []
+
+    @staticmethod
+    def stamp_files(path: Path) -> tuple[tuple[str, int, int], ...]:
+        """Creates a stamp of the names, sizes, and modification times of the files in a directory.
+
+        Args:
+            path: The path to the directory.
+
+        Returns:
+            The stamp of the files in sorted order.
+        """
+        with os.scandir(path) as entries:
+            stats = ((e.name, e.stat()) for e in entries if e.is_file())
+            return tuple(sorted((name, stat.st_size, stat.st_mtime_ns) for name, stat in stats))
+
+    def scan_time_directories(self) -> dict[Path, dict[Path, tuple[tuple[str, int, int], ...]]]:
+        """Scans the session and modality directories of this subject on disk without loading any nodes.
+
+        Returns:
+            The stamp of the files in each modality directory keyed by its session and modality directories.
+        """
+        return {s: {m: self.stamp_files(m) for m in self.list_directories(s)} for s in self.list_directories(self.path)}
+
+    def build_time_index(self, refresh: bool = False) -> TimeIntervalIndex:
+        """Builds an interval index of the time coverage of the modalities in the sessions of this subject.
+
+        The session and modality directories on disk are indexed, loading the nodes which are not loaded, but the
+        coverage of a modality is cached in its meta information, so the data files are only opened when they changed.
+
+        Args:
+            refresh: Determines if the cached coverage of each modality will be ignored and recomputed.
+
+        Returns:
+            The time index.
+        """
+        scan = self.scan_time_directories()
+        index = TimeIntervalIndex()
+        for session_path, modality_stamps in scan.items():
+            if (name := strip_entity_key(session_path.name, "ses")) not in self.sessions:
+                self.sessions[name] = Session(path=session_path, mode=self._mode, load=False)
+            session = self.sessions[name]
+            for modality_path in modality_stamps:
+                if modality_path.name not in session.modalities:
+                    modality = Modality(path=modality_path, mode=session._mode, load=True)
+                    session.modalities[modality_path.name] = modality
+                modality = session.modalities[modality_path.name]
+                if (coverage := modality.get_time_coverage(refresh=refresh)) is not None:
+                    index.add(coverage[0], coverage[1], name=session.name, bids_object=modality)
+
+        self._time_index = index
+        self._time_index_key = self.get_time_index_key(scan)
+        return index
+
+    def get_time_index_key(
+        self,
+        scan: dict[Path, dict[Path, tuple[tuple[str, int, int], ...]]] | None = None,
+    ) -> frozenset[tuple[str, str, tuple[tuple[str, int, int], ...]]]:
+        """Gets a stamp of the session and modality directories on disk, which changes whenever their data may change.
+
+        Args:
+            scan: The scanned session and modality directories, None to scan them.
+
+        Returns:
+            The session directory, modality directory, and stamp of the files of each modality.
+        """
+        if scan is None:
+            scan = self.scan_time_directories()
+        return frozenset((s.name, m.name, stamp) for s, stamps in scan.items() for m, stamp in stamps.items())
+
+    def get_time_index(self, refresh: bool = False) -> TimeIntervalIndex:
+        """Gets the interval index of the time coverage of the sessions, building it if it is missing or outdated.
+
+        The index is outdated when a session or modality directory was added or removed, or when a file in a modality
+        directory, such as the contents file of its data, was written.
+
+        Args:
+            refresh: Determines if the index will be rebuilt from recomputed coverage.
+
+        Returns:
+            The time index.
+        """
+        if refresh or self._time_index is None or self._time_index_key != self.get_time_index_key():
+            self.build_time_index(refresh=refresh)
+        return self._time_index
+
+    def find_data(self, start: Any = None, stop: Any = None, refresh: bool = False) -> list[TimeDataSlice]:
+        """Finds the data within a time range across the sessions of this subject without reading it.
+
+        Only the data files which overlap the range are opened, and only when the returned slices are read.
+
+        Args:
+            start: The start of the range, None for no lower bound.
+            stop: The stop of the range, None for no upper bound.
+            refresh: Determines if the time index will be rebuilt from recomputed coverage.
+
+        Returns:
+            The slices of the data in each overlapping modality, in order of their start.
+        """
+        return self.get_time_index(refresh=refresh).find(start, stop)
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+""" test_memory.py
+Memory benchmarks for mxbids nodes.
+"""
+# Package Header #
+from mxbids.header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+import gc
+import tracemalloc
+
+# Third-Party Packages #
+import pytest
+
+# Local Packages #
+from mxbids.base import RegistryView
+from mxbids.modalities import IEEG
+from mxbids.sessions import Session
+from mxbids.exporters import *
+
+
+# Definitions #
+# Functions #
+def bytes_per_node(factory, n=2000):
+    """Measures the average number of bytes allocated per node created by a factory."""
+    gc.collect()
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    nodes = [factory() for _ in range(n)]
+    stop, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del nodes
+    return (stop - start) / n
+
+
+def registry_views(class_):
+    """Creates the registry views a node builds for itself on construction."""
+    return RegistryView(class_.importers), RegistryView(class_.exporters)
+
+
+def registry_copies(class_):
+    """Creates the plain copies of the registries which the original implementation kept for each node."""
+    copies = [dict(class_.importers), dict(class_.exporters)]
+    if class_ is IEEG:
+        copies += [list(class_.electrode_columns), list(class_.channel_columns), list(class_.event_columns)]
+    return tuple(copies)
+
+
+# Classes #
+class TestNodeMemory:
+    """Benchmarks the memory used per node."""
+
+    @pytest.mark.parametrize("class_", [Session, IEEG])
+    def test_bytes_per_node(self, class_, record_property):
+        after = bytes_per_node(class_)
+        views = bytes_per_node(lambda: registry_views(class_))
+        copies = bytes_per_node(lambda: registry_copies(class_))
+        before = after - views + copies
+        record_property(f"{class_.__name__}_bytes_per_node_before", round(before))
+        record_property(f"{class_.__name__}_bytes_per_node_after", round(after))
+        assert after < before
+
+
+# Main #
+if __name__ == "__main__":
+    pytest.main(["-v", "-s"])
@@ -20,10 +20,13 @@ import pathlib
 
 # Third-Party Packages #
 import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 # Local Packages #
 from mxbids import Dataset
-from mxbids.cdfsbids import CDFSSession
+from mxbids.cdfsbids import CDFSSession, CDFSPool, SQLiteContentsFile
 
 
 # Definitions #
@@ -35,6 +38,17 @@ def tmp_dir(tmpdir):
 
 
 # Classes #
+class ContentsSchema(DeclarativeBase):
+    """A minimal schema for testing contents files."""
+
+
+class Entry(ContentsSchema):
+    """A minimal table for testing contents files."""
+
+    __tablename__ = "entries"
+    id: Mapped[int] = mapped_column(primary_key=True)
+
+
 class TestDataset:
     """Test the BaseObject class which a subclass is created to test with."""
 
@@ -58,6 +72,78 @@ class TestDataset:
         assert modality.path.exists()
 
 
+class TestCDFSPool:
+    """Test the pool which bounds the number of open CDFS handles."""
+
+    class Handle:
+        """A stand-in for a component which only records if it was closed."""
+
+        def __init__(self, pool):
+            self.pool = pool
+            self.closed = False
+
+        def close_cdfs(self):
+            self.pool.discard(self)
+            self.closed = True
+
+    def test_evicts_least_recently_used(self):
+        pool = CDFSPool(maxsize=2)
+        first, second, third = (self.Handle(pool) for _ in range(3))
+        pool.touch(first)
+        pool.touch(second)
+        pool.touch(first)
+        pool.touch(third)
+        assert second.closed
+        assert not first.closed and not third.closed
+        assert len(pool) == 2
+
+    def test_pinned_handles_are_not_evicted(self):
+        pool = CDFSPool(maxsize=1)
+        first, second = self.Handle(pool), self.Handle(pool)
+        with pool.pinned(first):
+            pool.touch(first)
+            pool.touch(second)
+            assert not first.closed and second.closed and len(pool) == 1
+        second.closed = False
+        pool.touch(second)
+        assert first.closed and not second.closed
+
+    def test_close_all(self):
+        pool = CDFSPool()
+        handles = [self.Handle(pool) for _ in range(3)]
+        for handle in handles:
+            pool.touch(handle)
+        pool.close_all()
+        assert all(h.closed for h in handles)
+        assert len(pool) == 0
+
+
+class TestSQLiteContentsFile:
+    """Test the contents file which shares tuned and pooled SQLite engines."""
+
+    def test_shared_read_only_engines(self, tmp_dir):
+        path = tmp_dir / "contents.sqlite3"
+        writer = SQLiteContentsFile(path=path, schema=ContentsSchema, open_=True, create=True)
+        with writer.create_session() as session:
+            session.add(Entry(id=1))
+            session.commit()
+
+        first = SQLiteContentsFile(path=path, schema=ContentsSchema, open_=True, read_only=True)
+        second = SQLiteContentsFile(path=path, schema=ContentsSchema, open_=True, read_only=True)
+        assert first._engine is second._engine
+        assert first._engine is not writer._engine
+
+        with first.create_session() as session:
+            assert [e.id for e in session.execute(select(Entry)).scalars()] == [1]
+            session.add(Entry(id=2))
+            with pytest.raises(OperationalError):
+                session.commit()
+
+        for contents_file in (first, second, writer):
+            contents_file.close()
+        assert not SQLiteContentsFile._engines
+
+
 # Main #
 if __name__ == "__main__":
     pytest.main(["-v", "-s"])
@@ -16,13 +16,48 @@ __email__ = __email__
 # Imports #
 # Standard Libraries #
 import abc
+from concurrent.futures import ThreadPoolExecutor
+import io
+import json
+import math
+import operator
+import time
+import os
 import pathlib
+import shutil
+import tarfile
+import zipfile
 
 # Third-Party Packages #
+import numpy as np
+import pandas as pd
 import pytest
 
 # Local Packages #
+from mxbids.base import (
+    CallbackProgressReporter,
+    ConsoleProgressReporter,
+    JSONLinesProgressReporter,
+    ProgressTracker,
+    ArchiveSink,
+    ArchiveSource,
+    BulkCopier,
+    FileIndex,
+    ImportFileMap,
+    ImportJournal,
+    MetadataResolver,
+    MetaSerializer,
+    NodeCache,
+    SourceIndex,
+    TimeIntervalIndex,
+    format_bids_name,
+    parse_bids_name,
+    to_nanostamp,
+)
 from mxbids.datasets import Dataset
+from mxbids.exporters import IEEGBIDSExporter
+from mxbids.importers import DatasetBIDSImporter, ModalityImporter, python_copy
+from mxbids.modalities import IEEG, Modality
 
 
 # Definitions #
@@ -34,6 +69,19 @@ def tmp_dir(tmpdir):
 
 
 # Classes #
+class TimedModality(Modality):
+    """A modality with a fixed time coverage for testing time queries."""
+
+    class_registration = False
+    coverage = None
+
+    def get_time_coverage(self, refresh=False):
+        return self.coverage
+
+    def find_data(self, start=None, stop=None, **kwargs):
+        return self.name, start, stop
+
+
 class ClassTest(abc.ABC):
     """Default class tests that all classes should pass."""
 
@@ -70,6 +118,47 @@ class TestDataset(ClassTest):
         session = subject.create_session()
         assert session.path.exists()
 
+    def test_allocate_names(self, tmp_dir):
+        dataset = self.create_dataset(tmp_dir)
+        dataset.create_subject()
+        dataset.create_subject("S0005")
+
+        unloaded = self.class_(path=dataset.path, mode="w", load=False)
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            names = list(executor.map(lambda _: unloaded.create_subject().name, range(4)))
+
+        assert sorted(names) == ["S0001", "S0002", "S0003", "S0004"]
+        assert self.class_(path=dataset.path, mode="r").generate_latest_subject_name() == "S0006"
+
+    def test_merge_participants(self, tmp_dir):
+        dataset = self.create_dataset(tmp_dir)
+        dataset.create_participants()
+        dataset.participants_path.chmod(0o664)
+        workers = [self.class_(path=dataset.path, mode="w") for _ in range(4)]
+        for i, worker in enumerate(workers):
+            worker.participants = pd.DataFrame({"participant_id": [f"sub-{i:02d}", "sub-99"], "age": [i, i]})
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(lambda w: w.save_participants(), workers))
+
+        dataset.load_participants()
+        assert sorted(dataset.participants["participant_id"]) == ["sub-00", "sub-01", "sub-02", "sub-03", "sub-99"]
+        assert not list(dataset.path.glob(".*.tmp")) and dataset.participants_path.stat().st_mode & 0o777 == 0o664
+
+    def test_binary_meta_information(self, tmp_dir, monkeypatch):
+        dataset = self.create_dataset(tmp_dir)
+        monkeypatch.setattr(MetaSerializer, "default", MetaSerializer(binary=True))
+        dataset.create_subject("01").create_session("01")
+        dataset.save_meta_information()
+
+        assert dataset.meta_information_path.read_bytes().startswith(MetaSerializer.magic)
+        loaded = self.class_(path=dataset.path, mode="r", load=True)
+        assert loaded.meta_information["Type"] == "Dataset" and "01" in loaded.subjects["01"].sessions
+        assert MetaSerializer(use_orjson=False).load(dataset.meta_information_path) == loaded.meta_information
+        assert MetaSerializer().loads(json.dumps({"Limit": float("inf")}).encode()) == {"Limit": float("inf")}
+        assert MetaSerializer().loads(MetaSerializer().dumps({1: "a"})) == {"1": "a"}
+        assert MetaSerializer().loads(MetaSerializer().dumps({"Range": [0.0, float("inf")]})) == {"Range": [0, math.inf]}
+
     def test_create_modality(self, tmp_dir):
         dataset = self.create_dataset(tmp_dir)
         subject = dataset.create_subject()
@@ -77,6 +166,482 @@ class TestDataset(ClassTest):
         modality = session.create_modality("test_modality")
         assert modality.path.exists()
 
+    def test_find_data(self, tmp_dir):
+        dataset = self.create_dataset(tmp_dir)
+        subject = dataset.create_subject()
+        for start, stop in ((0, 100), (200, 300), (250, 400)):
+            session = subject.create_session()
+            modality = session.create_modality("timed", TimedModality)
+            modality.coverage = (start, stop)
+
+        slices = subject.find_data(50, 260)
+        expected = [("S0000", 50, 100), ("S0001", 200, 260), ("S0002", 250, 260)]
+        assert [(s.name, s.start, s.stop) for s in slices] == expected
+        assert slices[0].read() == ("timed", 50, 100)
+        assert subject.find_data(100, 200) == []
+        assert list(dataset.find_data(350, 500)) == [subject.name]
+
+        modality.coverage = (250, 600)
+        (modality.path / "data.bin").write_bytes(b"0")
+        assert [s.stop for s in subject.find_data(500, 700)] == [600]
+        other = self.class_(path=dataset.path, mode="a", load=True).subjects[subject.name]
+        other.create_session().create_modality("ieeg", IEEG)
+        assert subject.find_data(500, 700)[0].stop == 600 and "S0003" in subject.sessions
+        assert to_nanostamp(np.float32(2.0)) == to_nanostamp(2.0) == 2_000_000_000
+        assert to_nanostamp(np.datetime64("1970-01-01T00:00:01")) == to_nanostamp(np.int64(1_000_000_000))
+
+    def test_validate(self, tmp_dir):
+        dataset = self.create_dataset(tmp_dir)
+        modality = dataset.create_subject("01").create_session("01").create_modality("ieeg", IEEG)
+        report = dataset.validate(workers=2)
+        assert report.is_valid and report.checked == 4 and report.cached == 0
+
+        modality.channels_path.write_text("name\ttype\n")
+        report = Dataset(path=dataset.path).validate(workers=2)
+        assert [i.code for i in report.errors] == ["missing_columns"]
+        assert report.cached == 3
+
+        cache_path = dataset.path / dataset.validation_cache_name
+        cache = json.loads(cache_path.read_text())
+        cache[""]["class"] = ["mxbids.datasets.dataset", "/old/site-packages/mxbids/datasets/dataset.py"]
+        cache_path.write_text(json.dumps(cache))
+        assert Dataset(path=dataset.path).validate().cached == 3
+
+    def test_manifest(self, tmp_dir):
+        dataset = self.create_dataset(tmp_dir)
+        modality = dataset.create_subject("01").create_session("01").create_modality("ieeg", IEEG)
+        data = modality.path / "sub-01_ses-01_ieeg.edf"
+        data.write_bytes(b"0" * 1000)
+        with pytest.raises(FileNotFoundError):
+            dataset.verify_manifest()
+        assert dataset.compute_manifest(workers=2) == 7
+        assert dataset.compute_manifest(workers=2) == 0
+        assert dataset.verify_manifest().is_intact
+
+        stat = data.stat()
+        data.write_bytes(b"1" * 1000)
+        os.utime(data, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        assert dataset.verify_manifest().is_intact
+        report = dataset.verify_manifest(workers=2, full=True)
+        assert report.modified == ["sub-01/ses-01/ieeg/sub-01_ses-01_ieeg.edf"] and report.hashed == 7
+
+    def test_table_dtypes(self, tmp_dir):
+        dataset = self.create_dataset(tmp_dir)
+        modality = dataset.create_subject("01").create_session("01").create_modality("ieeg", IEEG)
+        rows = [f"C{i}\tSEEG\tuV\t0.5\tn/a" for i in range(200)]
+        modality.channels_path.write_text("\n".join(["name\ttype\tunits\tlow_cutoff\thigh_cutoff", *rows]))
+
+        channels = modality.load_channels()
+        assert isinstance(channels["type"].dtype, pd.CategoricalDtype) and channels["low_cutoff"].dtype == "float32"
+        inferred = pd.read_csv(modality.channels_path, sep="\t")
+        assert modality.get_memory_report()["channels"]["Total"] < inferred.memory_usage(deep=True).sum()
+
+        modality.save_channels()
+        assert modality.load_channels()["units"].tolist() == ["uV"] * 200
+
+    def test_table_cache(self, tmp_dir):
+        dataset = self.create_dataset(tmp_dir)
+        modality = dataset.create_subject("01").create_session("01").create_modality("ieeg", IEEG)
+        modality.channels_path.write_text("name\ttype\nC1\tSEEG\nC2\tECOG")
+        cache = dataset.table_cache
+        cache.clear()
+
+        first = modality.load_channels()
+        first.loc[0, "name"] = "changed"
+        assert modality.load_channels()["name"].tolist() == ["C1", "C2"]
+        assert (cache.hits, cache.misses) == (1, 1)
+
+        modality.channels_path.write_text("name\ttype\nC3\tSEEG")
+        assert modality.load_channels()["name"].tolist() == ["C3"]
+        assert (cache.hits, cache.misses) == (1, 2) and len(cache) == 1
+        modality.load_table(modality.channels_path, {"name": "str"})
+        assert cache.misses == 3 and len(cache) == 2
+
+        modality.save_channels()
+        assert len(cache) == 0
+
+    def test_walk(self, tmp_dir):
+        dataset = self.create_dataset(tmp_dir)
+        for subject_name in ("01", "02"):
+            subject = dataset.create_subject(subject_name)
+            for session_name in ("01", "02"):
+                subject.create_session(session_name).create_modality("ieeg", IEEG)
+        dataset = Dataset(path=dataset.path, mode="r", load=False)
+
+        walked = []
+        for session in dataset.walk(filter=lambda s: s.name != "02" or s.subject_name != "02", prefetch=2):
+            walked.append((session.subject_name, session.name, isinstance(session.modalities["ieeg"], IEEG)))
+            if walked[1:]:
+                assert not previous.modalities
+            previous = session
+        assert walked == [("01", "01", True), ("01", "02", True), ("02", "01", True)]
+        assert not dataset.subjects
+
+        modalities = dataset.walk(level="modality", index=True)
+        assert next(modalities).path == dataset.path / "sub-01" / "ses-01" / "ieeg"
+        modalities.close()
+        assert [s.name for s in dataset.walk(level="subject")] == ["01", "02"]
+
+    def test_node_cache(self, tmp_dir):
+        dataset = self.create_dataset(tmp_dir)
+        for subject_name in ("01", "02", "03"):
+            modality = dataset.create_subject(subject_name).create_session("01").create_modality("ieeg", IEEG)
+            modality.channels_path.write_text("name\ttype\nC1\tSEEG")
+        dataset = Dataset(path=dataset.path, mode="r", load=True, node_cache=NodeCache(max_nodes=4))
+        assert len(dataset.node_cache) <= 4 and len(dataset.subjects) == 3
+
+        subject = dataset.subjects["01"]
+        first = subject.sessions["01"].modalities["ieeg"]
+        first.load_channels()
+        for subject_name in ("02", "03"):
+            dataset.subjects[subject_name].sessions["01"].modalities["ieeg"].load_channels()
+        assert dataset.node_cache.evictions > 0 and list(subject.sessions) == ["01"] and first.channels is not None
+
+        reloaded = dataset.subjects["01"].sessions["01"].modalities["ieeg"]
+        assert reloaded is not first and isinstance(reloaded, IEEG)
+        assert reloaded.load_channels()["name"].tolist() == ["C1"] and len(dataset.node_cache) <= 4
+
+        writable = Dataset(path=tmp_dir / "writable", mode="a", create=True, node_cache=NodeCache(max_nodes=2))
+        subjects = [writable.create_subject(create=False) for _ in range(3)]
+        assert all(writable.subjects[s.name] is s for s in subjects) and writable.node_cache.evictions == 0
+
+    def test_map_sessions(self, tmp_dir):
+        dataset = self.create_dataset(tmp_dir)
+        for subject_name in ("01", "02"):
+            subject = dataset.create_subject(subject_name)
+            for session_name in ("01", "02"):
+                subject.create_session(session_name).create_modality("ieeg", IEEG)
+        dataset = Dataset(path=dataset.path, mode="r", load=False)
+
+        results = list(dataset.map_sessions(operator.attrgetter("full_name"), workers=2, chunksize=3))
+        assert sorted(r.value for r in results) == ["sub-01_ses-01", "sub-01_ses-02", "sub-02_ses-01", "sub-02_ses-02"]
+        assert all(r.ok for r in results) and not dataset.subjects
+
+        attempts = {}
+
+        def flaky(session):
+            attempts[session.full_name] = attempts.get(session.full_name, 0) + 1
+            if session.name == "02" and attempts[session.full_name] < 3:
+                raise RuntimeError("flaky")
+            return sorted(session.modalities)
+
+        results = {r.handle.path: r for r in dataset.map_sessions(flaky, backend="thread", retries=1)}
+        assert len(results) == 4 and results[dataset.path / "sub-02/ses-01"].value == ["ieeg"]
+        assert all(isinstance(results[dataset.path / f"sub-{s}/ses-02"].error, RuntimeError) for s in ("01", "02"))
+        attempts.clear()
+        assert max(r.attempts for r in dataset.map_sessions(flaky, backend="thread", retries=2)) == 3
+
+    def test_query(self, tmp_dir):
+        dataset = self.create_dataset(tmp_dir)
+        session = dataset.create_subject("01").create_session("01")
+        modality = session.create_modality("ieeg", IEEG)
+        for task in ("rest", "motor"):
+            (modality.path / f"sub-01_ses-01_task-{task}_channels.tsv").touch()
+
+        reader = self.class_(path=dataset.path, mode="r")
+        reader.load_subjects(load=False)
+        assert [n.name for _, n in reader.query(task="rest", nodes=True)] == ["ieeg"]
+        assert not dataset.file_index_path.exists()
+
+        entries = dataset.query(suffix="channels", extension=".tsv", task="rest", nodes=True)
+        assert [(e.path.name, n) for e, n in entries] == [("sub-01_ses-01_task-rest_channels.tsv", modality)]
+
+        (modality.path / "sub-01_ses-01_task-sleep_channels.tsv").touch()
+        assert len(dataset.query(suffix="channels")) == 2
+        assert len(dataset.query(suffix="channels", refresh=True)) == 3
+        assert dataset.query(subject="01", task=lambda t: t and t > "r")[-1].entities["task"] == "sleep"
+        assert len(FileIndex(root=dataset.path, path=dataset.file_index_path).query(suffix="channels")) == 3
+
+
+class TestBIDSName:
+    """Test parsing, formatting, and selecting files by BIDS names."""
+
+    def test_round_trip(self):
+        name = "sub-01_ses-02_task-rest_run-1_ieeg.nii.gz"
+        parsed = parse_bids_name(name)
+        assert dict(parsed.entities) == {"sub": "01", "ses": "02", "task": "rest", "run": "1"}
+        assert (parsed.suffix, parsed.extension) == ("ieeg", ".nii.gz")
+        assert parse_bids_name(name) is parsed
+        assert format_bids_name(parsed.entities, parsed.suffix, parsed.extension) == name
+
+    def test_export_by_suffix(self, tmp_dir):
+        dataset = Dataset(path=tmp_dir / "dataset", mode="w", create=True)
+        modality = dataset.create_subject("ieegX").create_session("01").create_modality("ieeg", IEEG)
+        (modality.path / "sub-ieegX_ses-01_scans.tsv").touch()
+
+        export_path = tmp_dir / "export"
+        export_path.mkdir()
+        IEEGBIDSExporter(bids_object=modality).export_files(export_path, name="sub-02_ses-01")
+        assert [p.name for p in export_path.iterdir()] == ["sub-02_ses-01_ieeg.json"]
+
+
+class TestDatasetArchiveExporter:
+    """Test exporting a dataset directly into an archive."""
+
+    @pytest.mark.parametrize("format, volume_size", [("tar.gz", None), ("zip", 512)])
+    def test_export(self, tmp_dir, format, volume_size):
+        dataset = Dataset(path=tmp_dir / "dataset", mode="w", create=True)
+        dataset.create_subject("01").create_session("01").create_modality("ieeg", IEEG)
+        (tmp_dir / "bids").mkdir()
+        (tmp_dir / "archive").mkdir()
+        dataset.create_exporter("BIDS").execute_export(tmp_dir / "bids", name="export")
+        path = dataset.create_exporter("Archive").execute_export(
+            tmp_dir / "archive", name="export", format=format, volume_size=volume_size
+        )
+
+        expected = {p.relative_to(tmp_dir / "bids").as_posix() for p in (tmp_dir / "bids").rglob("*")}
+        if volume_size is not None:
+            volumes = sorted(path.parent.glob(f"{path.name}.*"))
+            assert len(volumes) > 1 and all(v.stat().st_size <= volume_size for v in volumes)
+            path = tmp_dir / "joined"
+            path.write_bytes(b"".join(v.read_bytes() for v in volumes))
+
+        if format == "zip":
+            with zipfile.ZipFile(path) as archive:
+                names = {n.rstrip("/") for n in archive.namelist()}
+        else:
+            with tarfile.open(path) as archive:
+                names = set(archive.getnames())
+        assert names == expected
+
+    def test_duplicate_file(self, tmp_dir):
+        (tmp_dir / "file.txt").write_text("data")
+        sink = ArchiveSink(path=tmp_dir / "archive.tar", root=tmp_dir)
+        sink.open()
+        for _ in range(2):
+            sink.write_file(tmp_dir / "file.txt", tmp_dir / "file.txt")
+        sink.close()
+
+        with tarfile.open(tmp_dir / "archive.tar") as archive:
+            assert archive.getnames() == ["file.txt"]
+
+
+class TestBulkCopier:
+    """Test bandwidth limited, cache friendly copies."""
+
+    def test_copy(self, tmp_dir):
+        data = os.urandom(3 * 1024 * 1024)
+        (tmp_dir / "source.bin").write_bytes(data)
+        copier = BulkCopier(rate=8 * 1024 * 1024, fadvise=True)
+        copier.limiter.burst = 1024 * 1024
+        copier.chunk_size = 256 * 1024
+
+        start = time.perf_counter()
+        copier.copy(tmp_dir / "source.bin", tmp_dir / "target.bin")
+        assert time.perf_counter() - start >= 0.2
+        assert (tmp_dir / "target.bin").read_bytes() == data
+        assert (tmp_dir / "target.bin").stat().st_mtime == (tmp_dir / "source.bin").stat().st_mtime
+
+
+class TestMetadataResolver:
+    """Test resolving inherited sidecar metadata."""
+
+    def test_inheritance(self, tmp_dir):
+        dataset = Dataset(path=tmp_dir / "dataset", mode="w", create=True)
+        modality = dataset.create_subject("01").create_session("01").create_modality("ieeg", IEEG)
+        (dataset.path / "task-rest_ieeg.json").write_text('{"SamplingFrequency": 512, "PowerLineFrequency": 60}')
+        (dataset.path / "task-motor_ieeg.json").write_text('{"SamplingFrequency": 1}')
+        (dataset.path / "ieeg.json").write_text('{"Manufacturer": "X"}')
+        leaf = modality.path / "sub-01_ses-01_task-rest_ieeg.json"
+        leaf.write_text('{"SamplingFrequency": 1024}')
+
+        resolver = MetadataResolver(root=dataset.path)
+        expected = {"Manufacturer": "X", "SamplingFrequency": 1024, "PowerLineFrequency": 60}
+        assert resolver.resolve(modality.path / "sub-01_ses-01_task-rest_ieeg.edf") == expected
+        assert len(resolver._sidecars) == 4
+
+        resolver.resolve(modality.path / "sub-01_ses-01_task-rest_run-2_ieeg.edf")
+        assert len(resolver._sidecars) == 4
+        motor = dataset.resolve_metadata(modality.path / "sub-01_ses-01_task-motor_ieeg.edf")
+        assert motor == {"Manufacturer": "X", "SamplingFrequency": 1}
+        assert modality.inherited_ieeg_metadata == {"Manufacturer": "X"}
+
+
+class TestSourceIndex:
+    """Test resolving importer candidates against a listing of the source tree."""
+
+    def test_resolve(self, tmp_dir):
+        source = tmp_dir / "source"
+        for file in ("a/run-1.edf", "a/run-2.edf", "a/notes.txt", "b/run-1.edf", "b/rec[1].edf"):
+            (source / file).parent.mkdir(parents=True, exist_ok=True)
+            (source / file).write_text(file)
+
+        index = SourceIndex(root=source, workers=2)
+        assert index.scan() == 3
+        assert index.resolve("*/run-1.edf") == ["a/run-1.edf", "b/run-1.edf"]
+        assert index.resolve_paths(source / "a", "run-*.edf") == [source / "a/run-1.edf", source / "a/run-2.edf"]
+        assert index.resolve_paths(source / "a", "../b/run-1.edf") == [source / "b/run-1.edf"]
+        assert index.exists("a/notes.txt") and not index.exists("a/missing.txt")
+        assert index.resolve("b/rec[1].edf") == ["b/rec[1].edf"]
+
+        dataset = Dataset(path=tmp_dir / "dataset", mode="w", create=True)
+        modality = dataset.create_subject("01").create_session("01").create_modality("ieeg", IEEG)
+        file_map = ImportFileMap("ieeg", ".edf", (pathlib.Path("missing.edf"), "run-2*.edf"), python_copy, None, {})
+        ModalityImporter(modality, file_maps=[file_map]).execute_import(source / "a")
+        assert (modality.path / "sub-01_ses-01_ieeg.edf").read_text() == "a/run-2.edf"
+
+
+class TestTimeIntervalIndex:
+    """Test the interval index used for time queries."""
+
+    def test_find_overlapping(self):
+        index = TimeIntervalIndex()
+        index.add(0, 1000, "long")
+        index.add(10, 20, "short")
+        index.add(500, 600, "later")
+        assert [s.name for s in index.find(550, 2000)] == ["long", "later"]
+        assert [s.name for s in index.find(25, 30)] == ["long"]
+        assert index.find(1000, 2000) == []
+
+
+class ImportCrash(BaseException):
+    """An error which stops an import like a crash would."""
+
+
+class CrashingBIDSImporter(DatasetBIDSImporter):
+    """A BIDS importer which records its copies and crashes partway through writing a given file."""
+
+    crash_name = None
+    copied = []
+
+    def copy_file(self, old_path, new_path):
+        if new_path.name == self.crash_name:
+            new_path.write_text("partial")
+            raise ImportCrash()
+        self.copied.append(new_path.name)
+        super().copy_file(old_path, new_path)
+
+
+class TestDatasetBIDSImporter:
+    """Test importing an existing BIDS dataset."""
+
+    def create_source(self, tmp_dir):
+        """Create a small source BIDS dataset with and without session directories."""
+        source = tmp_dir / "source"
+        files = [
+            "dataset_description.json",
+            "participants.tsv",
+            "sub-01/ses-01/sub-01_ses-01_scans.tsv",
+            "sub-01/ses-01/ieeg/sub-01_ses-01_task-rest_ieeg.edf",
+            "sub-01/ses-01/ieeg/sub-01_ses-01_task-rest_ieeg.json",
+            "sub-02/anat/sub-02_T1w.nii.gz",
+            "derivatives/ignored.txt",
+        ]
+        for file in files:
+            (source / file).parent.mkdir(parents=True, exist_ok=True)
+            (source / file).write_text(file)
+        return source
+
+    def test_progress(self, tmp_dir):
+        source = self.create_source(tmp_dir)
+        dataset = Dataset(path=tmp_dir / "imported", mode="w", create=True)
+        events = []
+        console = io.StringIO()
+        reporters = [
+            CallbackProgressReporter(events.append),
+            JSONLinesProgressReporter(tmp_dir / "progress.jsonl"),
+            ConsoleProgressReporter(console),
+        ]
+        with ProgressTracker(reporters) as progress:
+            DatasetBIDSImporter(dataset, workers=2).plan_import(source).execute()
+
+        assert progress.files_done == 5 and progress.files_total == 5
+        assert progress.bytes_done == progress.bytes_total > 0
+        assert events[0].kind == "start" and events[-1].kind == "finish"
+        assert {e.kind for e in events} >= {"node", "file"}
+        assert [e.files_done for e in events if e.kind == "file"] == list(range(1, 6))
+        assert len((tmp_dir / "progress.jsonl").read_text().splitlines()) == len(events)
+        assert "5/5 files" in console.getvalue()
+
+        with ProgressTracker() as progress:
+            dataset.create_exporter("BIDS").execute_export(tmp_dir, name="exported")
+        assert progress.files_done > 0 and progress.files_failed == 0
+
+    @pytest.mark.parametrize(
+        "workers, hardlink, archive", [(1, False, None), (4, True, None), (4, False, "gztar"), (1, True, "zip")]
+    )
+    def test_import(self, tmp_dir, workers, hardlink, archive):
+        source = self.create_source(tmp_dir)
+        recording = source / "sub-01/ses-01/ieeg/sub-01_ses-01_task-rest_ieeg.mefd"
+        recording.mkdir()
+        (recording / "channel.timd").write_text("data")
+        if archive is not None:
+            source = pathlib.Path(shutil.make_archive(str(tmp_dir / "source"), archive, root_dir=source))
+        dataset = Dataset(path=tmp_dir / "imported", mode="w", create=True)
+        DatasetBIDSImporter(dataset, workers=workers, hardlink=hardlink).execute_import(source)
+
+        path = dataset.path
+        ieeg_file = path / "sub-01/ses-01/ieeg/sub-01_ses-01_task-rest_ieeg.json"
+        assert (path / "participants.tsv").read_text() == "participants.tsv"
+        assert (path / "sub-01/ses-01/sub-01_ses-01_scans.tsv").exists()
+        assert ieeg_file.read_text() == "sub-01/ses-01/ieeg/sub-01_ses-01_task-rest_ieeg.json"
+        assert (path / "sub-01/ses-01/ieeg/sub-01_ses-01_task-rest_ieeg.mefd/channel.timd").read_text() == "data"
+        assert (path / "sub-02/ses-1/anat/sub-02_ses-1_T1w.nii.gz").exists()
+        assert not (path / "derivatives").exists()
+
+        loaded = Dataset(path=path, mode="r", load=True)
+        assert isinstance(loaded.subjects["01"].sessions["01"].modalities["ieeg"], IEEG)
+
+    def test_unsafe_archive(self, tmp_dir):
+        with tarfile.open(tmp_dir / "source.tar", "w") as archive:
+            for name in ("code/run.py", "code/../../outside.txt", "/absolute.txt"):
+                info = tarfile.TarInfo(name)
+                archive.addfile(info, io.BytesIO(b""))
+
+        with pytest.warns(UserWarning), ArchiveSource(tmp_dir / "source.tar") as source:
+            source.copy_tree("", tmp_dir / "target")
+            assert source.list_directory("") == ["code"]
+        assert (tmp_dir / "target/code/run.py").exists() and not (tmp_dir / "outside.txt").exists()
+
+    def test_resume(self, tmp_dir):
+        source = self.create_source(tmp_dir)
+        dataset = Dataset(path=tmp_dir / "imported", mode="w", create=True)
+        importer = CrashingBIDSImporter(dataset, workers=1)
+        importer.crash_name = "sub-01_ses-01_task-rest_ieeg.edf"
+        importer.copied = []
+        with pytest.raises(ImportCrash), importer.open_journal():
+            importer.execute_import(source)
+        before = importer.copied
+
+        importer.crash_name = None
+        importer.copied = []
+        with importer.open_journal() as journal:
+            importer.execute_import(source)
+        assert not set(before) & set(importer.copied) and len(before) + len(importer.copied) == 5
+        assert "sub-01_ses-01_task-rest_ieeg.edf" in importer.copied
+        assert (dataset.path / "sub-01/ses-01/ieeg/sub-01_ses-01_task-rest_ieeg.edf").read_text() != "partial"
+        assert not journal.path.exists()
+
+        with ImportJournal(tmp_dir / "journal.jsonl", sync=False) as journal:
+            journal.file_begin(tmp_dir / "failed.edf")
+            journal.file_failed(tmp_dir / "failed.edf")
+        assert journal.path.exists() and not journal.is_complete()
+
+    def test_optional_source(self, tmp_dir):
+        dataset = Dataset(path=tmp_dir / "dataset", mode="w", create=True)
+        modality = dataset.create_subject("01").create_session("01").create_modality("ieeg", IEEG)
+        file_map = ImportFileMap("photo", ".jpg", (pathlib.Path("missing.jpg"),), python_copy, None, {})
+        importer = ModalityImporter(modality, file_maps=[file_map])
+        (tmp_dir / "source").mkdir()
+        with importer.open_journal() as journal:
+            importer.execute_import(tmp_dir / "source")
+        assert journal.is_complete() and not journal.path.exists()
+
+    def test_plan(self, tmp_dir):
+        source = self.create_source(tmp_dir)
+        dataset = Dataset(path=tmp_dir / "imported", mode="w", create=True)
+        plan = DatasetBIDSImporter(dataset).plan_import(source)
+
+        sizes = [j.size for j in plan.jobs]
+        assert len(plan) == 5 and plan.total_size == sum(sizes) > 0
+        assert json.loads(plan.to_json())["TotalSize"] == plan.total_size
+        assert not (dataset.path / "sub-01").exists() and not dataset.subjects
+
+        assert plan.execute(workers=2) == 5
+        assert (dataset.path / "sub-01/ses-01/ieeg/sub-01_ses-01_task-rest_ieeg.edf").exists()
+        assert (dataset.path / "sub-02/ses-1/anat/sub-02_ses-1_T1w.nii.gz").exists()
+        assert isinstance(dataset.subjects["01"].sessions["01"].modalities["ieeg"], IEEG)
+
 
 # Main #
 if __name__ == "__main__":